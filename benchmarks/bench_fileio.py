@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+SCL fileio benchmark
+Compares the fileio plugin's batched appends, buffered and memory-mapped
+reads and streamed lines with naive per-line open/close file access.
+Usage: python benchmarks/bench_fileio.py [lines]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scl
+from scl_types import SCLList
+
+LINE = 'sout : "The quick brown fox jumps over the lazy dog"'
+
+def bench(label, func, lines, size):
+    """Run func once and print its lines/sec and MB/s"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:7.3f}s  {lines / elapsed:>12,.0f} lines/sec  {size / elapsed / 1e6:>8.1f} MB/s")
+    return elapsed
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    for plugin in ('basic', 'fileio'):
+        if not interpreter.load_plugin(plugin):
+            sys.exit(1)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.txt')
+        ctx = interpreter.new_context()
+        ctx.variables.update(path=path, lines=SCLList([LINE] * line_count))
+        size = line_count * (len(LINE) + 1)
+        print(f"{line_count} lines, {size / 1e6:.1f} MB")
+        
+        def naive_append():
+            for _ in range(line_count):
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(LINE + '\n')
+        
+        def scl_statement(code):
+            program = interpreter.compile('simp{basic}\nsimp{fileio}\n' + code)
+            return lambda: program.run(ctx)
+        
+        naive = bench("naive append", naive_append, line_count, size)
+        os.remove(path)
+        batched = bench("file_append (batched)", scl_statement('file_append : path : lines'), line_count, size)
+        print(f"batched appends are {naive / batched:.0f}x faster")
+        
+        def naive_read():
+            # Reopen the file for every line, as a line-at-a-time script would
+            offset = 0
+            for _ in range(line_count):
+                with open(path, 'r', encoding='utf-8') as f:
+                    f.seek(offset)
+                    offset += len(f.readline())
+        
+        bench("naive line reads", naive_read, line_count, size)
+        bench("file_read", scl_statement('file_read : path : text'), line_count, size)
+        bench("file_lines", scl_statement('sde noop : n : 0 end\nfile_lines : path : line : noop'), line_count, size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+SCL hashing benchmark
+Measures the MB/s of the hashing plugin: sha256 and md5 of a large file,
+of many files serially and on its thread pool, of a large string, and
+streamed base64 encoding and decoding.
+Usage: python benchmarks/bench_hash.py [file MB]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scl
+from scl_types import SCLList
+
+FILE_COUNT = 16
+
+def bench(label, func, size):
+    """Run func once and print its throughput"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:7.3f}s  {size / elapsed / 1e6:>9.1f} MB/s")
+    return elapsed
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    size = megabytes * 1024 * 1024
+    os.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    for plugin in ('basic', 'hashing'):
+        if not interpreter.load_plugin(plugin):
+            sys.exit(1)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'big.bin')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        files = []
+        for i in range(FILE_COUNT):
+            files.append(os.path.join(tmp, f'part{i}.bin'))
+            with open(files[-1], 'wb') as f:
+                f.write(os.urandom(size // FILE_COUNT))
+        
+        ctx = interpreter.new_context()
+        ctx.variables.update(path=path, files=SCLList(files), text='x' * size,
+                             encoded=os.path.join(tmp, 'big.b64'), decoded=os.path.join(tmp, 'big.out'))
+        print(f"{megabytes} MB file, {FILE_COUNT} files of {megabytes / FILE_COUNT:.0f} MB, {os.cpu_count()} CPUs")
+        
+        def scl_statement(code):
+            program = interpreter.compile('simp{basic}\nsimp{hashing}\n' + code)
+            return lambda: program.run(ctx)
+        
+        bench("sha256 file", scl_statement('sha256 : file : path : d'), size)
+        bench("md5 file", scl_statement('md5 : file : path : d'), size)
+        serial = bench("sha256 files, serial",
+                       scl_statement('\n'.join(f'sha256 : file : "{file}" : d' for file in files)), size)
+        parallel = bench("sha256 files, parallel", scl_statement('sha256 : files : files : d'), size)
+        print(f"parallel hashing is {serial / parallel:.1f}x faster")
+        bench("sha256 string", scl_statement('sha256 : text : d'), size)
+        bench("base64_enc file", scl_statement('base64_enc : file : path : encoded'), size)
+        bench("base64_dec file", scl_statement('base64_dec : file : encoded : decoded'), size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+SCL lexer benchmark
+Measures highlighting spans/sec and tokens/sec of scl_lexer on a large
+generated file, and the time, peak memory and garbage collections of
+executing it from its text and through SCLInterpreter.execute_file.
+Usage: python benchmarks/bench_lexer.py [lines]
+"""
+
+import gc
+import os
+import contextlib
+import sys
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scl_lexer import iter_spans, scan, tokenize, CORE_KEYWORDS
+import scl
+
+SAMPLE_LINES = [
+    'simp{basic}',
+    '# counter example',
+    'set count | count : 10',
+    'sout : "Hello World!"',
+    'sde greet : sout : "hi" sout : count end',
+    'sde run<greet>',
+    'total : 42.5',
+    'sif count | sout : "positive"',
+]
+
+def make_source(line_count):
+    """Build a synthetic SCL source of the given number of lines"""
+    return [SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(line_count)]
+
+def bench(label, func, lines, unit):
+    """Run func over every line and print the throughput"""
+    start = time.perf_counter()
+    count = 0
+    for line in lines:
+        count += func(line)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {count:>10} {unit} in {elapsed:.3f}s  "
+          f"({count / elapsed:,.0f} {unit}/sec)")
+
+def bench_execute(label, func):
+    """Run func on a fresh interpreter and print its time, peak memory and GC runs"""
+    interpreter = scl.SCLInterpreter()
+    interpreter.load_plugin('basic')
+    gc.collect()
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Program output is discarded
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        func(interpreter)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections
+    print(f"{label:<12} {elapsed:.3f}s, peak {peak / 1e6:>8.1f} MB, {collections:>5} GC runs")
+    return peak
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    lines = make_source(line_count)
+    keywords = frozenset(CORE_KEYWORDS + ['sde', 'run', 'end'])
+    size = sum(len(line) + 1 for line in lines)
+    print(f"{line_count} lines, {size / 1e6:.1f} MB")
+    
+    bench("highlight", lambda line: sum(1 for _ in iter_spans(line, keywords)), lines, "spans")
+    bench("tokenize", lambda line: len(tokenize(line)), lines, "tokens")
+    
+    source = '\n'.join(lines)
+    bench("scan", lambda code: len(scan(code)), [source], "tokens")
+    
+    # Execute the program as scl.py does for small and for large files
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.scl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        
+        def read_text(interpreter):
+            with open(path, 'r', encoding='utf-8') as f:
+                interpreter.execute(f.read())
+        text = bench_execute("text", read_text)
+        mapped = bench_execute("execute_file", lambda interpreter: interpreter.execute_file(path))
+    print(f"execute_file peak memory is {text / mapped:.1f}x smaller")
+
+if __name__ == "__main__":
+    main()
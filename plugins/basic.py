@@ -1,13 +1,43 @@
 # Basic syntax plugin for SunsetCodeLang
 
+import asyncio
+
+from scl_types import SCLList
+
+# List and map statements: keyword -> (statement, arguments after the
+# collection name, optional ': target' for the result, literal values)
+COLLECTION_STATEMENTS = {
+    'list_create': ('LIST_CREATE', 0, False, True),
+    'list_add': ('LIST_ADD', 1, False, False),
+    'list_get': ('LIST_GET', 1, True, False),
+    'list_len': ('LIST_LEN', 0, True, False),
+    'list_show': ('LIST_SHOW', 0, False, False),
+    'list_remove': ('LIST_REMOVE', 1, False, False),
+    'map_create': ('MAP_CREATE', 0, False, True),
+    'map_set': ('MAP_SET', 2, False, False),
+    'map_get': ('MAP_GET', 1, True, False),
+    'map_has': ('MAP_HAS', 1, True, False),
+    'map_keys': ('MAP_KEYS', 0, True, False),
+    'map_values': ('MAP_VALUES', 0, True, False),
+    'map_clear': ('MAP_CLEAR', 0, False, False),
+}
+
 class BasicPlugin:
+    API_VERSION = 2
+    COLLECTION_KINDS = {spec[0] for spec in COLLECTION_STATEMENTS.values()}
+    
     def __init__(self, interpreter):
         self.interpreter = interpreter
     
-    def register_syntax(self):
+    def register_syntax(self, grammar):
         """Register basic syntax handlers"""
-        # This will be called by the interpreter to register syntax handlers
-        pass
+        self.grammar = grammar
+        for keyword in ('set', 'sout', 'sif', 'sde'):
+            grammar.production(keyword, self.parse_statement)
+        for keyword in COLLECTION_STATEMENTS:
+            grammar.production(keyword, self.parse_collection)
+        # Direct assignment: a : 1
+        grammar.production(None, self.parse_statement)
     
     def parse_statement(self, tokens, pos):
         """Parse basic statements"""
@@ -62,14 +92,17 @@ class BasicPlugin:
             consume()  # Consume 'sif'
             condition, new_pos = self.interpreter.parse_expression(tokens, local_pos)
             if condition and new_pos < len(tokens) and tokens[new_pos][0] == 'SEPARATOR':
+                local_pos = new_pos
                 consume()  # Consume '|'
                 body = []
                 # Parse body statements
                 while peek() and not (peek()[0] == 'IDENTIFIER' and peek()[1] in ['selif', 'sle']):
-                    stmt, new_pos = self.parse_statement(tokens, local_pos)
-                    if stmt:
-                        body.append(stmt)
-                        local_pos = new_pos
+                    stmt, new_pos = self.grammar.parse(tokens, local_pos)
+                    if not stmt:
+                        # Unparseable body: report invalid syntax instead of looping
+                        return None, pos
+                    body.append(stmt)
+                    local_pos = new_pos
                 return ('IF', condition, body), local_pos
         elif token[0] == 'IDENTIFIER' and token[1] == 'sde':
             # Function definition or call: sde add : ... end or sde run<add>
@@ -101,6 +134,20 @@ class BasicPlugin:
                             return ('FUNCTION_CALL', func_name), local_pos
 
             
+            # Tasks for the asyncio mode: sde spawn<add>, sde wait<add>, sde wait
+            if next_token and next_token[0] == 'IDENTIFIER' and next_token[1] in ['spawn', 'wait']:
+                kind = 'TASK_SPAWN' if next_token[1] == 'spawn' else 'TASK_WAIT'
+                if kind == 'TASK_WAIT' and peek(1) is None:
+                    consume()  # Consume 'wait'
+                    return ('TASK_WAIT', None), local_pos
+                if (peek(1) and peek(1)[0] == 'OPERATOR' and peek(1)[1] == '<' and
+                        peek(2) and peek(2)[0] == 'IDENTIFIER' and
+                        peek(3) and peek(3)[0] == 'OPERATOR' and peek(3)[1] == '>'):
+                    func_name = peek(2)[1]
+                    for _ in range(4):
+                        consume()  # Consume 'spawn'/'wait', '<', function name, '>'
+                    return (kind, func_name), local_pos
+            
             # Check for function definition: sde add :
             func_token = peek()
             if not func_token or func_token[0] != 'IDENTIFIER':
@@ -133,17 +180,17 @@ class BasicPlugin:
             # Check if this is not a time statement (let time plugin handle it)
             # Also check if this is not a sif or swhile statement (let siew plugin handle it)
             # Also check if this is not a suibtn statement (let sbtn plugin handle it)
-            # Also check if this is not a web_get, web_post, web_put or web_delete statement (let web plugin handle it)
+            # Also check if this is not a web_get, web_post, web_put, web_delete, web_get_all or web_config statement (let web plugin handle it)
             # Also check if this is not a qr_text, qr_ascii or qr_png statement (let qrcode plugin handle it)
             # Also check if this is not a progress, spinner or loading_bar statement (let progress plugin handle it)
             # Also check if this is not a dice, coin, rps or guess_num statement (let game plugin handle it)
-            # Also check if this is not a file_write, file_read, file_append, file_delete or dir_list statement (let fileio plugin handle it)
-            if token[1] != 'time' and token[1] not in ['sif', 'swhile', 'suibtn', 'sysinfo', 'md5', 'sha256', 'base64_enc', 'base64_dec', 'rot13', 'list_create', 'list_add', 'list_show', 'list_len', 'list_get', 'list_remove', 'map_create', 'map_set', 'map_get', 'map_has', 'map_keys', 'map_values', 'map_clear', 'richtext', 'style', 'rainbow_text', 'typewriter', 'marquee', 'clear_text', 'color_block', 'qr_text', 'qr_ascii', 'qr_png', 'progress', 'spinner', 'loading_bar', 'dice', 'coin', 'rps', 'guess_num', 'file_write', 'file_read', 'file_append', 'file_delete', 'dir_list']:
+            # Also check if this is not a file_write, file_read, file_append, file_delete, file_lines or dir_list statement (let fileio plugin handle it)
+            if token[1] != 'time' and token[1] not in ['sif', 'swhile', 'suibtn', 'sysinfo', 'md5', 'sha256', 'base64_enc', 'base64_dec', 'rot13', 'richtext', 'style', 'rainbow_text', 'typewriter', 'marquee', 'clear_text', 'color_block', 'qr_text', 'qr_ascii', 'qr_png', 'progress', 'spinner', 'loading_bar', 'dice', 'coin', 'rps', 'guess_num', 'file_write', 'file_read', 'file_append', 'file_delete', 'file_lines', 'dir_list', 'web_config']:
                 var_name = consume()[1]
                 consume()  # Consume ':'
                 
                 # Check if this is a web_get, web_post, web_put or web_delete statement
-                if local_pos < len(tokens) and tokens[local_pos][0] == 'IDENTIFIER' and tokens[local_pos][1] in ['web_get', 'web_post', 'web_put', 'web_delete']:
+                if local_pos < len(tokens) and tokens[local_pos][0] == 'IDENTIFIER' and tokens[local_pos][1] in ['web_get', 'web_post', 'web_put', 'web_delete', 'web_get_all']:
                     # Return None to let web plugin handle it
                     return None, pos
                 
@@ -169,53 +216,252 @@ class BasicPlugin:
         
         return None, pos
     
-    def execute_statement(self, stmt):
-        """Execute basic statements"""
+    def parse_collection(self, tokens, pos):
+        """Parse list and map statements: list_add : nums : 5"""
+        local_pos = pos
+        
+        def peek(offset=0):
+            if local_pos + offset < len(tokens):
+                return tokens[local_pos + offset]
+            return None
+        
+        def consume():
+            nonlocal local_pos
+            if local_pos < len(tokens):
+                token = tokens[local_pos]
+                local_pos += 1
+                return token
+            return None
+        
+        kind, arg_count, has_target, has_literal = COLLECTION_STATEMENTS[consume()[1]]
+        if not (peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] == 'IDENTIFIER'):
+            return None, pos
+        consume()  # Consume ':'
+        name = consume()[1]
+        
+        args = []
+        for _ in range(arg_count):
+            if not (peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] in ['STRING', 'NUMBER', 'IDENTIFIER']):
+                return None, pos
+            consume()  # Consume ':'
+            args.append(consume())
+        
+        target = None
+        if has_target and peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] == 'IDENTIFIER':
+            consume()  # Consume ':'
+            target = consume()[1]
+        
+        if has_literal and peek() and peek()[0] == 'ASSIGN':
+            # Literal values: list_create : nums : 1 2 3
+            consume()  # Consume ':'
+            while peek() and peek()[0] in ['STRING', 'NUMBER']:
+                args.append(consume())
+            if kind == 'MAP_CREATE' and len(args) % 2:
+                return None, pos
+        
+        return (kind, name, tuple(args), target), local_pos
+    
+    def compile_statement(self, stmt):
+        """Compile basic statements into executors"""
+        interpreter = self.interpreter
         if stmt[0] == 'ASSIGN':
             var_name = stmt[1]
-            value = self.interpreter.evaluate_expression(stmt[2])
-            self.interpreter.variables[var_name] = value
-            return True
+            value = interpreter.compile_expression(stmt[2])
+            def run(ctx):
+                ctx.variables[var_name] = value(ctx)
+                return True
+            return run
         elif stmt[0] == 'PRINT':
-            value = self.interpreter.evaluate_expression(stmt[1])
-            print(value)
-            return True
+            value = interpreter.compile_expression(stmt[1])
+            def run(ctx):
+                print(value(ctx))
+                return True
+            return run
         elif stmt[0] == 'IF':
-            condition = self.interpreter.evaluate_expression(stmt[1])
-            if condition:
-                for body_stmt in stmt[2]:
-                    self.execute_statement(body_stmt)
-            return True
+            condition = interpreter.compile_expression(stmt[1])
+            body = self.compile_body(stmt[2])
+            def run(ctx):
+                if condition(ctx):
+                    for executor in body:
+                        executor(ctx)
+                return True
+            return run
         elif stmt[0] == 'FUNCTION_DEF':
             # Function definition: store function in variables
             func_name = stmt[1]
             func_body = stmt[2]  # This is a list of tokens
-            # Store function body as a list of tokens
-            self.interpreter.variables[func_name] = func_body
-            if hasattr(self.interpreter, 'debug_mode') and self.interpreter.debug_mode:
-                print(f"Debug: Defined function '{func_name}' with body tokens: {func_body}")
-            return True
+            def run(ctx):
+                # Store function body as a list of tokens
+                ctx.variables[func_name] = func_body
+                return True
+            return run
         elif stmt[0] == 'FUNCTION_CALL':
             # Function call: execute stored function body
             func_name = stmt[1]
-            if func_name in self.interpreter.variables:
-                func_body = self.interpreter.variables[func_name]
-                if hasattr(self.interpreter, 'debug_mode') and self.interpreter.debug_mode:
-                    print(f"Debug: Calling function '{func_name}'")
-                # Execute each statement in the function body
-                # We need to parse and execute the tokens
-                pos = 0
-                while pos < len(func_body):
-                    # Parse statement from the function body tokens
-                    stmt, new_pos = self.parse_statement(func_body, pos)
-                    if stmt:
-                        self.execute_statement(stmt)
-                        pos = new_pos
-                    else:
-                        pos += 1
+            def run(ctx):
+                if func_name in ctx.variables:
+                    func_body = ctx.variables[func_name]
+                    # The body may be redefined, so parse it on every call,
+                    # with the plugins the program imported so far
+                    plugins = ctx.state('program').get('plugins')
+                    pos = 0
+                    while pos < len(func_body):
+                        body_stmt, new_pos = interpreter.parse_statement(func_body, pos, plugins)
+                        if body_stmt:
+                            interpreter.compile_statement(body_stmt, plugins)(ctx)
+                            pos = new_pos
+                        else:
+                            pos += 1
+                    return True
+                else:
+                    return False
+            return run
+        elif stmt[0] in self.COLLECTION_KINDS:
+            return self.compile_collection(stmt)
+        elif stmt[0] == 'TASK_SPAWN':
+            # Without an event loop a spawned function runs to completion
+            return self.compile_statement(('FUNCTION_CALL', stmt[1]))
+        elif stmt[0] == 'TASK_WAIT':
+            return lambda ctx: True
+        return None
+    
+    def compile_collection(self, stmt):
+        """Compile list and map statements into executors"""
+        interpreter = self.interpreter
+        name, args, target = stmt[1], stmt[2], stmt[3]
+        
+        def collection(ctx, kind):
+            value = ctx.variables.get(name)
+            if not isinstance(value, kind):
+                raise TypeError(f"{name} is not a {'list' if kind is SCLList else 'map'}")
+            return value
+        
+        def result(ctx, value):
+            # Store in the target variable, or print without one
+            if target is None:
+                print(value)
+            else:
+                ctx.variables[target] = value
+            return True
+        
+        if stmt[0] == 'LIST_CREATE':
+            values = [interpreter.evaluate_expression(arg) for arg in args]
+            def run(ctx):
+                ctx.variables[name] = SCLList(values)
+                return True
+        elif stmt[0] == 'MAP_CREATE':
+            values = [interpreter.evaluate_expression(arg) for arg in args]
+            pairs = list(zip(values[::2], values[1::2]))
+            def run(ctx):
+                ctx.variables[name] = dict(pairs)
+                return True
+        elif stmt[0] == 'LIST_ADD':
+            value = interpreter.compile_expression(args[0])
+            def run(ctx):
+                collection(ctx, SCLList).append(value(ctx))
+                return True
+        elif stmt[0] == 'LIST_GET':
+            index = interpreter.compile_expression(args[0])
+            def run(ctx):
+                return result(ctx, collection(ctx, SCLList)[index(ctx)])
+        elif stmt[0] == 'LIST_LEN':
+            def run(ctx):
+                return result(ctx, len(collection(ctx, SCLList)))
+        elif stmt[0] == 'LIST_SHOW':
+            def run(ctx):
+                print(collection(ctx, SCLList))
+                return True
+        elif stmt[0] == 'LIST_REMOVE':
+            index = interpreter.compile_expression(args[0])
+            def run(ctx):
+                del collection(ctx, SCLList)[index(ctx)]
+                return True
+        elif stmt[0] == 'MAP_SET':
+            key = interpreter.compile_expression(args[0])
+            value = interpreter.compile_expression(args[1])
+            def run(ctx):
+                collection(ctx, dict)[key(ctx)] = value(ctx)
+                return True
+        elif stmt[0] == 'MAP_GET':
+            key = interpreter.compile_expression(args[0])
+            def run(ctx):
+                # Missing keys read as 0, like unset variables
+                return result(ctx, collection(ctx, dict).get(key(ctx), 0))
+        elif stmt[0] == 'MAP_HAS':
+            key = interpreter.compile_expression(args[0])
+            def run(ctx):
+                return result(ctx, 1 if key(ctx) in collection(ctx, dict) else 0)
+        elif stmt[0] == 'MAP_KEYS':
+            def run(ctx):
+                return result(ctx, SCLList(collection(ctx, dict).keys()))
+        elif stmt[0] == 'MAP_VALUES':
+            def run(ctx):
+                return result(ctx, SCLList(collection(ctx, dict).values()))
+        elif stmt[0] == 'MAP_CLEAR':
+            def run(ctx):
+                collection(ctx, dict).clear()
+                return True
+        return run
+    
+    def compile_async_statement(self, stmt):
+        """Compile function calls and tasks into coroutines for the asyncio mode
+        
+        Function bodies use the plugins the program imported so far, as in
+        the other modes; statements that wait let other tasks run.
+        """
+        if stmt[0] == 'FUNCTION_CALL':
+            func_name = stmt[1]
+            async def run(ctx):
+                return await self.call_async(ctx, func_name)
+            return run
+        elif stmt[0] == 'TASK_SPAWN':
+            func_name = stmt[1]
+            async def run(ctx):
+                if func_name not in ctx.variables:
+                    return False
+                tasks = ctx.state('async').setdefault('tasks', {})
+                task = asyncio.ensure_future(self.run_task(ctx, func_name))
+                tasks.setdefault(func_name, []).append(task)
                 return True
+            return run
+        elif stmt[0] == 'TASK_WAIT':
+            func_name = stmt[1]
+            async def run(ctx):
+                tasks = ctx.state('async').setdefault('tasks', {})
+                while True:
+                    names = [func_name] if func_name else list(tasks)
+                    waiting = [task for name in names for task in tasks.pop(name, [])]
+                    if not waiting:
+                        return True
+                    # Tasks spawned while waiting are waited for too
+                    await asyncio.gather(*waiting)
+            return run
+        return None
+    
+    async def call_async(self, ctx, func_name):
+        """Run a function body, awaiting statements that wait"""
+        if func_name not in ctx.variables:
+            return False
+        func_body = ctx.variables[func_name]
+        interpreter = self.interpreter
+        plugins = ctx.state('program').get('plugins')
+        pos = 0
+        while pos < len(func_body):
+            body_stmt, new_pos = interpreter.parse_statement(func_body, pos, plugins)
+            if body_stmt:
+                await interpreter.compile_async_statement(body_stmt, plugins)(ctx)
+                pos = new_pos
             else:
-                if hasattr(self.interpreter, 'debug_mode') and self.interpreter.debug_mode:
-                    print(f"Debug: Function '{func_name}' not found")
-                return False
-        return False
+                pos += 1
+        return True
+    
+    async def run_task(self, ctx, func_name):
+        """Run a spawned function, reporting errors instead of raising them"""
+        try:
+            await self.call_async(ctx, func_name)
+        except Exception as e:
+            print(f"Error in task {func_name}: {e}")
+    
+    def compile_body(self, body):
+        """Compile a statement body; statements basic cannot run are skipped"""
+        return [executor for executor in map(self.compile_statement, body) if executor]
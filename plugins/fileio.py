@@ -0,0 +1,126 @@
+# File input/output plugin for SunsetCodeLang
+
+import os
+import mmap
+
+from scl_types import SCLList
+
+# Buffer size for reads and writes; far fewer system calls than the default
+BUFFER_SIZE = 1024 * 1024
+
+# Files at least this large are read through a memory map
+MMAP_SIZE = 4 * 1024 * 1024
+
+# Statements: keyword -> (statement, arguments), where 'value' arguments
+# are expressions and 'name' arguments are variable or function names
+FILE_STATEMENTS = {
+    'file_write': ('FILE_WRITE', ('value', 'value')),
+    'file_append': ('FILE_APPEND', ('value', 'value')),
+    'file_read': ('FILE_READ', ('value', 'name')),
+    'file_delete': ('FILE_DELETE', ('value',)),
+    'file_lines': ('FILE_LINES', ('value', 'name', 'name')),
+    'dir_list': ('DIR_LIST', ('value', 'name')),
+}
+
+def read_text(path):
+    """Read a whole UTF-8 file, through a memory map when it is large"""
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_SIZE:
+            return f.readall().decode('utf-8')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Decode straight from the mapping, without a bytes copy
+            with memoryview(data) as view:
+                return str(view, 'utf-8')
+
+def text_chunks(value):
+    """Return the text written for a value; lists are written one item per line"""
+    if isinstance(value, SCLList):
+        return [f"{item}\n" for item in value]
+    return [str(value)]
+
+class FileioPlugin:
+    API_VERSION = 2
+    
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+    
+    def register_syntax(self, grammar):
+        """Register file syntax handlers"""
+        for keyword in FILE_STATEMENTS:
+            grammar.production(keyword, self.parse_statement)
+    
+    def parse_statement(self, tokens, pos):
+        """Parse file statements: file_read : "notes.txt" : text"""
+        local_pos = pos
+        
+        def peek(offset=0):
+            if local_pos + offset < len(tokens):
+                return tokens[local_pos + offset]
+            return None
+        
+        def consume():
+            nonlocal local_pos
+            if local_pos < len(tokens):
+                token = tokens[local_pos]
+                local_pos += 1
+                return token
+            return None
+        
+        kind, arg_kinds = FILE_STATEMENTS[consume()[1]]
+        args = []
+        for arg_kind in arg_kinds:
+            allowed = ['STRING', 'NUMBER', 'IDENTIFIER'] if arg_kind == 'value' else ['IDENTIFIER']
+            if not (peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] in allowed):
+                return None, pos
+            consume()  # Consume ':'
+            token = consume()
+            args.append(token if arg_kind == 'value' else token[1])
+        return (kind,) + tuple(args), local_pos
+    
+    def compile_statement(self, stmt):
+        """Compile file statements into executors"""
+        interpreter = self.interpreter
+        if stmt[0] not in ('FILE_WRITE', 'FILE_APPEND', 'FILE_READ', 'FILE_DELETE', 'FILE_LINES', 'DIR_LIST'):
+            return None
+        path = interpreter.compile_expression(stmt[1])
+        
+        if stmt[0] == 'FILE_WRITE' or stmt[0] == 'FILE_APPEND':
+            value = interpreter.compile_expression(stmt[2])
+            mode = 'w' if stmt[0] == 'FILE_WRITE' else 'a'
+            def run(ctx):
+                # A list is written in one buffered batch, not a write per item
+                with open(str(path(ctx)), mode, encoding='utf-8', newline='', buffering=BUFFER_SIZE) as f:
+                    f.writelines(text_chunks(value(ctx)))
+                return True
+        elif stmt[0] == 'FILE_READ':
+            var_name = stmt[2]
+            def run(ctx):
+                ctx.variables[var_name] = read_text(str(path(ctx)))
+                return True
+        elif stmt[0] == 'FILE_DELETE':
+            def run(ctx):
+                os.remove(str(path(ctx)))
+                return True
+        elif stmt[0] == 'FILE_LINES':
+            var_name, func_name = stmt[2], stmt[3]
+            call = None
+            def run(ctx):
+                nonlocal call
+                if call is None:
+                    call = interpreter.compile_statement(('FUNCTION_CALL', func_name))
+                # One line in memory at a time, however large the file is
+                with open(str(path(ctx)), 'r', encoding='utf-8', newline='', buffering=BUFFER_SIZE) as f:
+                    for line in f:
+                        ctx.variables[var_name] = line.rstrip('\r\n')
+                        if not call(ctx):
+                            print(f"Function '{func_name}' not found")
+                            return False
+                return True
+        else:
+            var_name = stmt[2]
+            def run(ctx):
+                with os.scandir(str(path(ctx))) as entries:
+                    ctx.variables[var_name] = SCLList(sorted(entry.name for entry in entries))
+                return True
+        return run
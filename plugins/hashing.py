@@ -0,0 +1,208 @@
+# Hashing and encoding plugin for SunsetCodeLang
+# md5, sha256, base64 and rot13 over strings and files, in fixed-size chunks
+
+import os
+import codecs
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from scl_types import SCLList
+
+# Bytes read, or characters encoded, per step; a whole file or string is never copied at once
+CHUNK_SIZE = 1024 * 1024
+HASH_KEYWORDS = ('md5', 'sha256')
+BASE64_KEYWORDS = ('base64_enc', 'base64_dec')
+ROT13_TABLE = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz',
+    'NOPQRSTUVWXYZABCDEFGHIJKLMnopqrstuvwxyzabcdefghijklm')
+
+def string_chunks(text):
+    """Yield the UTF-8 bytes of a string a chunk at a time"""
+    for start in range(0, len(text), CHUNK_SIZE):
+        yield text[start:start + CHUNK_SIZE].encode('utf-8')
+
+def file_chunks(path):
+    """Yield the bytes of a file a chunk at a time"""
+    with open(path, 'rb', buffering=0) as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            yield chunk
+
+def hash_file(algorithm, path):
+    """Return the hex digest of a file, read into one reused buffer"""
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            # hashlib releases the GIL for large updates, so files hash in parallel
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+def hash_chunks(algorithm, chunks):
+    """Return the hex digest of a stream of byte chunks"""
+    digest = hashlib.new(algorithm)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def b64encode_chunks(chunks):
+    """Base64-encode a stream of byte chunks, yielding encoded chunks"""
+    rest = b''
+    for chunk in chunks:
+        if rest:
+            chunk = rest + chunk
+        # Encode whole 3-byte groups so the chunks join into one encoding
+        cut = len(chunk) - len(chunk) % 3
+        rest = chunk[cut:]
+        if cut:
+            yield base64.b64encode(memoryview(chunk)[:cut])
+    if rest:
+        yield base64.b64encode(rest)
+
+def b64decode_chunks(chunks):
+    """Base64-decode a stream of byte chunks, ignoring whitespace"""
+    rest = b''
+    for chunk in chunks:
+        chunk = rest + chunk.translate(None, b' \t\r\n')
+        # Decode whole 4-character groups
+        cut = len(chunk) - len(chunk) % 4
+        rest = chunk[cut:]
+        if cut:
+            yield base64.b64decode(chunk[:cut], validate=True)
+    if rest:
+        yield base64.b64decode(rest, validate=True)
+
+def decode_chunks(chunks):
+    """Join byte chunks into a string, decoding characters split across chunks"""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts = [decoder.decode(chunk) for chunk in chunks]
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts)
+
+class HashingPlugin:
+    API_VERSION = 2
+    
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.executor = None
+        self.executor_lock = threading.Lock()
+    
+    def register_syntax(self, grammar):
+        """Register hashing and encoding syntax handlers"""
+        for keyword in HASH_KEYWORDS + BASE64_KEYWORDS + ('rot13',):
+            grammar.production(keyword, self.parse_statement)
+    
+    def parse_statement(self, tokens, pos):
+        """Parse hashing statements: sha256 : "text" : digest, md5 : file : path : digest"""
+        local_pos = pos
+        
+        def peek(offset=0):
+            if local_pos + offset < len(tokens):
+                return tokens[local_pos + offset]
+            return None
+        
+        def consume():
+            nonlocal local_pos
+            if local_pos < len(tokens):
+                token = tokens[local_pos]
+                local_pos += 1
+                return token
+            return None
+        
+        def argument(kinds=('STRING', 'NUMBER', 'IDENTIFIER')):
+            # ': value' of one of the given token kinds, or None
+            if peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] in kinds:
+                consume()  # Consume ':'
+                return consume()
+            return None
+        
+        keyword = consume()[1]
+        
+        # Source: a value, or 'file' or 'files' followed by paths
+        source_kind = 'value'
+        if (peek(1) and peek(1)[0] == 'IDENTIFIER' and peek(1)[1] in ('file', 'files') and
+                peek(2) and peek(2)[0] == 'ASSIGN'):
+            source_kind = argument()[1]
+        if source_kind == 'files' and keyword not in HASH_KEYWORDS:
+            return None, pos
+        source = argument()
+        if not source:
+            return None, pos
+        
+        if keyword in BASE64_KEYWORDS and source_kind == 'file':
+            # Streamed file to file: base64_enc : file : "in.bin" : "out.txt"
+            target = argument()
+            if not target:
+                return None, pos
+            return ('BASE64_FILE', keyword == 'base64_enc', source, target), local_pos
+        
+        # Result into a variable, or printed without one
+        target = argument(('IDENTIFIER',))
+        target = target[1] if target else None
+        if keyword in HASH_KEYWORDS:
+            return ('HASH', keyword, source_kind, source, target), local_pos
+        if keyword in BASE64_KEYWORDS:
+            return ('BASE64', keyword == 'base64_enc', source, target), local_pos
+        if source_kind == 'value':
+            return ('ROT13', source, target), local_pos
+        return None, pos
+    
+    def compile_statement(self, stmt):
+        """Compile hashing statements into executors"""
+        interpreter = self.interpreter
+        if stmt[0] == 'HASH':
+            algorithm, source_kind, target = stmt[1], stmt[2], stmt[4]
+            if source_kind == 'value':
+                compute = lambda value: hash_chunks(algorithm, string_chunks(str(value)))
+            elif source_kind == 'file':
+                compute = lambda path: hash_file(algorithm, str(path))
+            else:
+                compute = lambda paths: self.hash_files(algorithm, paths)
+            source = interpreter.compile_expression(stmt[3])
+        elif stmt[0] == 'BASE64':
+            encode, target = stmt[1], stmt[3]
+            if encode:
+                compute = lambda value: b''.join(b64encode_chunks(string_chunks(str(value)))).decode('ascii')
+            else:
+                compute = lambda value: decode_chunks(b64decode_chunks(string_chunks(str(value))))
+            source = interpreter.compile_expression(stmt[2])
+        elif stmt[0] == 'BASE64_FILE':
+            transform = b64encode_chunks if stmt[1] else b64decode_chunks
+            source = interpreter.compile_expression(stmt[2])
+            destination = interpreter.compile_expression(stmt[3])
+            def run(ctx):
+                with open(str(destination(ctx)), 'wb') as f:
+                    for chunk in transform(file_chunks(str(source(ctx)))):
+                        f.write(chunk)
+                return True
+            return run
+        elif stmt[0] == 'ROT13':
+            target = stmt[2]
+            compute = lambda value: str(value).translate(ROT13_TABLE)
+            source = interpreter.compile_expression(stmt[1])
+        else:
+            return None
+        
+        def run(ctx):
+            result = compute(source(ctx))
+            # Store in the target variable, or print without one
+            if target is None:
+                print(result)
+            else:
+                ctx.variables[target] = result
+            return True
+        return run
+    
+    def hash_files(self, algorithm, paths):
+        """Hash many files at once on a thread pool; return the digests in order"""
+        if isinstance(paths, str):
+            paths = [paths]
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='scl-hash')
+        return SCLList(self.executor.map(lambda path: hash_file(algorithm, str(path)), list(paths)))
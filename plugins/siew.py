@@ -2,31 +2,38 @@
 # Enhanced syntax with improved if/while statements
 
 class SiewPlugin:
+    API_VERSION = 2
+    
     def __init__(self, interpreter):
         self.interpreter = interpreter
     
-    def register_syntax(self):
+    def register_syntax(self, grammar):
         """Register enhanced syntax handlers"""
-        pass
+        grammar.production('swhile', self.parse_statement)
+        grammar.production('sif', self.parse_statement)
     
     def parse_statement(self, tokens, pos):
         """Parse enhanced statements"""
-        interpreter = self.interpreter
-        interpreter.tokens = tokens
-        interpreter.pos = pos
+        # Parser state stays local so parsing is reentrant
+        local_pos = pos
         
         def peek(offset=0):
-            if interpreter.pos + offset < len(interpreter.tokens):
-                return interpreter.tokens[interpreter.pos + offset]
+            if local_pos + offset < len(tokens):
+                return tokens[local_pos + offset]
             return None
         
         def consume():
-            if interpreter.pos < len(interpreter.tokens):
-                token = interpreter.tokens[interpreter.pos]
-                interpreter.pos += 1
+            nonlocal local_pos
+            if local_pos < len(tokens):
+                token = tokens[local_pos]
+                local_pos += 1
                 return token
             return None
         
+        def is_brace(token, brace):
+            # The lexer reports braces as PAREN tokens
+            return token[0] == 'PAREN' and token[1] == brace
+        
         token = peek()
         if not token:
             return None, pos
@@ -36,84 +43,95 @@ class SiewPlugin:
         #                   }
         if token[0] == 'IDENTIFIER' and token[1] == 'swhile':
             consume()  # Consume 'swhile'
-            condition, _ = self.interpreter.parse_expression(interpreter.tokens, interpreter.pos)
-            if condition and peek() and peek()[0] == 'LEFT_BRACE':
+            condition, local_pos = self.interpreter.parse_expression(tokens, local_pos)
+            if condition and peek() and is_brace(peek(), '{'):
                 consume()  # Consume '{'
                 body = []
                 # Parse body statements until '}'
-                while peek() and not (peek()[0] == 'RIGHT_BRACE'):
-                    stmt, new_pos = self.parse_statement(interpreter.tokens, interpreter.pos)
+                while peek() and not is_brace(peek(), '}'):
+                    stmt, new_pos = self.parse_statement(tokens, local_pos)
                     if stmt:
                         body.append(stmt)
-                        interpreter.pos = new_pos
+                        local_pos = new_pos
                     else:
                         # Move to next token if not parseable
                         consume()
-                if peek() and peek()[0] == 'RIGHT_BRACE':
+                if peek() and is_brace(peek(), '}'):
                     consume()  # Consume '}'
-                    return ('WHILE', condition, body), interpreter.pos
+                    return ('WHILE', condition, body), local_pos
         
         # Enhanced if statement with {} blocks
         elif token[0] == 'IDENTIFIER' and token[1] == 'sif':
             consume()  # Consume 'sif'
-            condition, _ = self.interpreter.parse_expression(interpreter.tokens, interpreter.pos)
-            if condition and peek() and peek()[0] == 'LEFT_BRACE':
+            condition, local_pos = self.interpreter.parse_expression(tokens, local_pos)
+            if condition and peek() and is_brace(peek(), '{'):
                 consume()  # Consume '{'
                 body = []
                 # Parse body statements until '}' or 'sle'
-                while peek() and not (peek()[0] == 'RIGHT_BRACE' or 
+                while peek() and not (is_brace(peek(), '}') or 
                                      (peek()[0] == 'IDENTIFIER' and peek()[1] == 'sle')):
-                    stmt, new_pos = self.parse_statement(interpreter.tokens, interpreter.pos)
+                    stmt, new_pos = self.parse_statement(tokens, local_pos)
                     if stmt:
                         body.append(stmt)
-                        interpreter.pos = new_pos
+                        local_pos = new_pos
                     else:
                         # Move to next token if not parseable
                         consume()
                 
                 if peek() and peek()[0] == 'IDENTIFIER' and peek()[1] == 'sle':
                     consume()  # Consume 'sle'
-                    if peek() and peek()[0] == 'LEFT_BRACE':
+                    if peek() and is_brace(peek(), '{'):
                         consume()  # Consume '{'
                         else_body = []
                         # Parse else body until '}'
-                        while peek() and not (peek()[0] == 'RIGHT_BRACE'):
-                            stmt, new_pos = self.parse_statement(interpreter.tokens, interpreter.pos)
+                        while peek() and not is_brace(peek(), '}'):
+                            stmt, new_pos = self.parse_statement(tokens, local_pos)
                             if stmt:
                                 else_body.append(stmt)
-                                interpreter.pos = new_pos
+                                local_pos = new_pos
                             else:
                                 # Move to next token if not parseable
                                 consume()
-                        if peek() and peek()[0] == 'RIGHT_BRACE':
+                        if peek() and is_brace(peek(), '}'):
                             consume()  # Consume '}'
-                            return ('IF_ELSE', condition, body, else_body), interpreter.pos
-                elif peek() and peek()[0] == 'RIGHT_BRACE':
+                            return ('IF_ELSE', condition, body, else_body), local_pos
+                elif peek() and is_brace(peek(), '}'):
                     consume()  # Consume '}'
-                    return ('IF', condition, body), interpreter.pos
+                    return ('IF', condition, body), local_pos
         
         return None, pos
     
-    def execute_statement(self, stmt):
-        """Execute enhanced statements"""
+    def compile_statement(self, stmt):
+        """Compile enhanced statements into executors"""
         if stmt[0] == 'WHILE':
-            while self.interpreter.evaluate_expression(stmt[1]):
-                for body_stmt in stmt[2]:
-                    self.execute_statement(body_stmt)
-            return True
+            condition = self.interpreter.compile_expression(stmt[1])
+            body = self.compile_body(stmt[2])
+            def run(ctx):
+                while condition(ctx):
+                    for executor in body:
+                        executor(ctx)
+                return True
+            return run
         elif stmt[0] == 'IF_ELSE':
-            condition = self.interpreter.evaluate_expression(stmt[1])
-            if condition:
-                for body_stmt in stmt[2]:
-                    self.execute_statement(body_stmt)
-            else:
-                for else_stmt in stmt[3]:
-                    self.execute_statement(else_stmt)
-            return True
+            condition = self.interpreter.compile_expression(stmt[1])
+            body = self.compile_body(stmt[2])
+            else_body = self.compile_body(stmt[3])
+            def run(ctx):
+                for executor in (body if condition(ctx) else else_body):
+                    executor(ctx)
+                return True
+            return run
         elif stmt[0] == 'IF':
-            condition = self.interpreter.evaluate_expression(stmt[1])
-            if condition:
-                for body_stmt in stmt[2]:
-                    self.execute_statement(body_stmt)
-            return True
-        return False
+            condition = self.interpreter.compile_expression(stmt[1])
+            body = self.compile_body(stmt[2])
+            def run(ctx):
+                if condition(ctx):
+                    for executor in body:
+                        executor(ctx)
+                return True
+            return run
+        return None
+    
+    def compile_body(self, body):
+        """Compile a block body; statements siew cannot run are skipped"""
+        return [executor for executor in map(self.compile_statement, body) if executor]
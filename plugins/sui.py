@@ -1,35 +1,102 @@
 # SUI (SunsetCodeLang UI) plugin
 # Uses tkinter to create graphical user interfaces
 
+import asyncio
 import tkinter as tk
 from tkinter import Canvas
 import time
 
+class HeadlessCanvas:
+    """Canvas stand-in that records drawn items instead of rendering them"""
+    
+    def __init__(self, window, width=400, height=300, bg="white"):
+        self.window = window
+        self.options = {"width": width, "height": height, "bg": bg}
+        self.items = []
+    
+    def pack(self, **kwargs):
+        pass
+    
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+    
+    def _create(self, kind, coords, options):
+        self.items.append((kind, coords, options))
+        return len(self.items)
+    
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+    
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+    
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+class HeadlessWindow:
+    """Tk window stand-in for running SUI programs without a display
+    
+    update() acts as if the window was closed straight away, so
+    sui run returns instead of blocking.
+    """
+    
+    def __init__(self):
+        self.title_text = ""
+        self.size = ""
+        self.icon = None
+        self.handlers = {}
+        self.destroyed = False
+    
+    def title(self, text):
+        self.title_text = text
+    
+    def geometry(self, size):
+        self.size = size
+    
+    def iconbitmap(self, path):
+        self.icon = path
+    
+    def protocol(self, name, handler):
+        self.handlers[name] = handler
+    
+    def update(self):
+        handler = self.handlers.get("WM_DELETE_WINDOW")
+        if handler:
+            handler()
+    
+    def destroy(self):
+        self.destroyed = True
+
 class SuiPlugin:
+    API_VERSION = 2
+    
     def __init__(self, interpreter):
         self.interpreter = interpreter
-        self.windows = {}
-        self.running_windows = {}
+        # Interpreters without a display set headless to draw off-screen
+        if getattr(interpreter, 'headless', False):
+            self.window_class, self.canvas_class = HeadlessWindow, HeadlessCanvas
+        else:
+            self.window_class, self.canvas_class = tk.Tk, Canvas
     
-    def register_syntax(self):
+    def register_syntax(self, grammar):
         """Register SUI syntax handlers"""
-        pass
+        grammar.production('sui', self.parse_statement)
     
     def parse_statement(self, tokens, pos):
         """Parse SUI statements"""
-        interpreter = self.interpreter
-        interpreter.tokens = tokens
-        interpreter.pos = pos
+        # Parser state stays local so parsing is reentrant
+        local_pos = pos
         
         def peek(offset=0):
-            if interpreter.pos + offset < len(interpreter.tokens):
-                return interpreter.tokens[interpreter.pos + offset]
+            if local_pos + offset < len(tokens):
+                return tokens[local_pos + offset]
             return None
         
         def consume():
-            if interpreter.pos < len(interpreter.tokens):
-                token = interpreter.tokens[interpreter.pos]
-                interpreter.pos += 1
+            nonlocal local_pos
+            if local_pos < len(tokens):
+                token = tokens[local_pos]
+                local_pos += 1
                 return token
             return None
         
@@ -50,13 +117,13 @@ class SuiPlugin:
                 if peek() and peek()[0] == 'ASSIGN':
                     consume()  # Consume ':'
                     window_name = consume()[1]  # Get window name
-                    return ('SUI_CREATE', window_name), interpreter.pos
+                    return ('SUI_CREATE', window_name), local_pos
             
             # sui run window_name
             elif next_token[0] == 'IDENTIFIER' and next_token[1] == 'run':
                 consume()  # Consume 'run'
                 window_name = consume()[1]  # Get window name
-                return ('SUI_RUN', window_name), interpreter.pos
+                return ('SUI_RUN', window_name), local_pos
             
             # sui set window_name : width : height
             elif next_token[0] == 'IDENTIFIER' and next_token[1] == 'set':
@@ -68,13 +135,13 @@ class SuiPlugin:
                     if peek() and peek()[0] == 'ASSIGN':
                         consume()  # Consume ':'
                         height = consume()[1]  # Get height
-                        return ('SUI_SET_SIZE', window_name, width, height), interpreter.pos
+                        return ('SUI_SET_SIZE', window_name, width, height), local_pos
             
             # sui del window_name
             elif next_token[0] == 'IDENTIFIER' and next_token[1] == 'del':
                 consume()  # Consume 'del'
                 window_name = consume()[1]  # Get window name
-                return ('SUI_DELETE', window_name), interpreter.pos
+                return ('SUI_DELETE', window_name), local_pos
             
             # sui icon : icon_path
             elif next_token[0] == 'IDENTIFIER' and next_token[1] == 'icon':
@@ -82,7 +149,7 @@ class SuiPlugin:
                 if peek() and peek()[0] == 'ASSIGN':
                     consume()  # Consume ':'
                     icon_path = consume()[1]  # Get icon path
-                    return ('SUI_SET_ICON', icon_path), interpreter.pos
+                    return ('SUI_SET_ICON', icon_path), local_pos
             
             # sui shape : x : y : color
             elif next_token[0] == 'IDENTIFIER':
@@ -97,172 +164,211 @@ class SuiPlugin:
                         if peek() and peek()[0] == 'ASSIGN':
                             consume()  # Consume ':'
                             color = consume()[1]  # Get color
-                            return ('SUI_DRAW', shape, x, y, color), interpreter.pos
+                            return ('SUI_DRAW', shape, x, y, color), local_pos
         
         return None, pos
     
-    def execute_statement(self, stmt):
-        """Execute SUI statements"""
+    def compile_statement(self, stmt):
+        """Compile SUI statements into executors"""
         if stmt[0] == 'SUI_CREATE':
-            window_name = stmt[1]
-            try:
-                # Create window
-                window = tk.Tk()
-                window.title(window_name)
-                window.geometry("400x300")
-                
-                # Create canvas for drawing
-                canvas = Canvas(window, width=400, height=300, bg="white")
-                canvas.pack(fill=tk.BOTH, expand=True)
-                
-                self.windows[window_name] = {"window": window, "canvas": canvas}
-                print(f"Window '{window_name}' created")
-            except Exception as e:
-                print(f"Error creating window: {e}")
-            return True
-        
+            handler = self.create_window
         elif stmt[0] == 'SUI_SET_SIZE':
-            window_name, width, height = stmt[1], stmt[2], stmt[3]
-            try:
-                if window_name in self.windows:
-                    window = self.windows[window_name]["window"]
-                    geometry = f"{width}x{height}"
-                    window.geometry(geometry)
-                    
-                    # Update canvas size
-                    canvas = self.windows[window_name]["canvas"]
-                    canvas.config(width=width, height=height)
-                    
-                    print(f"Window '{window_name}' size set to {width}x{height}")
-                else:
-                    print(f"Window '{window_name}' not found")
-            except Exception as e:
-                print(f"Error setting window size: {e}")
-            return True
-        
+            handler = self.set_size
         elif stmt[0] == 'SUI_RUN':
-            window_name = stmt[1]
-            try:
-                if window_name in self.windows:
-                    window = self.windows[window_name]["window"]
-                    # Run window in a blocking way to keep it open
-                    # This will run until the window is closed
-                    print(f"Window '{window_name}' running (blocking)")
-                    
-                    # Set a protocol to handle window closing
-                    def on_closing():
-                        if window_name in self.running_windows:
-                            del self.running_windows[window_name]
-                        if window_name in self.windows:
-                            del self.windows[window_name]
-                        try:
-                            window.destroy()
-                        except:
-                            pass
-                    
-                    window.protocol("WM_DELETE_WINDOW", on_closing)
-                    
-                    # Enter the main loop
-                    self.running_windows[window_name] = True
-                    
-                    # Use a simple loop to keep the window open
-                    while window_name in self.running_windows:
-                        try:
-                            window.update()
-                            import time
-                            time.sleep(0.01)
-                        except:
-                            if window_name in self.running_windows:
-                                del self.running_windows[window_name]
-                            break
-                else:
-                    print(f"Window '{window_name}' not found")
-            except Exception as e:
-                print(f"Error running window: {e}")
-                if window_name in self.running_windows:
-                    del self.running_windows[window_name]
-            return True
-        
+            handler = self.run_window
         elif stmt[0] == 'SUI_DELETE':
-            window_name = stmt[1]
-            try:
-                if window_name in self.windows:
-                    window = self.windows[window_name]["window"]
-                    window.destroy()
-                    del self.windows[window_name]
-                    if window_name in self.running_windows:
-                        del self.running_windows[window_name]
-                    print(f"Window '{window_name}' deleted")
-                else:
-                    print(f"Window '{window_name}' not found")
-            except Exception as e:
-                print(f"Error deleting window: {e}")
-            return True
-        
+            handler = self.delete_window
         elif stmt[0] == 'SUI_SET_ICON':
-            icon_path = stmt[1]
-            try:
-                if self.windows:
-                    # Get the first window (you can modify this to target specific windows)
-                    window_name = next(iter(self.windows))
-                    window = self.windows[window_name]["window"]
-                    # Set window icon
-                    try:
-                        window.iconbitmap(icon_path)
-                        print(f"Window '{window_name}' icon set to: {icon_path}")
-                    except Exception as e:
-                        print(f"Error setting window icon: {e}")
-                else:
-                    print("No windows available to set icon")
-            except Exception as e:
-                print(f"Error setting window icon: {e}")
-            return True
-        
+            handler = self.set_icon
         elif stmt[0] == 'SUI_DRAW':
-            shape, x, y, color = stmt[1], stmt[2], stmt[3], stmt[4]
-            try:
-                # Draw on the last created window or a specific window
-                # For simplicity, draw on the first available window
-                if self.windows:
-                    # Get the first window (you can modify this to target specific windows)
-                    window_name = next(iter(self.windows))
-                    canvas = self.windows[window_name]["canvas"]
-                    
-                    x_val = int(x)
-                    y_val = int(y)
-                    
-                    # Draw different shapes
-                    if shape == 'circle':
-                        # Draw circle (oval)
-                        radius = 20
-                        canvas.create_oval(
-                            x_val - radius, y_val - radius,
-                            x_val + radius, y_val + radius,
-                            fill=color
-                        )
-                    elif shape == 'rectangle':
-                        # Draw rectangle
-                        size = 40
-                        canvas.create_rectangle(
-                            x_val - size/2, y_val - size/2,
-                            x_val + size/2, y_val + size/2,
-                            fill=color
-                        )
-                    elif shape == 'line':
-                        # Draw line (from x,y to x+50,y+50)
-                        canvas.create_line(
-                            x_val, y_val,
-                            x_val + 50, y_val + 50,
-                            fill=color, width=2
-                        )
-                    else:
-                        print(f"Unknown shape: {shape}")
-                    
-                    print(f"Drew {shape} at ({x},{y}) with color {color}")
-                else:
-                    print("No windows available to draw on")
-            except Exception as e:
-                print(f"Error drawing shape: {e}")
+            handler = self.draw
+        else:
+            return None
+        args = stmt[1:]
+        def run(ctx):
+            handler(ctx, *args)
             return True
-        
-        return False
+        return run
+    
+    def compile_async_statement(self, stmt):
+        """Compile SUI statements that wait into coroutine executors"""
+        if stmt[0] == 'SUI_RUN':
+            window_name = stmt[1]
+            async def run(ctx):
+                await self.run_window_async(ctx, window_name)
+                return True
+            return run
+        return None
+    
+    def create_window(self, ctx, window_name):
+        """Create a window with a drawing canvas"""
+        windows = ctx.state('sui.windows')
+        try:
+            # Create window
+            window = self.window_class()
+            window.title(window_name)
+            window.geometry("400x300")
+            
+            # Create canvas for drawing
+            canvas = self.canvas_class(window, width=400, height=300, bg="white")
+            canvas.pack(fill=tk.BOTH, expand=True)
+            
+            windows[window_name] = {"window": window, "canvas": canvas}
+            print(f"Window '{window_name}' created")
+        except Exception as e:
+            print(f"Error creating window: {e}")
+    
+    def set_size(self, ctx, window_name, width, height):
+        """Resize a window and its canvas"""
+        windows = ctx.state('sui.windows')
+        try:
+            if window_name in windows:
+                window = windows[window_name]["window"]
+                geometry = f"{width}x{height}"
+                window.geometry(geometry)
+                
+                # Update canvas size
+                canvas = windows[window_name]["canvas"]
+                canvas.config(width=width, height=height)
+                
+                print(f"Window '{window_name}' size set to {width}x{height}")
+            else:
+                print(f"Window '{window_name}' not found")
+        except Exception as e:
+            print(f"Error setting window size: {e}")
+    
+    def run_window(self, ctx, window_name):
+        """Show a window until it is closed"""
+        for _ in self.window_loop(ctx, window_name):
+            time.sleep(0.01)
+    
+    async def run_window_async(self, ctx, window_name):
+        """Show a window until it is closed, letting other tasks run meanwhile"""
+        for _ in self.window_loop(ctx, window_name):
+            await asyncio.sleep(0.01)
+    
+    def window_loop(self, ctx, window_name):
+        """Update a window until it is closed, yielding whenever it should wait"""
+        windows = ctx.state('sui.windows')
+        running_windows = ctx.state('sui.running_windows')
+        try:
+            if window_name in windows:
+                window = windows[window_name]["window"]
+                # Run window in a blocking way to keep it open
+                # This will run until the window is closed
+                print(f"Window '{window_name}' running (blocking)")
+                
+                # Set a protocol to handle window closing
+                def on_closing():
+                    if window_name in running_windows:
+                        del running_windows[window_name]
+                    if window_name in windows:
+                        del windows[window_name]
+                    try:
+                        window.destroy()
+                    except:
+                        pass
+                
+                window.protocol("WM_DELETE_WINDOW", on_closing)
+                
+                # Enter the main loop
+                running_windows[window_name] = True
+                
+                # Use a simple loop to keep the window open
+                while window_name in running_windows:
+                    try:
+                        window.update()
+                        yield
+                    except:
+                        if window_name in running_windows:
+                            del running_windows[window_name]
+                        break
+            else:
+                print(f"Window '{window_name}' not found")
+        except Exception as e:
+            print(f"Error running window: {e}")
+            if window_name in running_windows:
+                del running_windows[window_name]
+    
+    def delete_window(self, ctx, window_name):
+        """Close and forget a window"""
+        windows = ctx.state('sui.windows')
+        running_windows = ctx.state('sui.running_windows')
+        try:
+            if window_name in windows:
+                window = windows[window_name]["window"]
+                window.destroy()
+                del windows[window_name]
+                if window_name in running_windows:
+                    del running_windows[window_name]
+                print(f"Window '{window_name}' deleted")
+            else:
+                print(f"Window '{window_name}' not found")
+        except Exception as e:
+            print(f"Error deleting window: {e}")
+    
+    def set_icon(self, ctx, icon_path):
+        """Set the icon of the first window"""
+        windows = ctx.state('sui.windows')
+        try:
+            if windows:
+                # Get the first window (you can modify this to target specific windows)
+                window_name = next(iter(windows))
+                window = windows[window_name]["window"]
+                # Set window icon
+                try:
+                    window.iconbitmap(icon_path)
+                    print(f"Window '{window_name}' icon set to: {icon_path}")
+                except Exception as e:
+                    print(f"Error setting window icon: {e}")
+            else:
+                print("No windows available to set icon")
+        except Exception as e:
+            print(f"Error setting window icon: {e}")
+    
+    def draw(self, ctx, shape, x, y, color):
+        """Draw a shape on the first window"""
+        windows = ctx.state('sui.windows')
+        try:
+            # Draw on the last created window or a specific window
+            # For simplicity, draw on the first available window
+            if windows:
+                # Get the first window (you can modify this to target specific windows)
+                window_name = next(iter(windows))
+                canvas = windows[window_name]["canvas"]
+                
+                x_val = int(x)
+                y_val = int(y)
+                
+                # Draw different shapes
+                if shape == 'circle':
+                    # Draw circle (oval)
+                    radius = 20
+                    canvas.create_oval(
+                        x_val - radius, y_val - radius,
+                        x_val + radius, y_val + radius,
+                        fill=color
+                    )
+                elif shape == 'rectangle':
+                    # Draw rectangle
+                    size = 40
+                    canvas.create_rectangle(
+                        x_val - size/2, y_val - size/2,
+                        x_val + size/2, y_val + size/2,
+                        fill=color
+                    )
+                elif shape == 'line':
+                    # Draw line (from x,y to x+50,y+50)
+                    canvas.create_line(
+                        x_val, y_val,
+                        x_val + 50, y_val + 50,
+                        fill=color, width=2
+                    )
+                else:
+                    print(f"Unknown shape: {shape}")
+                
+                print(f"Drew {shape} at ({x},{y}) with color {color}")
+            else:
+                print("No windows available to draw on")
+        except Exception as e:
+            print(f"Error drawing shape: {e}")
@@ -1,14 +1,100 @@
 # Time plugin for SunsetCodeLang
 
 import time
+import heapq
+import asyncio
+import statistics
+
+def format_duration(ns):
+    """Format a duration in nanoseconds with a readable unit"""
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f} {unit}"
+    return f"{ns:.0f} ns"
+
+class TimerHeap:
+    """Scheduled sde functions ordered by deadline in a binary heap
+    
+    Adding a timer and taking the next due one are O(log n). Cancelled
+    timers are only marked, and are dropped when they reach the top or
+    when they make up most of the heap.
+    """
+    
+    def __init__(self):
+        # Entries are [deadline_ns, sequence, func_name, interval_ns, cancelled]
+        self.heap = []
+        self.by_name = {}
+        self.sequence = 0
+        self.cancelled = 0
+        # Live timers that fire once; time : run without a duration waits for these
+        self.one_shot = 0
+    
+    def __len__(self):
+        return len(self.heap) - self.cancelled
+    
+    def add(self, deadline, func_name, interval=None):
+        """Schedule func_name at deadline, then every interval if given"""
+        self.sequence += 1
+        entry = [deadline, self.sequence, func_name, interval, False]
+        heapq.heappush(self.heap, entry)
+        if interval is None:
+            self.one_shot += 1
+        self.by_name.setdefault(func_name, []).append(entry)
+    
+    def cancel(self, func_name):
+        """Cancel every timer of func_name; return how many there were"""
+        entries = self.by_name.pop(func_name, [])
+        for entry in entries:
+            entry[4] = True
+            if entry[3] is None:
+                self.one_shot -= 1
+        self.cancelled += len(entries)
+        if self.cancelled > len(self.heap) // 2:
+            self.heap = [entry for entry in self.heap if not entry[4]]
+            heapq.heapify(self.heap)
+            self.cancelled = 0
+        return len(entries)
+    
+    def next_deadline(self):
+        """Return the earliest deadline, or None if no timers are left"""
+        heap = self.heap
+        while heap and heap[0][4]:
+            heapq.heappop(heap)
+            self.cancelled -= 1
+        return heap[0][0] if heap else None
+    
+    def pop(self):
+        """Remove and return the earliest timer"""
+        self.next_deadline()
+        entry = heapq.heappop(self.heap)
+        if entry[3] is None:
+            self.one_shot -= 1
+            self.by_name[entry[2]].remove(entry)
+            if not self.by_name[entry[2]]:
+                del self.by_name[entry[2]]
+        return entry
+    
+    def reschedule(self, entry, deadline):
+        """Put a repeating timer back with its next deadline"""
+        entry[0] = deadline
+        heapq.heappush(self.heap, entry)
 
 class TimePlugin:
+    API_VERSION = 2
+    
     def __init__(self, interpreter):
         self.interpreter = interpreter
+        # Clock returning a struct_time; interpreters may inject a fixed one
+        self.clock = getattr(interpreter, 'clock', time.localtime)
+        # Monotonic nanosecond timer for stopwatches and benchmarks
+        self.timer = getattr(interpreter, 'timer', time.perf_counter_ns)
+        # Waiting, injectable together with the timer
+        self.sleep = getattr(interpreter, 'sleep', time.sleep)
+        self.async_sleep = getattr(interpreter, 'async_sleep', asyncio.sleep)
     
-    def register_syntax(self):
+    def register_syntax(self, grammar):
         """Register time syntax handlers"""
-        pass
+        grammar.production('time', self.parse_statement)
     
     def parse_statement(self, tokens, pos):
         """Parse time-related statements"""
@@ -28,6 +114,13 @@ class TimePlugin:
                 return token
             return None
         
+        def argument(kind='IDENTIFIER'):
+            # ': value' of the given token kind, or None
+            if peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] == kind:
+                consume()  # Consume ':'
+                return consume()[1]
+            return None
+        
         token = peek()
         if not token:
             return None, pos
@@ -41,13 +134,229 @@ class TimePlugin:
                 if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] == 'now':
                     consume()  # Consume 'now'
                     return ('TIME_NOW',), local_pos
+                # Sleep statement: time : sleep : 0.5
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] == 'sleep':
+                    consume()  # Consume 'sleep'
+                    if peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] == 'NUMBER':
+                        consume()  # Consume ':'
+                        seconds = self.interpreter.evaluate_expression(consume())
+                        return ('TIME_SLEEP', seconds), local_pos
+                # Stopwatches: time : start : name, time : stop : name
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] in ('start', 'stop'):
+                    consume()  # Consume 'start' or 'stop'
+                    name = argument()
+                    if name:
+                        return ('TIME_' + sub_token[1].upper(), name), local_pos
+                # Elapsed seconds into a variable: time : elapsed : name : var
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] == 'elapsed':
+                    consume()  # Consume 'elapsed'
+                    name = argument()
+                    var_name = argument() if name else None
+                    if var_name:
+                        return ('TIME_ELAPSED', name, var_name), local_pos
+                # Benchmark a function: time : bench : func : runs
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] == 'bench':
+                    consume()  # Consume 'bench'
+                    func_name = argument()
+                    runs = argument('NUMBER') if func_name else None
+                    if runs and runs.isdigit() and int(runs) > 0:
+                        return ('TIME_BENCH', func_name, int(runs)), local_pos
+                # Timers: time : every : seconds : func, time : after : seconds : func
+                # They only fire while time : run is running
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] in ('every', 'after'):
+                    consume()  # Consume 'every' or 'after'
+                    seconds = argument('NUMBER')
+                    func_name = argument() if seconds else None
+                    if func_name:
+                        seconds = self.interpreter.evaluate_expression(('NUMBER', seconds))
+                        # Repeating intervals are whole nanoseconds; shorter ones would never advance
+                        if round(seconds * 1e9) > 0 or sub_token[1] == 'after':
+                            return ('TIME_' + sub_token[1].upper(), seconds, func_name), local_pos
+                # Cancel a function's timers: time : cancel : func
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] == 'cancel':
+                    consume()  # Consume 'cancel'
+                    func_name = argument()
+                    if func_name:
+                        return ('TIME_CANCEL', func_name), local_pos
+                # Run timers for some seconds: time : run : 2, or without a duration
+                # until only repeating timers are left
+                if sub_token and sub_token[0] == 'IDENTIFIER' and sub_token[1] == 'run':
+                    consume()  # Consume 'run'
+                    seconds = argument('NUMBER')
+                    if seconds is not None:
+                        seconds = self.interpreter.evaluate_expression(('NUMBER', seconds))
+                    return ('TIME_RUN', seconds), local_pos
         
         return None, pos
     
-    def execute_statement(self, stmt):
-        """Execute time-related statements"""
+    def compile_statement(self, stmt):
+        """Compile time statements into executors"""
         if stmt[0] == 'TIME_NOW':
-            current_time = time.strftime('%Y-%m-%d %H:%M:%S')
-            print(f"Current time: {current_time}")
-            return True
-        return False
+            clock = self.clock
+            def run(ctx):
+                current_time = time.strftime('%Y-%m-%d %H:%M:%S', clock())
+                print(f"Current time: {current_time}")
+                return True
+            return run
+        elif stmt[0] == 'TIME_SLEEP':
+            seconds = stmt[1]
+            sleep = self.sleep
+            def run(ctx):
+                sleep(seconds)
+                return True
+            return run
+        elif stmt[0] == 'TIME_START':
+            handler = self.start
+        elif stmt[0] == 'TIME_STOP':
+            handler = self.stop
+        elif stmt[0] == 'TIME_ELAPSED':
+            handler = self.elapsed
+        elif stmt[0] == 'TIME_BENCH':
+            handler = self.bench
+        elif stmt[0] == 'TIME_EVERY' or stmt[0] == 'TIME_AFTER':
+            handler = self.schedule
+            stmt = stmt + (stmt[0] == 'TIME_EVERY',)
+        elif stmt[0] == 'TIME_CANCEL':
+            handler = self.cancel
+        elif stmt[0] == 'TIME_RUN':
+            handler = self.run_timers
+        else:
+            return None
+        args = stmt[1:]
+        return lambda ctx: handler(ctx, *args)
+    
+    def compile_async_statement(self, stmt):
+        """Compile waiting statements into coroutines for the asyncio mode"""
+        if stmt[0] == 'TIME_SLEEP':
+            seconds = stmt[1]
+            async_sleep = self.async_sleep
+            async def run(ctx):
+                await async_sleep(seconds)
+                return True
+            return run
+        elif stmt[0] == 'TIME_RUN':
+            seconds = stmt[1]
+            async def run(ctx):
+                return await self.run_timers_async(ctx, seconds)
+            return run
+        return None
+    
+    def start(self, ctx, name):
+        """Start or restart a stopwatch, keeping the time it has already run"""
+        stopwatches = ctx.state('time.stopwatches')
+        # A stopwatch is [total nanoseconds, start of the running lap or None]
+        stopwatch = stopwatches.setdefault(name, [0, None])
+        stopwatch[1] = self.timer()
+        return True
+    
+    def stop(self, ctx, name):
+        """Stop a running stopwatch"""
+        stopwatch = ctx.state('time.stopwatches').get(name)
+        if stopwatch is None or stopwatch[1] is None:
+            print(f"Stopwatch '{name}' is not running")
+            return False
+        stopwatch[0] += self.timer() - stopwatch[1]
+        stopwatch[1] = None
+        return True
+    
+    def elapsed(self, ctx, name, var_name):
+        """Store a stopwatch's elapsed seconds in a variable"""
+        stopwatch = ctx.state('time.stopwatches').get(name)
+        if stopwatch is None:
+            print(f"Stopwatch '{name}' not found")
+            return False
+        total = stopwatch[0]
+        if stopwatch[1] is not None:
+            total += self.timer() - stopwatch[1]
+        ctx.variables[var_name] = total / 1e9
+        return True
+    
+    def bench(self, ctx, func_name, runs):
+        """Run a function runs times and report min, median and p99"""
+        call = self.interpreter.compile_statement(('FUNCTION_CALL', func_name))
+        timer = self.timer
+        samples = []
+        for _ in range(runs):
+            start = timer()
+            if not call(ctx):
+                print(f"Function '{func_name}' not found")
+                return False
+            samples.append(timer() - start)
+        samples.sort()
+        # Nearest-rank 99th percentile
+        p99 = samples[max(0, -(-99 * runs // 100) - 1)]
+        print(f"Benchmark {func_name}: {runs} runs, min {format_duration(samples[0])}, "
+              f"median {format_duration(statistics.median(samples))}, p99 {format_duration(p99)}")
+        return True
+    
+    def schedule(self, ctx, seconds, func_name, repeat):
+        """Schedule a function after a delay, repeating every delay if repeat"""
+        interval = round(seconds * 1e9)
+        ctx.state('time.timers', TimerHeap).add(self.timer() + interval, func_name,
+                                                interval if repeat else None)
+        return True
+    
+    def cancel(self, ctx, func_name):
+        """Cancel every timer of a function"""
+        ctx.state('time.timers', TimerHeap).cancel(func_name)
+        return True
+    
+    def run_timers(self, ctx, seconds):
+        """Fire timers for seconds, or until only repeating timers are left"""
+        calls = {}
+        for action, arg in self.timer_loop(ctx, seconds):
+            if action == 'sleep':
+                self.sleep(arg)
+            else:
+                if arg not in calls:
+                    calls[arg] = self.interpreter.compile_statement(('FUNCTION_CALL', arg))
+                if not calls[arg](ctx):
+                    print(f"Function '{arg}' not found")
+                    return False
+        return True
+    
+    async def run_timers_async(self, ctx, seconds):
+        """Fire timers like run_timers, letting other tasks run"""
+        plugins = ctx.state('program').get('plugins')
+        for action, arg in self.timer_loop(ctx, seconds):
+            if action == 'sleep':
+                await self.async_sleep(arg)
+            else:
+                call = self.interpreter.compile_async_statement(('FUNCTION_CALL', arg), plugins)
+                if not await call(ctx):
+                    print(f"Function '{arg}' not found")
+                    return False
+        return True
+    
+    def timer_loop(self, ctx, seconds):
+        """Yield ('sleep', seconds) to wait and ('call', func_name) for each due timer
+        
+        Without seconds, the loop ends once no one-shot timer is pending, as
+        repeating timers alone would run forever. Repeating timers are
+        rescheduled from their previous deadline, so they do not drift. A
+        timer that fell whole intervals behind skips them and reports the
+        missed deadlines.
+        """
+        timers = ctx.state('time.timers', TimerHeap)
+        timer = self.timer
+        end = None if seconds is None else timer() + round(seconds * 1e9)
+        while True:
+            deadline = timers.next_deadline()
+            if deadline is None or (deadline > end if end is not None else not timers.one_shot):
+                break
+            now = timer()
+            if deadline > now:
+                yield 'sleep', (deadline - now) / 1e9
+                continue
+            entry = timers.pop()
+            interval = entry[3]
+            if interval is not None:
+                missed = (now - deadline) // interval
+                if missed:
+                    print(f"Timer '{entry[2]}' missed {missed} deadline{'s' if missed > 1 else ''}")
+                timers.reschedule(entry, deadline + (missed + 1) * interval)
+            yield 'call', entry[2]
+        if end is not None:
+            remaining = end - timer()
+            if remaining > 0:
+                yield 'sleep', remaining / 1e9
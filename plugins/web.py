@@ -0,0 +1,301 @@
+# Web plugin for SunsetCodeLang
+# HTTP requests over pooled keep-alive connections
+
+import time
+import atexit
+import asyncio
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from scl_types import SCLList
+
+USER_AGENT = 'SCL-Web/1.0'
+CHUNK_SIZE = 64 * 1024
+# Requests in flight at once for web_get_all, and idle connections kept per host
+MAX_WORKERS = 8
+MAX_REDIRECTS = 5
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+# First retry delay in seconds, doubled for every further retry
+BACKOFF = 0.25
+# Rate limiting and temporary server errors are worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+WEB_METHODS = {'web_get': 'GET', 'web_post': 'POST', 'web_put': 'PUT', 'web_delete': 'DELETE'}
+
+class ConnectionPool:
+    """Idle keep-alive connections per host, shared by every thread
+    
+    A connection is taken out of the pool for one request and put back
+    once its response has been read in full, so threads never share one.
+    """
+    
+    def __init__(self, max_idle=MAX_WORKERS):
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle = {}
+    
+    def connect(self, key, timeout):
+        """Open a new connection to (scheme, netloc)"""
+        scheme, netloc = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=timeout)
+        if scheme == 'http':
+            return http.client.HTTPConnection(netloc, timeout=timeout)
+        raise ValueError(f"Unsupported URL scheme: {scheme}")
+    
+    def acquire(self, key, timeout):
+        """Return (connection, reused), reusing an idle connection when there is one"""
+        with self.lock:
+            conns = self.idle.get(key)
+            conn = conns.pop() if conns else None
+        if conn is None:
+            return self.connect(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+    
+    def release(self, key, conn, response):
+        """Put a connection back after its response has been read"""
+        if response.will_close:
+            conn.close()
+            return
+        with self.lock:
+            conns = self.idle.setdefault(key, [])
+            if len(conns) < self.max_idle:
+                conns.append(conn)
+                return
+        conn.close()
+    
+    def close(self):
+        """Close every idle connection"""
+        with self.lock:
+            idle, self.idle = self.idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+class WebPlugin:
+    API_VERSION = 2
+    
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.pool = ConnectionPool()
+        # Waiting between retries, injectable like the time plugin's
+        self.sleep = getattr(interpreter, 'sleep', time.sleep)
+        self.executor = None
+        self.executor_lock = threading.Lock()
+    
+    def register_syntax(self, grammar):
+        """Register web syntax handlers"""
+        grammar.production('web_config', self.parse_config)
+        # Requests: page : web_get : "http://example.com"
+        grammar.production(None, self.parse_statement)
+    
+    def parse_config(self, tokens, pos):
+        """Parse request settings: web_config : timeout : 5, web_config : retries : 2"""
+        if (pos + 5 <= len(tokens) and tokens[pos + 1][0] == 'ASSIGN' and
+                tokens[pos + 2][0] == 'IDENTIFIER' and tokens[pos + 2][1] in ('timeout', 'retries') and
+                tokens[pos + 3][0] == 'ASSIGN' and tokens[pos + 4][0] == 'NUMBER'):
+            value = self.interpreter.evaluate_expression(tokens[pos + 4])
+            if tokens[pos + 2][1] == 'retries' and not isinstance(value, int):
+                return None, pos
+            return ('WEB_CONFIG', tokens[pos + 2][1], value), pos + 5
+        return None, pos
+    
+    def parse_statement(self, tokens, pos):
+        """Parse web requests into a variable"""
+        local_pos = pos
+        
+        def peek(offset=0):
+            if local_pos + offset < len(tokens):
+                return tokens[local_pos + offset]
+            return None
+        
+        def consume():
+            nonlocal local_pos
+            if local_pos < len(tokens):
+                token = tokens[local_pos]
+                local_pos += 1
+                return token
+            return None
+        
+        def argument():
+            # ': value' where value is a literal or a variable, or None
+            if peek() and peek()[0] == 'ASSIGN' and peek(1) and peek(1)[0] in ['STRING', 'NUMBER', 'IDENTIFIER']:
+                consume()  # Consume ':'
+                return consume()
+            return None
+        
+        if not (peek() and peek()[0] == 'IDENTIFIER' and peek(1) and peek(1)[0] == 'ASSIGN' and
+                peek(2) and peek(2)[0] == 'IDENTIFIER'):
+            return None, pos
+        var_name = consume()[1]
+        consume()  # Consume ':'
+        keyword = consume()[1]
+        
+        # Fan-out: pages : web_get_all : urls
+        if keyword == 'web_get_all':
+            urls = argument()
+            if urls:
+                return ('WEB_GET_ALL', var_name, urls), local_pos
+            return None, pos
+        
+        # page : web_get : url, reply : web_post : url : body, with an optional
+        # ': path' at the end to stream the response body into a file
+        if keyword not in WEB_METHODS:
+            return None, pos
+        method = WEB_METHODS[keyword]
+        url = argument()
+        if not url:
+            return None, pos
+        body = None
+        if method in ('POST', 'PUT'):
+            body = argument()
+            if not body:
+                return None, pos
+        path = argument()
+        return ('WEB_REQUEST', var_name, method, url, body, path), local_pos
+    
+    def compile_statement(self, stmt):
+        """Compile web statements into executors"""
+        interpreter = self.interpreter
+        if stmt[0] == 'WEB_CONFIG':
+            setting, value = stmt[1], stmt[2]
+            def run(ctx):
+                ctx.state('web.config')[setting] = value
+                return True
+            return run
+        elif stmt[0] == 'WEB_REQUEST':
+            var_name, method = stmt[1], stmt[2]
+            url = interpreter.compile_expression(stmt[3])
+            body = interpreter.compile_expression(stmt[4]) if stmt[4] else None
+            path = interpreter.compile_expression(stmt[5]) if stmt[5] else None
+            def run(ctx):
+                ctx.variables[var_name] = self.request(
+                    ctx, method, str(url(ctx)),
+                    None if body is None else body(ctx),
+                    None if path is None else str(path(ctx)))
+                return True
+            return run
+        elif stmt[0] == 'WEB_GET_ALL':
+            var_name = stmt[1]
+            urls = interpreter.compile_expression(stmt[2])
+            def run(ctx):
+                ctx.variables[var_name] = self.get_all(ctx, urls(ctx))
+                return True
+            return run
+        return None
+    
+    def compile_async_statement(self, stmt):
+        """Run requests on a worker thread in the asyncio mode, so other tasks keep running"""
+        if stmt[0] == 'WEB_REQUEST' or stmt[0] == 'WEB_GET_ALL':
+            executor = self.compile_statement(stmt)
+            async def run(ctx):
+                return await asyncio.to_thread(executor, ctx)
+            return run
+        return None
+    
+    def get_all(self, ctx, urls):
+        """GET many URLs at once on a bounded worker pool; return the bodies in order"""
+        if isinstance(urls, str):
+            urls = [urls]
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='scl-web')
+                atexit.register(self.executor.shutdown)
+        return SCLList(self.executor.map(lambda url: self.request(ctx, 'GET', str(url)), list(urls)))
+    
+    def request(self, ctx, method, url, body=None, path=None):
+        """Send a request, retrying with backoff
+        
+        Returns the response body, or streams it into the file at path and
+        returns its size in bytes.
+        """
+        config = ctx.state('web.config')
+        timeout = config.get('timeout', DEFAULT_TIMEOUT)
+        retries = config.get('retries', DEFAULT_RETRIES)
+        data = None if body is None else str(body).encode('utf-8')
+        
+        for attempt in range(retries + 1):
+            last = attempt == retries or method not in IDEMPOTENT_METHODS
+            try:
+                response, conn, key = self.open(method, url, data, timeout)
+            except (http.client.HTTPException, OSError):
+                if last:
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or last:
+                    return self.read(response, conn, key, url, path)
+                response.read()
+                self.pool.release(key, conn, response)
+            self.sleep(BACKOFF * 2 ** attempt)
+    
+    def open(self, method, url, data, timeout):
+        """Send one request, following redirects; return (response, connection, pool key)"""
+        headers = {'User-Agent': USER_AGENT}
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            target = parts.path or '/'
+            if parts.query:
+                target += '?' + parts.query
+            key = (parts.scheme, parts.netloc)
+            
+            # A reused connection may have been closed by the server; retry once on
+            # a new one, unless the server may already have acted on the request
+            conn, reused = self.pool.acquire(key, timeout)
+            try:
+                conn.request(method, target, body=data, headers=headers)
+                response = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if not reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                conn = self.pool.connect(key, timeout)
+                try:
+                    conn.request(method, target, body=data, headers=headers)
+                    response = conn.getresponse()
+                except BaseException:
+                    conn.close()
+                    raise
+            
+            location = response.getheader('Location')
+            if response.status in REDIRECT_STATUSES and location:
+                response.read()
+                self.pool.release(key, conn, response)
+                url = urllib.parse.urljoin(url, location)
+                if response.status == 303:
+                    method, data = 'GET', None
+                continue
+            return response, conn, key
+        raise http.client.HTTPException(f"Too many redirects: {url}")
+    
+    def read(self, response, conn, key, url, path):
+        """Read a response in chunks into a string, or into the file at path"""
+        try:
+            if response.status >= 400:
+                response.read()
+                result = None
+            elif path is None:
+                chunks = []
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                    chunks.append(chunk)
+                result = b''.join(chunks).decode('utf-8', errors='replace')
+            else:
+                result = 0
+                with open(path, 'wb') as f:
+                    for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                        f.write(chunk)
+                        result += len(chunk)
+        except BaseException:
+            conn.close()
+            raise
+        self.pool.release(key, conn, response)
+        if response.status >= 400:
+            raise http.client.HTTPException(f"HTTP {response.status} {response.reason}: {url}")
+        return result
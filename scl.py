@@ -6,18 +6,143 @@ Main interpreter for the SCL language
 
 import sys
 import os
-import re
+import asyncio
+import threading
+import traceback
 import importlib.util
 
+# Native fast paths when the C++ extension is built, pure Python otherwise
+try:
+    import scl_backend as default_backend
+except ImportError:
+    import scl_pybackend as default_backend
+from scl_plugins import PLUGIN_API_VERSION, Grammar, PluginAdapter, PluginManifest, load_lockfile
+from scl_lexer import scan_file
+from scl_fileview import LARGE_FILE_SIZE
+
+class ExecutionContext:
+    """Mutable state of one program run
+    
+    Loaded plugins and compiled programs are shared; everything a run
+    changes lives in its context, so one interpreter can serve many runs
+    on different threads at once.
+    """
+    
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.variables = {}
+        self.plugin_state = {}
+    
+    def state(self, key, factory=dict):
+        """Return this run's state for a plugin, creating it on first use"""
+        state = self.plugin_state.get(key)
+        if state is None:
+            state = self.plugin_state[key] = factory()
+        return state
+
+class Program:
+    """A compiled SCL program; immutable, so threads can run it concurrently
+    
+    Each step is (line_num, line, executor, error), where error is reported
+    if the executor returns False. imports holds, for each step, the
+    plugins imported above it; function bodies called by the step are
+    parsed with those plugins.
+    """
+    
+    def __init__(self, steps, imports=None):
+        self.steps = tuple(steps)
+        self.imports = tuple(imports) if imports is not None else (None,) * len(self.steps)
+    
+    def run(self, ctx):
+        """Run the program in an execution context; returns False on error"""
+        session = ctx.state('program')
+        for (line_num, line, executor, error), plugins in zip(self.steps, self.imports):
+            session['plugins'] = plugins
+            try:
+                if not executor(ctx):
+                    _report_error(line_num, line, error)
+                    return False
+            except Exception as e:
+                _report_error(line_num, line, e)
+                traceback.print_exc()
+                return False
+        return True
+
+class AsyncProgram(Program):
+    """A compiled program run as a task on an asyncio event loop
+    
+    Steps are coroutine functions. Functions started with sde spawn<>
+    run as further tasks on the same loop and the program finishes once
+    they have, so many programs and tasks can share one loop.
+    """
+    
+    async def run(self, ctx):
+        """Run the program and its tasks; returns False on error"""
+        session = ctx.state('program')
+        tasks = ctx.state('async').setdefault('tasks', {})
+        try:
+            for (line_num, line, executor, error), plugins in zip(self.steps, self.imports):
+                session['plugins'] = plugins
+                try:
+                    if not await executor(ctx):
+                        _report_error(line_num, line, error)
+                        return False
+                except Exception as e:
+                    _report_error(line_num, line, e)
+                    traceback.print_exc()
+                    return False
+            # Tasks may spawn further tasks while they are awaited
+            while tasks:
+                await asyncio.gather(*[task for name in list(tasks) for task in tasks.pop(name)])
+            return True
+        finally:
+            for pending in tasks.values():
+                for task in pending:
+                    task.cancel()
+
+def _report_error(line_num, line, error):
+    print(f"Error at line {line_num}: {error}")
+    print(f"Code: {line}")
+
+def _raiser(error):
+    """Return an executor that raises error, for steps that failed to parse"""
+    def run(ctx):
+        raise error
+    return run
+
+def _coroutine(executor):
+    """Wrap a synchronous executor for the asyncio mode"""
+    if executor is None:
+        return None
+    async def run(ctx):
+        return executor(ctx)
+    return run
+
 class SCLInterpreter:
-    def __init__(self):
+    def __init__(self, backend=None):
+        self.backend = backend or default_backend
         self.variables = {}
         self.functions = {}
         self.plugins = {}
+        self.grammars = {}
+        self.plugin_state = {}
         self.loaded_plugins = set()
+        self.manifest = PluginManifest()
+        self.lock = threading.RLock()
+    
+    # execute() runs with the interpreter itself as the execution context
+    state = ExecutionContext.state
     
-    def load_plugin(self, plugin_path):
-        """Load a plugin from the given path"""
+    def new_context(self):
+        """Return a fresh execution context for running a compiled program"""
+        return ExecutionContext(self)
+    
+    def load_plugin(self, plugin_path, quiet=False):
+        """Load a plugin from the given path; quiet suppresses error output"""
+        with self.lock:
+            return self._load_plugin(plugin_path, quiet)
+    
+    def _load_plugin(self, plugin_path, quiet):
         try:
             # Convert plugin path to module path
             # e.g., other>time becomes plugins.other.time
@@ -28,11 +153,11 @@ class SCLInterpreter:
             if full_module_name in self.loaded_plugins:
                 return True
             
-            # Create plugin file path
-            plugin_file = os.path.join('plugins', plugin_path.replace('>', os.sep) + '.py')
-            
-            if not os.path.exists(plugin_file):
-                print(f"Error: Plugin {plugin_path} not found at {plugin_file}")
+            # Look the plugin up in the shared manifest (one stat when cached)
+            plugin_file = self.manifest.plugin_file(plugin_path)
+            if self.manifest.get(plugin_path) is None:
+                if not quiet:
+                    print(f"Error: Plugin {plugin_path} not found at {plugin_file}")
                 return False
             
             # Load the plugin module
@@ -43,106 +168,32 @@ class SCLInterpreter:
             # Create plugin instance
             plugin_class = getattr(plugin_module, f'{plugin_path.split(">")[-1].capitalize()}Plugin', None)
             if not plugin_class:
-                print(f"Error: Plugin {plugin_path} does not have a proper plugin class")
+                if not quiet:
+                    print(f"Error: Plugin {plugin_path} does not have a proper plugin class")
                 return False
             
             plugin_instance = plugin_class(self)
-            self.plugins[plugin_path] = plugin_instance
-            self.loaded_plugins.add(full_module_name)
+            if getattr(plugin_instance, 'API_VERSION', 1) < PLUGIN_API_VERSION:
+                plugin_instance = PluginAdapter(plugin_instance)
             
-            # Register syntax handlers
-            if hasattr(plugin_instance, 'register_syntax'):
-                plugin_instance.register_syntax()
+            # Register grammar productions
+            grammar = Grammar()
+            plugin_instance.register_syntax(grammar)
             
+            # Replace rather than mutate, so other threads never see a dict change size
+            self.grammars = {**self.grammars, plugin_path: grammar}
+            self.plugins = {**self.plugins, plugin_path: plugin_instance}
+            self.loaded_plugins.add(full_module_name)
             return True
         except Exception as e:
-            print(f"Error loading plugin {plugin_path}: {e}")
-            import traceback
-            traceback.print_exc()
+            if not quiet:
+                print(f"Error loading plugin {plugin_path}: {e}")
+                traceback.print_exc()
             return False
     
     def tokenize(self, code):
         """Tokenize the SCL code"""
-        tokens = []
-        code = code.strip()
-        i = 0
-        n = len(code)
-        
-        while i < n:
-            # Skip whitespace
-            while i < n and code[i].isspace():
-                i += 1
-            
-            if i >= n:
-                break
-            
-            char = code[i]
-            
-            # String literal
-            if char == '"':
-                j = i + 1
-                while j < n and code[j] != '"':
-                    j += 1
-                if j < n:
-                    tokens.append(('STRING', code[i+1:j]))
-                    i = j + 1
-                else:
-                    tokens.append(('STRING', code[i+1:]))
-                    i = n
-            
-            # Number literal
-            elif char.isdigit():
-                j = i
-                while j < n and (code[j].isdigit() or code[j] == '.'):
-                    j += 1
-                tokens.append(('NUMBER', code[i:j]))
-                i = j
-            
-            # Identifier
-            elif char.isalpha() or char == '_':
-                j = i
-                while j < n and (code[j].isalnum() or code[j] == '_'):
-                    j += 1
-                tokens.append(('IDENTIFIER', code[i:j]))
-                i = j
-            
-            # Separator
-            elif char == '|':
-                tokens.append(('SEPARATOR', char))
-                i += 1
-            
-            # Assignment
-            elif char == ':':
-                tokens.append(('ASSIGN', char))
-                i += 1
-            
-            # Operator
-            elif char in '+-*/=<>!&|':
-                j = i
-                while j < n and code[j] in '+-*/=<>!&|':
-                    j += 1
-                tokens.append(('OPERATOR', code[i:j]))
-                i = j
-            
-            # Parentheses
-            elif char in '()[]{}':
-                tokens.append(('PAREN', char))
-                i += 1
-            
-            # Comment
-            elif char == '#':
-                j = i
-                while j < n and code[j] != '\n':
-                    j += 1
-                tokens.append(('COMMENT', code[i:j]))
-                i = j
-            
-            # Unknown character
-            else:
-                tokens.append(('UNKNOWN', char))
-                i += 1
-        
-        return tokens
+        return self.backend.tokenize(code)
     
     def parse_expression(self, tokens, pos):
         """Parse an expression from the tokens"""
@@ -163,13 +214,15 @@ class SCLInterpreter:
             return None, pos
         return None, pos
     
-    def parse_statement(self, tokens, pos):
-        """Parse a statement from the tokens"""
-        for plugin_name, plugin in self.plugins.items():
-            if hasattr(plugin, 'parse_statement'):
-                stmt, new_pos = plugin.parse_statement(tokens, pos)
-                if stmt:
-                    return stmt, new_pos
+    def parse_statement(self, tokens, pos, plugins=None):
+        """Parse a statement from the tokens, with the named plugins or all loaded"""
+        # Plugins are published after their grammars, so read them first
+        names = self.plugins if plugins is None else plugins
+        grammars = self.grammars
+        for plugin_name in names:
+            stmt, new_pos = grammars[plugin_name].parse(tokens, pos)
+            if stmt:
+                return stmt, new_pos
         return None, pos
     
     def evaluate_expression(self, expr):
@@ -188,19 +241,163 @@ class SCLInterpreter:
             return self.variables.get(expr[1], 0)
         return 0
     
+    def compile_expression(self, expr):
+        """Return a function evaluating expr in an execution context"""
+        if expr[0] == 'IDENTIFIER':
+            name = expr[1]
+            return lambda ctx: ctx.variables.get(name, 0)
+        value = self.evaluate_expression(expr)
+        return lambda ctx: value
+    
+    def compile_statement(self, stmt, plugins=None):
+        """Return an executor running stmt on the first plugin that accepts it
+        
+        An executor takes an execution context and returns True if the
+        statement ran. plugins names the plugins to try, in order.
+        """
+        loaded = self.plugins
+        names = loaded if plugins is None else plugins
+        executors = [executor for executor in (loaded[name].compile_statement(stmt) for name in names) if executor]
+        if len(executors) == 1:
+            return executors[0]
+        
+        def run(ctx):
+            for executor in executors:
+                if executor(ctx):
+                    return True
+            return False
+        return run
+    
     def execute_statement(self, stmt):
         """Execute a statement"""
-        for plugin_name, plugin in self.plugins.items():
-            if hasattr(plugin, 'execute_statement'):
-                if plugin.execute_statement(stmt):
+        return self.backend.execute_statement(self, stmt)
+    
+    def dispatch_statement(self, stmt):
+        """Execute a statement through the loaded plugins"""
+        return self.compile_statement(stmt)(self)
+    
+    def check_statement(self, line):
+        """Parse one line without executing it; return an error message or None"""
+        try:
+            tokens = self.tokenize(line)
+            if tokens:
+                stmt, _ = self.parse_statement(tokens, 0)
+                if not stmt:
+                    return "Invalid syntax"
+        except Exception as e:
+            return str(e)
+        return None
+    
+    def compile_async_statement(self, stmt, plugins=None):
+        """Return a coroutine executor for stmt, for the asyncio mode
+        
+        Plugins with compile_async_statement handle the statements that
+        wait; everything else runs its ordinary executor.
+        """
+        loaded = self.plugins
+        names = loaded if plugins is None else plugins
+        executors = []
+        for name in names:
+            plugin = loaded[name]
+            compile_async = getattr(plugin, 'compile_async_statement', None)
+            executor = compile_async(stmt) if compile_async else None
+            executor = executor or _coroutine(plugin.compile_statement(stmt))
+            if executor:
+                executors.append(executor)
+        
+        async def run(ctx):
+            for executor in executors:
+                if await executor(ctx):
                     return True
-        return False
+            return False
+        return run
+    
+    def compile(self, code, asynchronous=False):
+        """Compile code into a Program, or an AsyncProgram if asynchronous
+        
+        Plugins are imported and every line is parsed up front, each with
+        only the plugins imported above it. Errors become steps reported
+        when the program reaches them, as execute() would.
+        """
+        steps = []
+        imports = []
+        imported = []
+        if asynchronous:
+            compile_statement, wrap = self.compile_async_statement, _coroutine
+        else:
+            compile_statement, wrap = self.compile_statement, lambda executor: executor
+        
+        for line_num, line in enumerate(code.split('\n'), 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            if line.startswith('simp{') and line.endswith('}'):
+                plugin_path = line[5:-1].strip()
+                if not self.load_plugin(plugin_path, quiet=True):
+                    def report(ctx):
+                        # Loading again at run time prints the reason in order
+                        self.load_plugin(plugin_path)
+                        return False
+                    steps.append((line_num, line, wrap(report), f"Failed to load plugin {plugin_path}"))
+                    imports.append(tuple(imported))
+                    break
+                if plugin_path not in imported:
+                    imported.append(plugin_path)
+                continue
+            
+            try:
+                tokens = self.tokenize(line)
+                if not tokens:
+                    continue
+                stmt, _ = self.parse_statement(tokens, 0, imported)
+            except Exception as e:
+                steps.append((line_num, line, wrap(_raiser(e)), None))
+                imports.append(tuple(imported))
+                break
+            imports.append(tuple(imported))
+            if not stmt:
+                steps.append((line_num, line, wrap(lambda ctx: False), "Invalid syntax"))
+                break
+            steps.append((line_num, line, compile_statement(stmt, tuple(imported)), "Failed to execute statement"))
+        
+        if asynchronous:
+            return AsyncProgram(steps, imports)
+        return Program(steps, imports)
     
     def execute(self, code, file_path=None):
         """Execute the given SCL code"""
-        lines = code.split('\n')
+        return self.execute_lines(code.split('\n'))
+    
+    def execute_file(self, file_path):
+        """Execute a UTF-8 file, tokenized in one pass through a memory map
         
-        for line_num, line in enumerate(lines, 1):
+        Tokens are kept as offsets into the mapping, so neither the text
+        nor a list of tokens per line is held in memory.
+        """
+        stream = scan_file(file_path)
+        try:
+            lines = map(stream.line_text, range(stream.line_count()))
+            # Parsers look at tokens more than once, so build each line's tuples once
+            return self.execute_lines(lines, map(list, stream.lines()))
+        finally:
+            stream.close()
+    
+    def execute_lines(self, lines, token_lines=None):
+        """Execute SCL code from an iterable of lines as they arrive
+        
+        Each line is run before the next is read and nothing is kept once
+        it has run, so memory stays bounded however long the input is.
+        token_lines, if given, holds the tokens of each line.
+        """
+        # Function bodies are parsed with the plugins imported so far
+        session = self.state('program')
+        session['plugins'] = ()
+        if token_lines is None:
+            pairs = ((line, None) for line in lines)
+        else:
+            pairs = zip(lines, token_lines)
+        for line_num, (line, tokens) in enumerate(pairs, 1):
             line = line.strip()
             if not line or line.startswith('#'):
                 continue
@@ -212,10 +409,13 @@ class SCLInterpreter:
                     print(f"Error at line {line_num}: Failed to load plugin {plugin_path}")
                     print(f"Code: {line}")
                     return False
+                if plugin_path not in session['plugins']:
+                    session['plugins'] += (plugin_path,)
                 continue
             
             try:
-                tokens = self.tokenize(line)
+                if tokens is None:
+                    tokens = self.tokenize(line)
                 if tokens:
                     stmt, _ = self.parse_statement(tokens, 0)
                     if stmt:
@@ -230,7 +430,6 @@ class SCLInterpreter:
             except Exception as e:
                 print(f"Error at line {line_num}: {e}")
                 print(f"Code: {line}")
-                import traceback
                 traceback.print_exc()
                 return False
         
@@ -238,28 +437,93 @@ class SCLInterpreter:
 
 def main():
     """Main function"""
-    if len(sys.argv) < 2:
-        print("Usage: python scl.py <file.scl>")
+    args = sys.argv[1:]
+    backend_name = 'interp'
+    for arg in list(args):
+        if arg.startswith('--backend='):
+            backend_name = arg.split('=', 1)[1]
+            args.remove(arg)
+    async_mode = '--async' in args
+    if async_mode:
+        args.remove('--async')
+    stream_mode = '--stream' in args
+    if stream_mode:
+        args.remove('--stream')
+    debug_mode = '--debug' in args
+    if debug_mode:
+        args.remove('--debug')
+    
+    modes = (backend_name == 'py') + async_mode + debug_mode + (stream_mode or args[:1] == ['-'])
+    if not args or backend_name not in ('interp', 'py') or modes > 1:
+        print("Usage: python scl.py [--backend=interp|py | --async | --stream | --debug] <file.scl>")
+        print("       python scl.py [--stream] -    (read the program from stdin)")
         sys.exit(1)
     
-    file_path = sys.argv[1]
+    file_path = args[0]
+    if file_path == '-':
+        stream_mode = True
     
-    if not os.path.exists(file_path):
+    if file_path != '-' and not os.path.exists(file_path):
         print(f"Error: File {file_path} not found")
         sys.exit(1)
     
     interpreter = SCLInterpreter()
     
+    # Refuse to run against plugins that differ from the project lockfile
     try:
+        lock = load_lockfile()
+    except ValueError as e:
+        print(f"Error: {e}")
+        print("Run 'sdp lock' to write a new lockfile")
+        sys.exit(1)
+    if lock:
+        problems = interpreter.manifest.verify_lock(lock)
+        if problems:
+            for problem in problems:
+                print(f"Error: {problem}")
+            print("Run 'sdp sync' to install the locked plugins")
+            sys.exit(1)
+    
+    try:
+        if stream_mode:
+            # Run lines as they arrive and show their output straight away
+            sys.stdout.reconfigure(line_buffering=True)
+            if file_path == '-':
+                success = interpreter.execute_lines(sys.stdin)
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    success = interpreter.execute_lines(f)
+            if not success:
+                sys.exit(1)
+            return
+        
+        if not (debug_mode or async_mode or backend_name == 'py') and os.path.getsize(file_path) >= LARGE_FILE_SIZE:
+            # Large files are tokenized through a memory map instead of read whole
+            if not interpreter.execute_file(file_path):
+                sys.exit(1)
+            return
+        
         with open(file_path, 'r', encoding='utf-8') as f:
             code = f.read()
         
-        success = interpreter.execute(code, file_path)
+        if debug_mode:
+            # Only the debugger's copy of the program is instrumented
+            from scl_debugger import Debugger
+            success = Debugger(interpreter).run(code)
+        elif async_mode:
+            # Run on an asyncio event loop so that tasks overlap their waits
+            program = interpreter.compile(code, asynchronous=True)
+            success = asyncio.run(program.run(interpreter.new_context()))
+        elif backend_name == 'py':
+            # Translate the program to Python bytecode and run that instead
+            from scl_compiler import SCLCompiler
+            success = SCLCompiler(interpreter).compile(code).run()
+        else:
+            success = interpreter.execute(code, file_path)
         if not success:
             sys.exit(1)
     except Exception as e:
         print(f"Error executing file: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
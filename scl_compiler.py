@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Python Backend Compiler
+Translates a parsed SCL program into Python source and runs it as a code object
+"""
+
+import traceback
+
+# Statements the compiler can translate, by the plugin that executes them
+NATIVE_STATEMENTS = {
+    'basic': {'ASSIGN', 'PRINT', 'IF', 'FUNCTION_DEF'},
+    'siew': {'WHILE', 'IF', 'IF_ELSE'},
+}
+
+class CompiledProgram:
+    """A compiled SCL program bound to the interpreter it was compiled for"""
+    
+    def __init__(self, interpreter, source, constants):
+        self.interpreter = interpreter
+        self.source = source
+        self.constants = constants
+        namespace = {}
+        exec(compile(source, '<scl>', 'exec'), namespace)
+        self.main = namespace['scl_main']
+    
+    def run(self, ctx=None):
+        """Run the program in ctx (default: the interpreter); returns False on error"""
+        ctx = ctx or self.interpreter
+        session = ctx.state('program')
+        session['plugins'] = ()
+        return self.main(ctx, ctx.variables, self.constants, session, self._fail, self._load)
+    
+    def _fail(self, line_num, line, message=None, error=None):
+        """Report an error the same way SCLInterpreter.execute does"""
+        if error is not None:
+            print(f"Error at line {line_num}: {error}")
+            print(f"Code: {line}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+        else:
+            print(f"Error at line {line_num}: {message}")
+            print(f"Code: {line}")
+        return False
+    
+    def _load(self, plugin_path, line_num, line):
+        """Re-run a failed plugin import at its place in the program"""
+        if not self.interpreter.load_plugin(plugin_path):
+            return self._fail(line_num, line, f"Failed to load plugin {plugin_path}")
+        return True
+
+class SCLCompiler:
+    """Compile SCL code into a Python function
+    
+    Plugins are imported and every line is parsed at compile time.
+    Statements whose executing plugin is basic or siew are translated to
+    Python; all others become calls to the executors the plugins compile.
+    """
+    
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.constants = []
+        self.imported = []
+        self.executors = {}
+        self.unmapped = False
+        self.lines = []
+    
+    def const(self, value):
+        """Store a value in the constants table and return its expression"""
+        self.constants.append(value)
+        return f"K[{len(self.constants) - 1}]"
+    
+    def emit(self, depth, text):
+        self.lines.append('    ' * depth + text)
+    
+    def add_import(self, plugin_path):
+        """Record an imported plugin and map the statements it executes to it"""
+        if plugin_path in self.imported:
+            return
+        self.imported.append(plugin_path)
+        if self.unmapped:
+            return
+        entry = self.interpreter.manifest.get(plugin_path)
+        if entry is None:
+            # Later plugins may not claim statements this one might execute
+            self.unmapped = True
+            return
+        for kind in entry['statements']:
+            self.executors.setdefault(kind, plugin_path)
+    
+    def executor(self, kind):
+        """Return the name of the first imported plugin that executes kind"""
+        return self.executors.get(kind)
+    
+    def expression(self, expr):
+        """Return Python source evaluating an SCL expression token"""
+        if expr[0] in ('STRING', 'NUMBER'):
+            return repr(self.interpreter.evaluate_expression(expr))
+        elif expr[0] == 'IDENTIFIER':
+            return f"V.get({expr[1]!r}, 0)"
+        return '0'
+    
+    def statement(self, stmt, plugin_name, depth):
+        """Emit code for a statement run by the given plugin's executors"""
+        kind = stmt[0]
+        if kind not in NATIVE_STATEMENTS.get(plugin_name, ()):
+            # Statements the plugin does not compile are skipped, as in a body
+            executor = self.interpreter.plugins[plugin_name].compile_statement(stmt)
+            if executor:
+                self.emit(depth, f"{self.const(executor)}(I)")
+            return
+        
+        if kind == 'ASSIGN':
+            self.emit(depth, f"V[{stmt[1]!r}] = {self.expression(stmt[2])}")
+        elif kind == 'PRINT':
+            self.emit(depth, f"print({self.expression(stmt[1])})")
+        elif kind == 'FUNCTION_DEF':
+            # Bodies stay tokens; sde run<> parses them when called
+            self.emit(depth, f"V[{stmt[1]!r}] = {self.const(stmt[2])}")
+        elif kind in ('IF', 'IF_ELSE', 'WHILE'):
+            keyword = 'while' if kind == 'WHILE' else 'if'
+            self.emit(depth, f"{keyword} {self.expression(stmt[1])}:")
+            self.block(stmt[2], plugin_name, depth + 1)
+            if kind == 'IF_ELSE':
+                self.emit(depth, "else:")
+                self.block(stmt[3], plugin_name, depth + 1)
+    
+    def block(self, body, plugin_name, depth):
+        """Emit a statement body; bodies run through their plugin only"""
+        emitted = len(self.lines)
+        for body_stmt in body:
+            self.statement(body_stmt, plugin_name, depth)
+        if len(self.lines) == emitted:
+            self.emit(depth, "pass")
+    
+    def compile(self, code):
+        """Compile code into a CompiledProgram"""
+        self.constants = []
+        self.imported = []
+        self.executors = {}
+        self.unmapped = False
+        self.lines = [
+            "def scl_main(I, V, K, S, _fail, _load):",
+            "    line_num, line = 0, ''",
+            "    try:",
+        ]
+        
+        for line_num, line in enumerate(code.split('\n'), 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            self.emit(2, f"line_num, line = {line_num}, {line!r}")
+            
+            if line.startswith('simp{') and line.endswith('}'):
+                plugin_path = line[5:-1].strip()
+                # Failures are reported at run time, in program order
+                loaded = self.interpreter.load_plugin(plugin_path, quiet=True)
+                if not loaded:
+                    self.emit(2, f"if not _load({plugin_path!r}, line_num, line):")
+                    self.emit(3, "return False")
+                    break
+                self.add_import(plugin_path)
+                # Function bodies are parsed with the plugins imported so far
+                self.emit(2, f"S['plugins'] = {self.const(tuple(self.imported))}")
+                continue
+            
+            try:
+                tokens = self.interpreter.tokenize(line)
+                stmt = None
+                if tokens:
+                    stmt, _ = self.interpreter.parse_statement(tokens, 0, self.imported)
+            except Exception as e:
+                self.emit(2, f"raise {self.const(e)}")
+                break
+            
+            if not tokens:
+                continue
+            if not stmt:
+                self.emit(2, "return _fail(line_num, line, 'Invalid syntax')")
+                break
+            
+            plugin_name = self.executor(stmt[0])
+            if plugin_name in NATIVE_STATEMENTS and stmt[0] in NATIVE_STATEMENTS[plugin_name]:
+                self.statement(stmt, plugin_name, 2)
+            else:
+                # Only the plugins imported above this line may run it
+                executor = self.interpreter.compile_statement(stmt, tuple(self.imported))
+                self.emit(2, f"if not {self.const(executor)}(I):")
+                self.emit(3, "return _fail(line_num, line, 'Failed to execute statement')")
+        
+        self.emit(1, "except Exception as e:")
+        self.emit(2, "return _fail(line_num, line, error=e)")
+        self.emit(1, "return True")
+        
+        source = '\n'.join(self.lines) + '\n'
+        return CompiledProgram(self.interpreter, source, list(self.constants))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Debugger
+Line breakpoints, stepping and variable inspection for scl --debug
+"""
+
+import sys
+
+from scl import Program
+
+HELP = """Commands:
+  s, step          run to the next statement, stepping into function bodies
+  n, next          run to the next line of the program
+  c, continue      run to the next breakpoint
+  b, break [N...]  set breakpoints on lines N, or list the breakpoints
+  cl, clear N...   remove breakpoints
+  p, print NAME    show a variable
+  v, vars          show every variable
+  l, list          show the program around the current line
+  q, quit          stop the program
+  h, help          show this help"""
+
+class DebuggerQuit(BaseException):
+    """Raised through the running program when the user quits"""
+
+def describe(stmt):
+    """Return a short readable form of a parsed statement"""
+    parts = [stmt[0]]
+    for part in stmt[1:]:
+        if isinstance(part, tuple) and len(part) == 2 and isinstance(part[0], str):
+            parts.append(str(part[1]))
+        elif isinstance(part, (list, tuple)):
+            parts.append('...')
+        elif part is not None:
+            parts.append(str(part))
+    return ' '.join(parts)
+
+def show(value):
+    """Return how the debugger displays a variable's value"""
+    if isinstance(value, list) and all(isinstance(token, tuple) for token in value):
+        # sde stores a function as its body tokens
+        return '<sde function>'
+    return repr(value)
+
+class Debugger:
+    """Run a program with an instrumented copy of its executors
+    
+    Only the debugged program's steps, and the plugins of the interpreter
+    it runs on, are instrumented; ordinary runs compile the same statements
+    without any debugging checks.
+    """
+    
+    def __init__(self, interpreter, stdin=None):
+        self.interpreter = interpreter
+        self.stdin = stdin or sys.stdin
+        self.breakpoints = set()
+        # 'step' stops at every statement, 'next' at every line, 'continue' at breakpoints
+        self.mode = 'step'
+        self.source = []
+        self.line_num = None
+        # True while the program is compiled, and how deep compile_statement calls nest
+        self.compiling = False
+        self.nesting = 0
+    
+    def run(self, code):
+        """Debug a program from its first line; returns False on error or quit"""
+        self.source = code.split('\n')
+        # The first compile loads the plugins; the second runs through their
+        # wrapped compile_statement, so sif bodies can be stepped into
+        self.interpreter.compile(code)
+        for plugin in self.interpreter.plugins.values():
+            plugin.compile_statement = self.instrument_compiler(plugin.compile_statement)
+        self.compiling = True
+        try:
+            program = self.interpreter.compile(code)
+        finally:
+            self.compiling = False
+        steps = [(line_num, line, self.instrument(executor, line_num, line, 0), error)
+                 for line_num, line, executor, error in program.steps]
+        ctx = self.interpreter.new_context()
+        try:
+            return Program(steps, program.imports).run(ctx)
+        except DebuggerQuit:
+            print("Program stopped")
+            return False
+    
+    def instrument(self, executor, line_num, text, depth):
+        """Return an executor that may pause before running executor"""
+        def run(ctx):
+            self.pause(ctx, line_num, text, depth)
+            return executor(ctx)
+        return run
+    
+    def instrument_compiler(self, compile_statement):
+        """Wrap a plugin's compile_statement so block and function body statements can be stepped into"""
+        def compile_and_instrument(stmt):
+            self.nesting += 1
+            try:
+                executor = compile_statement(stmt)
+            finally:
+                self.nesting -= 1
+            if executor is None or (self.compiling and not self.nesting):
+                # Top-level statements are instrumented as steps by run()
+                return executor
+            # Function bodies are compiled as they are called, after compiling
+            scope = 'block' if self.compiling else 'function'
+            def run(ctx):
+                self.pause(ctx, self.line_num, describe(stmt), 1, scope)
+                return executor(ctx)
+            return run
+        return compile_and_instrument
+    
+    def pause(self, ctx, line_num, text, depth, scope='function'):
+        """Stop for commands if stepping or at a breakpoint"""
+        if depth == 0:
+            self.line_num = line_num
+            stop = self.mode != 'continue' or line_num in self.breakpoints
+        else:
+            stop = self.mode == 'step'
+        if not stop:
+            return
+        where = f"line {line_num}" if depth == 0 else f"line {line_num}, in {scope}"
+        print(f"> {where}: {text}")
+        self.interact(ctx)
+    
+    def interact(self, ctx):
+        """Read commands until one resumes the program"""
+        while True:
+            print("(sdb) ", end='', flush=True)
+            command = self.stdin.readline()
+            if not command:
+                raise DebuggerQuit()
+            words = command.split()
+            if not words:
+                continue
+            name, args = words[0], words[1:]
+            if name in ('s', 'step', 'n', 'next', 'c', 'continue'):
+                self.mode = {'s': 'step', 'n': 'next', 'c': 'continue'}[name[0]]
+                return
+            elif name in ('b', 'break'):
+                if not args:
+                    print("Breakpoints: " + (', '.join(map(str, sorted(self.breakpoints))) or "none"))
+                for arg in args:
+                    if arg.isdigit():
+                        self.breakpoints.add(int(arg))
+                        print(f"Breakpoint at line {arg}")
+                    else:
+                        print(f"Not a line number: {arg}")
+            elif name in ('cl', 'clear'):
+                for arg in args:
+                    if arg.isdigit():
+                        self.breakpoints.discard(int(arg))
+            elif name in ('p', 'print'):
+                for arg in args:
+                    if arg in ctx.variables:
+                        print(f"{arg} = {show(ctx.variables[arg])}")
+                    else:
+                        print(f"{arg} is not defined")
+            elif name in ('v', 'vars'):
+                for var_name in sorted(ctx.variables):
+                    print(f"{var_name} = {show(ctx.variables[var_name])}")
+            elif name in ('l', 'list'):
+                first = max(1, self.line_num - 3)
+                for line_num in range(first, min(len(self.source), self.line_num + 3) + 1):
+                    marker = '->' if line_num == self.line_num else '  '
+                    print(f"{line_num:>4} {marker} {self.source[line_num - 1]}")
+            elif name in ('q', 'quit'):
+                raise DebuggerQuit()
+            elif name in ('h', 'help'):
+                print(HELP)
+            else:
+                print(f"Unknown command: {name} (type h for help)")
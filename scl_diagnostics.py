@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Diagnostics
+Syntax checking with the interpreter's own parser, without executing code
+"""
+
+import threading
+
+from scl import SCLInterpreter
+
+class Diagnostics:
+    """Check SCL code line by line, caching results per unchanged line
+    
+    A line's result depends only on its text and the plugins imported
+    above it, so both form the cache key and unchanged lines are never
+    parsed twice.
+    """
+    
+    def __init__(self, interpreter=None):
+        self.interpreter = interpreter or SCLInterpreter()
+        self.all_plugins = {}
+        self.cache = {}
+    
+    def _import(self, plugin_path):
+        """Load a plugin for checking; return an error message or None"""
+        if plugin_path in self.all_plugins:
+            return None
+        if self.interpreter.manifest.get(plugin_path) is None:
+            return f"Plugin {plugin_path} not found"
+        if not self.interpreter.load_plugin(plugin_path, quiet=True):
+            return f"Failed to load plugin {plugin_path}"
+        self.all_plugins[plugin_path] = self.interpreter.plugins[plugin_path]
+        return None
+    
+    def check(self, code):
+        """Return a list of (line_num, message) for every invalid line"""
+        problems = []
+        imported = ()
+        cache = {}
+        
+        for line_num, line in enumerate(code.split('\n'), 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            if line.startswith('simp{') and line.endswith('}'):
+                plugin_path = line[5:-1].strip()
+                message = self._import(plugin_path)
+                if message:
+                    problems.append((line_num, message))
+                elif plugin_path not in imported:
+                    imported = imported + (plugin_path,)
+                continue
+            
+            key = (imported, line)
+            if key in self.cache:
+                message = self.cache[key]
+            else:
+                # Parse with only the plugins imported so far, as execution would
+                self.interpreter.plugins = {name: self.all_plugins[name] for name in imported}
+                message = self.interpreter.check_statement(line)
+            cache[key] = message
+            if message:
+                problems.append((line_num, message))
+        
+        # Keep only entries for the current buffer so the cache stays bounded
+        self.cache = cache
+        return problems
+
+class DiagnosticsService:
+    """Run Diagnostics on a worker thread; only the latest request is checked"""
+    
+    def __init__(self):
+        self.checker = Diagnostics()
+        self.condition = threading.Condition()
+        self.pending = None
+        self.result = None
+        self.thread = None
+    
+    def submit(self, code):
+        """Queue code for checking, replacing any request not yet started"""
+        with self.condition:
+            self.pending = code
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._work, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+    
+    def _work(self):
+        """Worker loop checking the most recent request"""
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                code, self.pending = self.pending, None
+            problems = self.checker.check(code)
+            with self.condition:
+                if self.pending is None:
+                    self.result = problems
+    
+    def results(self):
+        """Return the newest finished result once, or None"""
+        with self.condition:
+            result, self.result = self.result, None
+            return result
@@ -9,10 +9,18 @@ import os
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QTextEdit, QAction, QFileDialog,
     QToolBar, QMessageBox, QStatusBar, QMenuBar, QMenu, QWidget,
-    QVBoxLayout, QHBoxLayout, QPushButton, QLabel
+    QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QPlainTextEdit
 )
-from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QFont, QColor
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QFont, QColor, QTextCursor
+from PyQt5.QtCore import Qt, QTimer, QPoint
+
+from scl_lexer import iter_spans, CORE_KEYWORDS
+from scl_runner import ScriptRunner
+from scl_diagnostics import DiagnosticsService
+from scl_fileview import LineIndex, LARGE_FILE_SIZE, HIGHLIGHT_SIZE_LIMIT, WINDOW_LINES
+
+# Milliseconds without edits before the buffer is checked
+DIAGNOSTICS_DELAY = 400
 
 class SCLLexer(QSyntaxHighlighter):
     """Syntax highlighter for SunsetCodeLang"""
@@ -20,62 +28,65 @@ class SCLLexer(QSyntaxHighlighter):
     def __init__(self, parent=None):
         super().__init__(parent)
         
-        # Define syntax highlighting rules
-        self.highlighting_rules = []
-        
         # Keywords
+        self.keywords = frozenset(CORE_KEYWORDS)
+        
+        # Text formats for each span style produced by scl_lexer
+        self.formats = {}
+        
         keyword_format = QTextCharFormat()
         keyword_format.setForeground(QColor(128, 0, 128))  # Purple
         keyword_format.setFontWeight(QFont.Bold)
-        keywords = [
-            "set", "sout", "sif", "selif", "sle", "simp"
-        ]
-        for keyword in keywords:
-            pattern = QRegExp(r'\\b' + keyword + r'\\b')
-            self.highlighting_rules.append((pattern, keyword_format))
+        self.formats['keyword'] = keyword_format
         
         # Strings
         string_format = QTextCharFormat()
         string_format.setForeground(QColor(0, 128, 0))  # Green
-        pattern = QRegExp(r'"[^"]*"')
-        pattern.setMinimal(True)
-        self.highlighting_rules.append((pattern, string_format))
+        self.formats['string'] = string_format
         
         # Comments
         comment_format = QTextCharFormat()
         comment_format.setForeground(QColor(128, 128, 128))  # Gray
-        pattern = QRegExp(r'#.*')
-        self.highlighting_rules.append((pattern, comment_format))
+        self.formats['comment'] = comment_format
         
         # Operators
         operator_format = QTextCharFormat()
         operator_format.setForeground(QColor(0, 0, 255))  # Blue
-        operators = ["+", "*", "|", ":"]
-        for operator in operators:
-            pattern = QRegExp(re.escape(operator))
-            self.highlighting_rules.append((pattern, operator_format))
+        self.formats['operator'] = operator_format
         
         # Numbers
         number_format = QTextCharFormat()
         number_format.setForeground(QColor(255, 0, 0))  # Red
-        pattern = QRegExp(r'\\b\d+\\b')
-        self.highlighting_rules.append((pattern, number_format))
+        self.formats['number'] = number_format
     
     def highlightBlock(self, text):
         """Apply syntax highlighting to a block of text"""
-        for pattern, format in self.highlighting_rules:
-            regex = QRegExp(pattern)
-            index = regex.indexIn(text)
-            while index >= 0:
-                length = regex.matchedLength()
-                self.setFormat(index, length, format)
-                index = regex.indexIn(text, index + length)
+        # One scan of the shared lexer yields every span in the block
+        for start, end, style in iter_spans(text, self.keywords):
+            self.setFormat(start, end - start, self.formats[style])
 
 class SCLEditor(QMainWindow):
     """Main editor window"""
     
     def __init__(self):
         super().__init__()
+        self.runner = ScriptRunner()
+        self.run_has_error = False
+        self.run_timer = QTimer(self)
+        self.run_timer.timeout.connect(self.poll_run)
+        
+        # Background syntax checking, debounced after edits
+        self.diagnostics = DiagnosticsService()
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.setSingleShot(True)
+        self.diagnostics_timer.timeout.connect(self.request_diagnostics)
+        self.diagnostics_poll_timer = QTimer(self)
+        self.diagnostics_poll_timer.timeout.connect(self.poll_diagnostics)
+        
+        # Windowed view over a file too large to load at once
+        self.large_file = None
+        self.window_first = 0
+        self.window_shift_pending = False
         self.init_ui()
         self.current_file = None
     
@@ -119,11 +130,25 @@ class SCLEditor(QMainWindow):
         run_action.triggered.connect(self.run_code)
         toolbar.addAction(run_action)
         
+        self.stop_action = QAction("Stop", self)
+        self.stop_action.setShortcut("Shift+F5")
+        self.stop_action.triggered.connect(self.stop_code)
+        self.stop_action.setEnabled(False)
+        toolbar.addAction(self.stop_action)
+        
         # Create text editor
         self.editor = QTextEdit()
         self.editor.setFont(QFont("Consolas", 11))
         self.editor.setTabStopWidth(4)
-        layout.addWidget(self.editor)
+        self.editor.verticalScrollBar().valueChanged.connect(self.on_large_scroll)
+        self.editor.textChanged.connect(self.schedule_diagnostics)
+        layout.addWidget(self.editor, 3)
+        
+        # Create console
+        self.console = QPlainTextEdit()
+        self.console.setFont(QFont("Consolas", 10))
+        self.console.setReadOnly(True)
+        layout.addWidget(self.console, 1)
         
         # Create status bar
         self.status_bar = QStatusBar()
@@ -151,6 +176,7 @@ class SCLEditor(QMainWindow):
         # Run menu
         run_menu = menubar.addMenu("Run")
         run_menu.addAction(run_action)
+        run_menu.addAction(self.stop_action)
     
     def open_file(self):
         """Open a file"""
@@ -161,6 +187,11 @@ class SCLEditor(QMainWindow):
         
         if file_name:
             try:
+                if os.path.getsize(file_name) > LARGE_FILE_SIZE:
+                    self.open_large_file(file_name)
+                    return
+                
+                self.close_large_file()
                 with open(file_name, 'r', encoding='utf-8') as f:
                     content = f.read()
                 self.editor.setPlainText(content)
@@ -170,8 +201,115 @@ class SCLEditor(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to open file: {str(e)}")
     
+    def schedule_diagnostics(self):
+        """Check the buffer once typing has paused"""
+        if self.large_file is None:
+            self.diagnostics_timer.start(DIAGNOSTICS_DELAY)
+    
+    def request_diagnostics(self):
+        """Hand the current buffer to the diagnostics worker"""
+        self.diagnostics.submit(self.editor.toPlainText())
+        if not self.diagnostics_poll_timer.isActive():
+            self.diagnostics_poll_timer.start(50)
+    
+    def poll_diagnostics(self):
+        """Mark invalid lines once the worker has finished"""
+        problems = self.diagnostics.results()
+        if problems is None:
+            return
+        self.diagnostics_poll_timer.stop()
+        if self.large_file is not None:
+            return
+        
+        error_format = QTextCharFormat()
+        error_format.setUnderlineStyle(QTextCharFormat.WaveUnderline)
+        error_format.setUnderlineColor(QColor(255, 0, 0))
+        error_format.setProperty(QTextCharFormat.FullWidthSelection, True)
+        
+        selections = []
+        document = self.editor.document()
+        for line_num, message in problems:
+            selection = QTextEdit.ExtraSelection()
+            selection.format = error_format
+            cursor = QTextCursor(document.findBlockByNumber(line_num - 1))
+            cursor.select(QTextCursor.LineUnderCursor)
+            selection.cursor = cursor
+            selections.append(selection)
+        self.editor.setExtraSelections(selections)
+        
+        if problems:
+            line_num, message = problems[0]
+            more = f" (+{len(problems) - 1} more)" if len(problems) > 1 else ""
+            self.status_bar.showMessage(f"Line {line_num}: {message}{more}")
+    
+    def open_large_file(self, file_name):
+        """Open a large file in a read-only window that loads lines lazily"""
+        self.close_large_file()
+        self.large_file = LineIndex(file_name)
+        if self.large_file.size > HIGHLIGHT_SIZE_LIMIT:
+            self.highlighter.setDocument(None)
+        
+        self.editor.setReadOnly(True)
+        self.show_window(0)
+        self.current_file = file_name
+        self.setWindowTitle(f"SunsetCodeLang Editor - {os.path.basename(file_name)} [read-only]")
+    
+    def close_large_file(self):
+        """Leave the large-file view and return to normal editing"""
+        if self.large_file is None:
+            return
+        self.large_file.close()
+        self.large_file = None
+        self.window_first = 0
+        self.editor.setReadOnly(False)
+        if self.highlighter.document() is None:
+            self.highlighter.setDocument(self.editor.document())
+    
+    def show_window(self, first):
+        """Fill the editor with the window of lines starting at first"""
+        lines = self.large_file.lines(first, WINDOW_LINES)
+        self.window_first = first
+        self.window_shift_pending = True
+        self.editor.setPlainText('\n'.join(lines))
+        self.window_shift_pending = False
+        self.editor.document().setModified(False)
+        self.status_bar.showMessage(
+            f"Lines {first + 1}-{first + len(lines)} of ~{self.large_file.line_count()} "
+            f"in {self.large_file.path} (read-only)"
+        )
+    
+    def on_large_scroll(self, value):
+        """Slide the window when scrolling reaches either end of it"""
+        if self.large_file is None or self.window_shift_pending:
+            return
+        scroll_bar = self.editor.verticalScrollBar()
+        if value >= scroll_bar.maximum() and self.large_file.has_line(self.window_first + WINDOW_LINES):
+            self.window_shift_pending = True
+            QTimer.singleShot(0, lambda: self.shift_window(1))
+        elif value <= scroll_bar.minimum() and self.window_first > 0:
+            self.window_shift_pending = True
+            QTimer.singleShot(0, lambda: self.shift_window(-1))
+    
+    def shift_window(self, direction):
+        """Move the window half its size forward or back, keeping the view in place"""
+        self.window_shift_pending = False
+        if self.large_file is None:
+            return
+        top = self.window_first + self.editor.cursorForPosition(QPoint(0, 0)).blockNumber()
+        new_first = max(0, self.window_first + direction * (WINDOW_LINES // 2))
+        self.show_window(new_first)
+        
+        block = self.editor.document().findBlockByNumber(top - new_first)
+        cursor = QTextCursor(block)
+        self.editor.setTextCursor(cursor)
+        self.editor.ensureCursorVisible()
+    
     def save_file(self):
         """Save the current file"""
+        if self.large_file is not None:
+            QMessageBox.information(self, "Read-only", "Large files are opened read-only.")
+            return
+        
         if self.current_file:
             try:
                 with open(self.current_file, 'w', encoding='utf-8') as f:
@@ -184,6 +322,10 @@ class SCLEditor(QMainWindow):
     
     def save_as_file(self):
         """Save the current file with a new name"""
+        if self.large_file is not None:
+            QMessageBox.information(self, "Read-only", "Large files are opened read-only.")
+            return
+        
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getSaveFileName(
             self, "Save As", "", "SCL Files (*.scl);;All Files (*)", options=options
@@ -205,34 +347,54 @@ class SCLEditor(QMainWindow):
     
     def run_code(self):
         """Run the current SCL code"""
+        if self.runner.is_running():
+            self.status_bar.showMessage("A script is already running")
+            return
+        
         if not self.current_file:
             # Save the file first
             self.save_as_file()
         
         if self.current_file:
             try:
-                # Run the SCL code using the interpreter
-                import subprocess
-                result = subprocess.run(
-                    [sys.executable, "scl.py", self.current_file],
-                    capture_output=True,
-                    text=True,
-                    cwd=os.path.dirname(os.path.abspath(__file__))
-                )
-                
-                # Show the output
-                output = result.stdout
-                error = result.stderr
+                self.console.setPlainText("Executing code...\n")
                 
-                if error:
-                    QMessageBox.critical(self, "Error", f"Runtime Error:\n{error}")
-                else:
-                    QMessageBox.information(self, "Output", f"Execution Result:\n{output}")
-                
-                self.status_bar.showMessage("Code executed")
+                # Run the SCL code in the background and stream its output
+                self.runner.start(self.current_file)
+                self.run_has_error = False
+                self.stop_action.setEnabled(True)
+                self.status_bar.showMessage("Running...")
+                self.run_timer.start(50)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to run code: {str(e)}")
     
+    def poll_run(self):
+        """Copy new script output into the console until the run ends"""
+        for stream, text in self.runner.poll():
+            if stream == "stderr" or text.startswith("Error at line"):
+                self.run_has_error = True
+            self.console.moveCursor(QTextCursor.End)
+            self.console.insertPlainText(text)
+        self.console.ensureCursorVisible()
+        
+        if self.runner.is_running():
+            return
+        
+        self.run_timer.stop()
+        self.stop_action.setEnabled(False)
+        if self.runner.stopped:
+            self.status_bar.showMessage("Execution stopped")
+        elif self.run_has_error or self.runner.returncode():
+            self.status_bar.showMessage("Runtime Error")
+        else:
+            self.status_bar.showMessage("Code executed")
+    
+    def stop_code(self):
+        """Cancel the running script"""
+        if self.runner.is_running():
+            self.runner.stop()
+            self.status_bar.showMessage("Stopping...")
+    
     def closeEvent(self, event):
         """Handle close event"""
         # Check if the file has been modified
@@ -246,12 +408,15 @@ class SCLEditor(QMainWindow):
             
             if reply == QMessageBox.Yes:
                 self.save_file()
+                self.runner.close()
                 event.accept()
             elif reply == QMessageBox.No:
+                self.runner.close()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.runner.close()
             event.accept()
 
 if __name__ == "__main__":
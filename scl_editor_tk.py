@@ -4,7 +4,6 @@ SunsetCodeLang Editor (Tkinter version)
 A code editor for SCL language using Tkinter
 """
 
-import sys
 import os
 import tkinter as tk
 from tkinter import ttk
@@ -12,65 +11,45 @@ from tkinter import filedialog
 from tkinter import messagebox
 from tkinter import scrolledtext
 import re
-import subprocess
-import importlib.util
+
+from scl_lexer import iter_spans, CORE_KEYWORDS
+from scl_plugins import PluginManifest, extract_plugin_info
+from scl_runner import ScriptRunner
+from scl_diagnostics import DiagnosticsService
+from scl_fileview import LineIndex, LARGE_FILE_SIZE, HIGHLIGHT_SIZE_LIMIT, WINDOW_LINES
 
 def extract_keywords_from_plugin(plugin_file):
     """Extract syntax keywords from a plugin file"""
-    keywords = set()
     try:
-        with open(plugin_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find all IDENTIFIER checks in parse_statement method
-        # Pattern: token[1] == 'keyword'
-        pattern = r"token\[1\]\s*==\s*['\"]([^'\"]+)['\"]"
-        matches = re.findall(pattern, content)
-        keywords.update(matches)
-        
-        # Also find IDENTIFIER checks with peek
-        # Pattern: peek()[1] == 'keyword'
-        pattern2 = r"peek\(\)\[1\]\s*==\s*['\"]([^'\"]+)['\"]"
-        matches2 = re.findall(pattern2, content)
-        keywords.update(matches2)
-        
-        # Find sub_token checks
-        # Pattern: sub_token[1] == 'keyword'
-        pattern3 = r"sub_token\[1\]\s*==\s*['\"]([^'\"]+)['\"]"
-        matches3 = re.findall(pattern3, content)
-        keywords.update(matches3)
-        
-        # Find next_token checks
-        # Pattern: next_token[1] == 'keyword'
-        pattern4 = r"next_token\[1\]\s*==\s*['\"]([^'\"]+)['\"]"
-        matches4 = re.findall(pattern4, content)
-        keywords.update(matches4)
-        
+        return set(extract_plugin_info(plugin_file)['keywords'])
     except Exception as e:
         print(f"Error extracting keywords from {plugin_file}: {e}")
-    
-    return keywords
+        return set()
 
-def get_all_plugin_keywords():
+def get_all_plugin_keywords(manifest=None):
     """Get all syntax keywords from all plugins"""
-    keywords = set()
-    plugins_dir = 'plugins'
-    
-    if not os.path.exists(plugins_dir):
-        return keywords
-    
-    # Walk through the plugins directory
-    for root, dirs, files in os.walk(plugins_dir):
-        for file in files:
-            if file.endswith('.py') and file != '__init__.py':
-                plugin_file = os.path.join(root, file)
-                plugin_keywords = extract_keywords_from_plugin(plugin_file)
-                keywords.update(plugin_keywords)
-    
-    return keywords
+    if manifest is None:
+        manifest = PluginManifest()
+    return manifest.all_keywords()
+
+# Milliseconds without edits before the buffer is checked
+DIAGNOSTICS_DELAY = 400
 
 class SCLLexer:
-    """Syntax highlighter for SunsetCodeLang"""
+    """Syntax highlighter for SunsetCodeLang
+
+    SCL tokens never span lines, so highlighting is done line by line
+    with the shared single-pass lexer in scl_lexer.
+    Edits are intercepted at the Tk widget command level and only the
+    lines they touch are re-lexed. A full re-highlight (file opened,
+    keywords changed) colours the visible viewport first and finishes
+    the rest of the buffer in small batches while the editor is idle.
+    """
+    
+    TAGS = ("keyword", "string", "comment", "operator", "number")
+    
+    # Number of lines highlighted per idle callback
+    BATCH_LINES = 200
     
     def __init__(self, text_widget, keywords=None):
         self.text = text_widget
@@ -80,87 +59,173 @@ class SCLLexer:
         self.text.tag_configure("comment", foreground="gray")
         self.text.tag_configure("operator", foreground="blue")
         self.text.tag_configure("number", foreground="red")
+        
+        self._keyword_set = frozenset(self.keywords)
+        
+        # Highlighting is switched off for very large files
+        self.enabled = True
+        
+        # Called after every edit with True if it touched a simp{ line
+        self.on_change = None
+        
+        # Line range still waiting for the lazy pass, or None when idle
+        self._pending = None
+        self._idle_job = None
+        self._viewport_done = None
+        
+        # Route the widget's Tcl command through a proxy so that every
+        # insert/delete, typed or programmatic, reports the lines it changed
+        self._orig = self.text._w + "_orig"
+        self.text.tk.call("rename", self.text._w, self._orig)
+        self.text.tk.createcommand(self.text._w, self._proxy)
+    
+    def _proxy(self, *args):
+        """Forward a widget command and re-highlight the lines it edited"""
+        call = self.text.tk.call
+        orig = self._orig
+        cmd = args[0] if args else None
+        
+        if cmd in ("insert", "delete", "replace") and len(args) > 1:
+            try:
+                first = int(call(orig, "index", args[1]).split('.')[0])
+                if cmd == "insert":
+                    removed = 0
+                else:
+                    stop = args[2] if len(args) > 2 else f"{args[1]}+1c"
+                    removed = int(call(orig, "index", stop).split('.')[0]) - first
+            except tk.TclError:
+                return call((orig,) + args)
+            
+            # Imports can only change if an edited line has a simp{ in it
+            imports = cmd != "insert" and self._has_import(first, first + removed)
+            result = call((orig,) + args)
+            
+            if cmd == "insert":
+                added = sum(chunk.count('\n') for chunk in args[2::2])
+            elif cmd == "replace":
+                added = sum(chunk.count('\n') for chunk in args[3::2])
+            else:
+                added = 0
+            imports = imports or self._has_import(first, first + added)
+            self._on_edit(first, first + added, added - removed)
+            if self.on_change is not None:
+                self.on_change(imports)
+            return result
+        
+        return call((orig,) + args)
+    
+    def _has_import(self, first, last):
+        """Return True if lines first..last contain a plugin import"""
+        return bool(self.text.tk.call(self._orig, "search", "-exact", "simp{", f"{first}.0", f"{last}.end"))
+    
+    def _on_edit(self, first, last, delta):
+        """Re-highlight edited lines and keep the lazy pass in step"""
+        if not self.enabled:
+            return
+        if self._pending is not None:
+            start, stop = self._pending
+            if first < start:
+                start = max(first, start + delta)
+            if first <= stop:
+                stop = max(first, stop + delta)
+            self._pending = (start, stop)
+        self._viewport_done = None
+        
+        if last - first < self.BATCH_LINES:
+            self.highlight_lines(first, last)
+        else:
+            # Large inserts (paste, file load) go through the lazy pass
+            self._queue(first, last)
+    
+    def _queue(self, first, last):
+        """Add lines first..last to the lazy pass and schedule it"""
+        if self._pending is not None:
+            first = min(first, self._pending[0])
+            last = max(last, self._pending[1])
+        self._pending = (first, last)
+        self._highlight_viewport()
+        self._schedule()
+    
+    def set_enabled(self, enabled):
+        """Switch highlighting on or off, clearing tags when switched off"""
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        if enabled:
+            self.highlight()
+        else:
+            self._pending = None
+            if self._idle_job is not None:
+                self.text.after_cancel(self._idle_job)
+                self._idle_job = None
+            for tag in self.TAGS:
+                self.text.tag_remove(tag, "1.0", tk.END)
     
     def update_keywords(self, keywords):
         """Update the keywords list for highlighting"""
+        if set(keywords) == set(self.keywords):
+            return
         self.keywords = keywords
+        self._keyword_set = frozenset(keywords)
         self.highlight()
     
     def highlight(self, event=None):
-        """Apply syntax highlighting to the entire text"""
-        # Clear all existing tags
-        for tag in ["keyword", "string", "comment", "operator", "number"]:
-            self.text.tag_remove(tag, "1.0", tk.END)
-        
-        # Highlight keywords from plugins
-        for keyword in self.keywords:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            start = "1.0"
-            while True:
-                start = self.text.search(pattern, start, stopindex=tk.END, regexp=True)
-                if not start:
-                    break
-                end = f"{start}+{len(keyword)}c"
-                self.text.tag_add("keyword", start, end)
-                start = end
-        
-        # Highlight strings
-        start = "1.0"
-        while True:
-            start = self.text.search(r'"[^"]*"', start, stopindex=tk.END, regexp=True)
-            if not start:
-                break
-            # Get the matched string
-            matched = self.text.get(start, f"{start}+100c")
-            quote_pos = matched.find('"', 1)
-            if quote_pos == -1:
-                start = f"{start}+1c"
-                continue
-            end = f"{start}+{quote_pos+1}c"
-            self.text.tag_add("string", start, end)
-            start = end
-        
-        # Highlight comments
-        start = "1.0"
-        while True:
-            start = self.text.search(r'#.*', start, stopindex=tk.END, regexp=True)
-            if not start:
-                break
-            # Get the line number
-            line_num = int(start.split('.')[0])
-            # Get the end of the line
-            end = f"{line_num}.end"
-            self.text.tag_add("comment", start, end)
-            # Move to the next line
-            start = f"{line_num + 1}.0"
-        
-        # Highlight operators
-        operators = ["+", "*", "|", ":"]
-        for op in operators:
-            pattern = re.escape(op)
-            start = "1.0"
-            while True:
-                start = self.text.search(pattern, start, stopindex=tk.END, regexp=True)
-                if not start:
-                    break
-                end = f"{start}+1c"
-                self.text.tag_add("operator", start, end)
-                start = end
-        
-        # Highlight numbers
-        start = "1.0"
-        while True:
-            start = self.text.search(r'\b\d+\b', start, stopindex=tk.END, regexp=True)
-            if not start:
-                break
-            # Get the matched number
-            matched = self.text.get(start, f"{start}+20c")
-            num_end = 0
-            while num_end < len(matched) and matched[num_end].isdigit():
-                num_end += 1
-            end = f"{start}+{num_end}c"
-            self.text.tag_add("number", start, end)
-            start = end
+        """Re-highlight the whole buffer, visible lines first"""
+        if not self.enabled:
+            return
+        self._viewport_done = None
+        self._queue(1, int(self.text.index("end-1c").split('.')[0]))
+    
+    def _visible_lines(self):
+        """Return the first and last line numbers shown in the widget"""
+        first = int(self.text.index("@0,0").split('.')[0])
+        last = int(self.text.index(f"@0,{self.text.winfo_height()}").split('.')[0])
+        return first, last
+    
+    def _highlight_viewport(self):
+        """Highlight the visible lines unless they are already done"""
+        visible = self._visible_lines()
+        if visible != self._viewport_done:
+            self.highlight_lines(*visible)
+            self._viewport_done = visible
+    
+    def _schedule(self):
+        """Queue the next batch of the lazy pass for idle time"""
+        if self._idle_job is None and self._pending is not None:
+            self._idle_job = self.text.after_idle(self._run_batch)
+    
+    def _run_batch(self):
+        """Highlight one batch of lines of the lazy pass"""
+        self._idle_job = None
+        if self._pending is None:
+            return
+        
+        # Scrolling during the pass moves the viewport ahead of the queue
+        self._highlight_viewport()
+        
+        start, stop = self._pending
+        stop = min(stop, int(self.text.index("end-1c").split('.')[0]))
+        last = min(start + self.BATCH_LINES - 1, stop)
+        self.highlight_lines(start, last)
+        
+        if last >= stop:
+            self._pending = None
+        else:
+            self._pending = (last + 1, stop)
+            # Yield to the event loop between batches
+            self._idle_job = self.text.after(1, self._run_batch)
+    
+    def highlight_lines(self, first, last):
+        """Apply syntax highlighting to lines first..last inclusive"""
+        start = f"{first}.0"
+        end = f"{last}.end"
+        for tag in self.TAGS:
+            self.text.tag_remove(tag, start, end)
+        
+        lines = self.text.get(start, end).split('\n')
+        for line_num, line in enumerate(lines, first):
+            for col_start, col_end, tag in iter_spans(line, self._keyword_set):
+                self.text.tag_add(tag, f"{line_num}.{col_start}", f"{line_num}.{col_end}")
 
 class SCLEditor(tk.Tk):
     """Main editor window"""
@@ -171,8 +236,25 @@ class SCLEditor(tk.Tk):
         self.geometry("800x600")
         self.current_file = None
         
+        # Runs scripts in the background and streams their output
+        self.runner = ScriptRunner()
+        self.run_has_error = False
+        
+        # Background syntax checking, debounced after edits
+        self.diagnostics = DiagnosticsService()
+        self.diagnostics_job = None
+        self.diagnostics_polling = False
+        
+        # Windowed view over a file too large to load at once
+        self.large_file = None
+        self.window_first = 0
+        self.window_shift_pending = False
+        
+        # Cached plugin keyword index, shared with the interpreter
+        self.manifest = PluginManifest()
+        
         # Get all plugin keywords for syntax highlighting
-        self.plugin_keywords = list(get_all_plugin_keywords())
+        self.plugin_keywords = list(get_all_plugin_keywords(self.manifest))
         
         self.create_widgets()
     
@@ -195,6 +277,7 @@ class SCLEditor(tk.Tk):
         run_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Run", menu=run_menu)
         run_menu.add_command(label="Run", command=self.run_code, accelerator="F5")
+        run_menu.add_command(label="Stop", command=self.stop_code, accelerator="Shift+F5")
         
         # Create toolbar
         toolbar = ttk.Frame(self)
@@ -210,6 +293,9 @@ class SCLEditor(tk.Tk):
         run_btn = ttk.Button(toolbar, text="Run", command=self.run_code)
         run_btn.pack(side=tk.LEFT, padx=5, pady=5)
         
+        self.stop_btn = ttk.Button(toolbar, text="Stop", command=self.stop_code, state=tk.DISABLED)
+        self.stop_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
         # Create paned window for editor and console
         self.paned_window = ttk.PanedWindow(self, orient=tk.VERTICAL)
         self.paned_window.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -222,6 +308,8 @@ class SCLEditor(tk.Tk):
         console_frame = ttk.LabelFrame(self.paned_window, text="Console Output")
         self.console = scrolledtext.ScrolledText(console_frame, font=("Consolas", 10), wrap=tk.WORD)
         self.console.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.console.tag_configure("error", foreground="red")
+        self.editor.tag_configure("diagnostic", underline=True, background="#ffe0e0")
         self.console.config(state=tk.DISABLED)  # Make console read-only
         self.paned_window.add(console_frame, weight=1)
         
@@ -238,20 +326,54 @@ class SCLEditor(tk.Tk):
         self.bind("<Control-o>", lambda e: self.open_file())
         self.bind("<Control-s>", lambda e: self.save_file())
         self.bind("<F5>", lambda e: self.run_code())
+        self.bind("<Shift-F5>", lambda e: self.stop_code())
         
-        # Bind text change event to update syntax highlighting
-        self.editor.bind("<KeyRelease>", self.on_text_change)
+        # Every edit, typed or programmatic, reports whether it touched an import
+        self.highlighter.on_change = self.on_text_change
         
         # Set tab width
         self.editor.config(tabs=(4,))
     
-    def on_text_change(self, event=None):
-        """Handle text change events"""
-        # Get current content
-        content = self.editor.get("1.0", tk.END)
-        
-        # Update syntax highlighting based on plugins used
-        self.update_syntax_highlighting(content)
+    def on_text_change(self, imports_changed=False):
+        """Handle an edit; the keywords are re-derived only if imports may have changed"""
+        # The large-file view takes its keywords from the first window only
+        if imports_changed and self.large_file is None:
+            self.update_syntax_highlighting(self.editor.get("1.0", "end-1c"))
+        self.schedule_diagnostics()
+    
+    def schedule_diagnostics(self):
+        """Check the buffer once typing has paused"""
+        if self.large_file is not None:
+            return
+        if self.diagnostics_job is not None:
+            self.after_cancel(self.diagnostics_job)
+        self.diagnostics_job = self.after(DIAGNOSTICS_DELAY, self.request_diagnostics)
+    
+    def request_diagnostics(self):
+        """Hand the current buffer to the diagnostics worker"""
+        self.diagnostics_job = None
+        self.diagnostics.submit(self.editor.get("1.0", "end-1c"))
+        if not self.diagnostics_polling:
+            self.diagnostics_polling = True
+            self.after(50, self.poll_diagnostics)
+    
+    def poll_diagnostics(self):
+        """Mark invalid lines once the worker has finished"""
+        problems = self.diagnostics.results()
+        if problems is None:
+            self.after(50, self.poll_diagnostics)
+            return
+        self.diagnostics_polling = False
+        if self.large_file is not None:
+            return
+        
+        self.editor.tag_remove("diagnostic", "1.0", tk.END)
+        for line_num, message in problems:
+            self.editor.tag_add("diagnostic", f"{line_num}.0", f"{line_num}.end")
+        if problems:
+            line_num, message = problems[0]
+            more = f" (+{len(problems) - 1} more)" if len(problems) > 1 else ""
+            self.status_var.set(f"Line {line_num}: {message}{more}")
     
     def open_file(self):
         """Open a file"""
@@ -260,6 +382,11 @@ class SCLEditor(tk.Tk):
         
         if file_path:
             try:
+                if os.path.getsize(file_path) > LARGE_FILE_SIZE:
+                    self.open_large_file(file_path)
+                    return
+                
+                self.close_large_file()
                 with open(file_path, "r", encoding="utf-8") as f:
                     content = f.read()
                 self.editor.delete("1.0", tk.END)
@@ -267,14 +394,69 @@ class SCLEditor(tk.Tk):
                 self.current_file = file_path
                 self.title(f"SunsetCodeLang Editor - {os.path.basename(file_path)}")
                 self.status_var.set(f"Opened: {file_path}")
-                
-                # Update syntax highlighting based on plugins used in the file
-                self.update_syntax_highlighting(content)
-                
-                self.highlighter.highlight()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open file: {e}")
     
+    def open_large_file(self, file_path):
+        """Open a large file in a read-only window that loads lines lazily"""
+        self.close_large_file()
+        self.large_file = LineIndex(file_path)
+        self.highlighter.set_enabled(self.large_file.size <= HIGHLIGHT_SIZE_LIMIT)
+        
+        self.show_window(0)
+        self.editor.config(yscrollcommand=self.on_large_scroll)
+        self.current_file = file_path
+        self.title(f"SunsetCodeLang Editor - {os.path.basename(file_path)} [read-only]")
+        
+        # Plugin imports sit at the top of a script, inside the first window
+        self.update_syntax_highlighting(self.editor.get("1.0", tk.END))
+    
+    def close_large_file(self):
+        """Leave the large-file view and return to normal editing"""
+        if self.large_file is None:
+            return
+        self.large_file.close()
+        self.large_file = None
+        self.window_first = 0
+        self.editor.config(state=tk.NORMAL, yscrollcommand=self.editor.vbar.set)
+        self.highlighter.set_enabled(True)
+    
+    def show_window(self, first):
+        """Fill the editor with the window of lines starting at first"""
+        lines = self.large_file.lines(first, WINDOW_LINES)
+        self.window_first = first
+        self.editor.config(state=tk.NORMAL)
+        self.editor.delete("1.0", tk.END)
+        self.editor.insert("1.0", '\n'.join(lines))
+        self.editor.config(state=tk.DISABLED)
+        self.editor.edit_modified(False)
+        self.status_var.set(
+            f"Lines {first + 1}-{first + len(lines)} of ~{self.large_file.line_count()} "
+            f"in {self.large_file.path} (read-only)"
+        )
+    
+    def on_large_scroll(self, first, last):
+        """Slide the window when scrolling reaches either end of it"""
+        self.editor.vbar.set(first, last)
+        if self.large_file is None or self.window_shift_pending:
+            return
+        if float(last) >= 1.0 and self.large_file.has_line(self.window_first + WINDOW_LINES):
+            self.window_shift_pending = True
+            self.after_idle(self.shift_window, 1)
+        elif float(first) <= 0.0 and self.window_first > 0:
+            self.window_shift_pending = True
+            self.after_idle(self.shift_window, -1)
+    
+    def shift_window(self, direction):
+        """Move the window half its size forward or back, keeping the view in place"""
+        self.window_shift_pending = False
+        if self.large_file is None:
+            return
+        top = self.window_first + int(self.editor.index("@0,0").split('.')[0]) - 1
+        new_first = max(0, self.window_first + direction * (WINDOW_LINES // 2))
+        self.show_window(new_first)
+        self.editor.yview(f"{top - new_first + 1}.0")
+    
     def update_syntax_highlighting(self, content):
         """Update syntax highlighting based on plugins used in the file"""
         # Extract plugin imports from the file
@@ -284,22 +466,21 @@ class SCLEditor(tk.Tk):
         keywords = set()
         
         # Always include basic keywords
-        keywords.update(['set', 'sout', 'sif', 'selif', 'sle', 'simp'])
+        keywords.update(CORE_KEYWORDS)
         
         # Add keywords from imported plugins
         for plugin_import in plugin_imports:
-            plugin_path = plugin_import.replace('>', os.sep)
-            plugin_file = os.path.join('plugins', plugin_path + '.py')
-            
-            if os.path.exists(plugin_file):
-                plugin_keywords = extract_keywords_from_plugin(plugin_file)
-                keywords.update(plugin_keywords)
+            keywords.update(self.manifest.keywords(plugin_import.strip()))
         
         # Update the highlighter with the new keywords
         self.highlighter.update_keywords(list(keywords))
     
     def save_file(self):
         """Save the current file"""
+        if self.large_file is not None:
+            messagebox.showinfo("Read-only", "Large files are opened read-only.")
+            return
+        
         if self.current_file:
             try:
                 content = self.editor.get("1.0", tk.END)
@@ -313,6 +494,10 @@ class SCLEditor(tk.Tk):
     
     def save_as_file(self):
         """Save the current file with a new name"""
+        if self.large_file is not None:
+            messagebox.showinfo("Read-only", "Large files are opened read-only.")
+            return
+        
         filetypes = [(".scl files", "*.scl"), ("All files", "*")]
         file_path = filedialog.asksaveasfilename(
             defaultextension=".scl",
@@ -332,6 +517,10 @@ class SCLEditor(tk.Tk):
     
     def run_code(self):
         """Run the current SCL code"""
+        if self.runner.is_running():
+            self.status_var.set("A script is already running")
+            return
+        
         if not self.current_file:
             # Save the file first
             self.save_as_file()
@@ -344,37 +533,50 @@ class SCLEditor(tk.Tk):
                 self.console.insert(tk.END, "Executing code...\n\n")
                 self.console.config(state=tk.DISABLED)
                 
-                # Run the SCL code using the interpreter
-                result = subprocess.run(
-                    [sys.executable, "scl.py", self.current_file],
-                    capture_output=True,
-                    text=True,
-                    cwd=os.path.dirname(os.path.abspath(__file__))
-                )
-                
-                # Show the output in console
-                output = result.stdout
-                error = result.stderr
-                
-                self.console.config(state=tk.NORMAL)
-                if error:
-                    self.console.insert(tk.END, "Runtime Error:\n")
-                    self.console.insert(tk.END, error)
-                elif "Error at line" in output:
-                    self.console.insert(tk.END, "Runtime Error:\n")
-                    self.console.insert(tk.END, output)
-                else:
-                    self.console.insert(tk.END, "Execution Result:\n")
-                    self.console.insert(tk.END, output)
-                self.console.config(state=tk.DISABLED)
-                
-                self.status_var.set("Code executed")
+                # Run the SCL code in the background and stream its output
+                self.runner.start(self.current_file)
+                self.run_has_error = False
+                self.stop_btn.config(state=tk.NORMAL)
+                self.status_var.set("Running...")
+                self.after(50, self.poll_run)
             except Exception as e:
                 self.console.config(state=tk.NORMAL)
                 self.console.insert(tk.END, f"Failed to run code: {e}\n")
                 self.console.config(state=tk.DISABLED)
                 messagebox.showerror("Error", f"Failed to run code: {e}")
     
+    def poll_run(self):
+        """Copy new script output into the console until the run ends"""
+        chunks = self.runner.poll()
+        if chunks:
+            self.console.config(state=tk.NORMAL)
+            for stream, text in chunks:
+                if stream == "stderr" or text.startswith("Error at line"):
+                    self.run_has_error = True
+                    self.console.insert(tk.END, text, "error")
+                else:
+                    self.console.insert(tk.END, text)
+            self.console.see(tk.END)
+            self.console.config(state=tk.DISABLED)
+        
+        if self.runner.is_running():
+            self.after(50, self.poll_run)
+            return
+        
+        self.stop_btn.config(state=tk.DISABLED)
+        if self.runner.stopped:
+            self.status_var.set("Execution stopped")
+        elif self.run_has_error or self.runner.returncode():
+            self.status_var.set("Runtime Error")
+        else:
+            self.status_var.set("Code executed")
+    
+    def stop_code(self):
+        """Cancel the running script"""
+        if self.runner.is_running():
+            self.runner.stop()
+            self.status_var.set("Stopping...")
+    
     def close(self):
         """Close the editor"""
         # Check if the file has been modified
@@ -389,6 +591,8 @@ class SCLEditor(tk.Tk):
             elif response:
                 self.save_file()
         
+        self.runner.close()
+        self.close_large_file()
         self.destroy()
     
     def on_closing(self):
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Large File View
+Lazy, line-indexed access to files too large to load into an editor widget
+"""
+
+import os
+import mmap
+from array import array
+
+def _size_setting(name, default):
+    """Read a byte-size setting from the environment"""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+# Files larger than this open in the windowed large-file view
+LARGE_FILE_SIZE = _size_setting('SCL_LARGE_FILE_SIZE', 4 * 1024 * 1024)
+
+# Syntax highlighting is switched off for files larger than this
+HIGHLIGHT_SIZE_LIMIT = _size_setting('SCL_HIGHLIGHT_SIZE_LIMIT', 64 * 1024 * 1024)
+
+# Number of lines held in the editor widget at once in the large-file view
+WINDOW_LINES = 2000
+
+class LineIndex:
+    """Line offsets into a memory-mapped file, built on demand
+    
+    Opening only maps the file; offsets are indexed forward as far as the
+    lines that have been asked for, so the cost of opening does not depend
+    on the file size.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.size = os.fstat(self.file.fileno()).st_size
+        if self.size:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b''
+        # Start offset of every line indexed so far
+        self.offsets = array('q', [0])
+        self.complete = self.size == 0
+    
+    def _index_until(self, line_count):
+        """Index line offsets until line_count lines are known or the file ends"""
+        data = self.data
+        offsets = self.offsets
+        pos = offsets[-1]
+        while len(offsets) <= line_count and not self.complete:
+            newline = data.find(b'\n', pos)
+            if newline == -1:
+                self.complete = True
+                break
+            pos = newline + 1
+            offsets.append(pos)
+            if pos >= self.size:
+                self.complete = True
+    
+    def line_count(self):
+        """Return the number of lines, estimated until the index is complete"""
+        if self.complete:
+            return len(self.offsets)
+        indexed = len(self.offsets) - 1
+        average = self.offsets[-1] / indexed if indexed else 80
+        return max(len(self.offsets), int(self.size / max(average, 1)))
+    
+    def lines(self, first, count):
+        """Return count lines starting at zero-based line first"""
+        self._index_until(first + count)
+        offsets = self.offsets
+        result = []
+        for i in range(first, min(first + count, len(offsets))):
+            start = offsets[i]
+            end = offsets[i + 1] - 1 if i + 1 < len(offsets) else self.size
+            result.append(self.data[start:end].decode('utf-8', errors='replace').rstrip('\r'))
+        return result
+    
+    def has_line(self, line):
+        """Return True if the zero-based line exists in the file"""
+        self._index_until(line + 1)
+        return line < len(self.offsets)
+    
+    def close(self):
+        """Release the mapping and the file handle"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
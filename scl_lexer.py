@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Lexer
+Single-pass tokenizer shared by the interpreter and the editors
+"""
+
+import re
+import sys
+import mmap
+from array import array
+
+# All token rules compiled into one alternation. The order of the
+# alternatives is the order in which the interpreter used to test them,
+# so '|' is always a separator and ':' always an assignment.
+TOKEN_REGEX = re.compile(r'''
+      (?P<STRING>"[^"]*"?)
+    | (?P<NUMBER>\d[\d.]*)
+    | (?P<IDENTIFIER>[^\W\d]\w*)
+    | (?P<SEPARATOR>\|)
+    | (?P<ASSIGN>:)
+    | (?P<OPERATOR>[+\-*/=<>!&|]+)
+    | (?P<PAREN>[()\[\]{}])
+    | (?P<COMMENT>\#[^\n]*)
+    | (?P<UNKNOWN>\S)
+''', re.VERBOSE)
+
+# Highlighting style for each token kind (identifiers depend on keywords)
+TOKEN_STYLES = {
+    'STRING': 'string',
+    'NUMBER': 'number',
+    'SEPARATOR': 'operator',
+    'ASSIGN': 'operator',
+    'OPERATOR': 'operator',
+    'COMMENT': 'comment',
+}
+
+# Keywords of the core language, always highlighted
+CORE_KEYWORDS = ['set', 'sout', 'sif', 'selif', 'sle', 'simp']
+
+def tokenize(code):
+    """Tokenize SCL code into (kind, value) tuples"""
+    tokens = []
+    for match in TOKEN_REGEX.finditer(code.strip()):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'STRING':
+            # Strip the quotes; an unterminated string runs to the end
+            if len(value) > 1 and value.endswith('"'):
+                value = value[1:-1]
+            else:
+                value = value[1:]
+        tokens.append((kind, value))
+    return tokens
+
+# Rules of TOKEN_REGEX for scanning whole buffers: tokens stop at the end
+# of their line, and comments and unterminated strings leave out trailing
+# whitespace, so each line scans exactly as tokenize() would scan it alone.
+STREAM_REGEX = re.compile(r'''
+      (?P<STRING>"(?:[^"\n]*"|(?:[^"\n]*[^"\s])?))
+    | (?P<NUMBER>\d[\d.]*)
+    | (?P<IDENTIFIER>[^\W\d]\w*)
+    | (?P<SEPARATOR>\|)
+    | (?P<ASSIGN>:)
+    | (?P<OPERATOR>[+\-*/=<>!&|]+)
+    | (?P<PAREN>[()\[\]{}])
+    | (?P<COMMENT>\#(?:[^\n]*\S)?)
+    | (?P<UNKNOWN>\S)
+''', re.VERBOSE)
+
+# The same rules over UTF-8 bytes, for memory-mapped files. Bytes patterns
+# only know ASCII classes, so they are used for lines that are plain ASCII;
+# other lines are decoded and scanned with STREAM_REGEX.
+BYTES_STREAM_REGEX = re.compile(rb'''
+      (?P<STRING>"(?:[^"\n]*"|(?:[^"\n]*[^"\s])?))
+    | (?P<NUMBER>\d[\d.]*)
+    | (?P<IDENTIFIER>[^\W\d]\w*)
+    | (?P<SEPARATOR>\|)
+    | (?P<ASSIGN>:)
+    | (?P<OPERATOR>[+\-*/=<>!&|]+)
+    | (?P<PAREN>[()\[\]{}])
+    | (?P<COMMENT>\#(?:[^\n]*\S)?)
+    | (?P<UNKNOWN>\S)
+''', re.VERBOSE)
+
+# Bytes the ASCII patterns classify differently from str patterns: non-ASCII
+# bytes, and the separators \x1c-\x1f that str treats as whitespace
+UNICODE_BYTES = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+
+# Token kind names by regex group number, as stored in TokenStream.kinds
+TOKEN_KINDS = (None,) + tuple(sorted(STREAM_REGEX.groupindex, key=STREAM_REGEX.groupindex.get))
+
+def _token(kind, text):
+    """Return the (kind, value) tuple tokenize() gives for a token's text"""
+    if kind == 'STRING':
+        # Strip the quotes; an unterminated string runs to the end of the line
+        if len(text) > 1 and text.endswith('"'):
+            text = text[1:-1]
+        else:
+            text = text[1:]
+        text = sys.intern(text)
+    elif kind == 'IDENTIFIER':
+        text = sys.intern(text)
+    return (kind, text)
+
+class TokenStream:
+    """Tokens of a whole buffer stored as parallel arrays of offsets
+    
+    Each token is a kind code and its start and end offsets into the
+    source, which may be a str, bytes or an mmap; no per-token objects are
+    kept. Indexing returns the same (kind, value) tuples as tokenize(),
+    built only when a parser asks for them, with identifier and string
+    values interned. line(n) is a view over the tokens of one line that
+    shares the arrays, and line_text(n) is the text of that line.
+    """
+    
+    __slots__ = ('source', 'kinds', 'starts', 'ends', 'line_starts', 'line_offsets', 'first', 'last')
+    
+    def __init__(self, source, kinds, starts, ends, line_starts, line_offsets, first=0, last=None):
+        self.source = source
+        self.kinds = kinds
+        self.starts = starts
+        self.ends = ends
+        self.line_starts = line_starts
+        self.line_offsets = line_offsets
+        self.first = first
+        self.last = len(kinds) if last is None else last
+    
+    def __len__(self):
+        return self.last - self.first
+    
+    def _index(self, index):
+        """Return the array index of the index-th token of this view"""
+        if index < 0:
+            index += self.last - self.first
+        if not 0 <= index < self.last - self.first:
+            raise IndexError('token index out of range')
+        return self.first + index
+    
+    def kind(self, index):
+        """Return the kind of a token without materializing its text"""
+        return TOKEN_KINDS[self.kinds[self._index(index)]]
+    
+    def text(self, index):
+        """Return the source text of a token"""
+        i = self._index(index)
+        text = self.source[self.starts[i]:self.ends[i]]
+        if not isinstance(text, str):
+            text = text.decode('utf-8', errors='replace')
+        return text
+    
+    def __getitem__(self, index):
+        return _token(self.kind(index), self.text(index))
+    
+    def __iter__(self):
+        source, kinds, starts, ends = self.source, self.kinds, self.starts, self.ends
+        decode = not isinstance(source, str)
+        for i in range(self.first, self.last):
+            text = source[starts[i]:ends[i]]
+            if decode:
+                text = text.decode('utf-8', errors='replace')
+            yield _token(TOKEN_KINDS[kinds[i]], text)
+    
+    def line_count(self):
+        """Return the number of source lines"""
+        return len(self.line_starts) - 1
+    
+    def line(self, line_num):
+        """Return a view over the tokens of the zero-based line_num"""
+        line_starts = self.line_starts
+        return TokenStream(self.source, self.kinds, self.starts, self.ends, line_starts, self.line_offsets,
+                           line_starts[line_num], line_starts[line_num + 1])
+    
+    def line_text(self, line_num):
+        """Return the source text of the zero-based line_num, without its newline"""
+        text = self.source[self.line_offsets[line_num]:self.line_offsets[line_num + 1] - 1]
+        if not isinstance(text, str):
+            text = text.decode('utf-8', errors='replace')
+        return text
+    
+    def lines(self):
+        """Yield a view over the tokens of each line"""
+        for line_num in range(self.line_count()):
+            yield self.line(line_num)
+    
+    def close(self):
+        """Release a memory-mapped source"""
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+
+def scan(source):
+    """Tokenize a whole str, bytes or mmap buffer into a TokenStream"""
+    if isinstance(source, str):
+        regex, newline = STREAM_REGEX, '\n'
+    else:
+        regex, newline = BYTES_STREAM_REGEX, b'\n'
+    size = len(source)
+    # Offsets fit in 32 bits unless the buffer is 4 GB or more
+    offset = 'I' if size < 2 ** 32 - 1 else 'q'
+    kinds = array('B')
+    starts = array(offset)
+    ends = array(offset)
+    line_starts = array(offset)
+    line_offsets = array(offset)
+    add_kind, add_start, add_end = kinds.append, starts.append, ends.append
+    pos = 0
+    while True:
+        line_starts.append(len(kinds))
+        line_offsets.append(pos)
+        end = source.find(newline, pos)
+        if end == -1:
+            end = size
+        if regex is BYTES_STREAM_REGEX and UNICODE_BYTES.search(source, pos, end):
+            _scan_decoded(source, pos, end, kinds, starts, ends)
+        else:
+            for match in regex.finditer(source, pos, end):
+                add_kind(match.lastindex)
+                add_start(match.start())
+                add_end(match.end())
+        if end >= size:
+            break
+        pos = end + 1
+    line_starts.append(len(kinds))
+    line_offsets.append(size + 1)
+    return TokenStream(source, kinds, starts, ends, line_starts, line_offsets)
+
+def _scan_decoded(source, pos, end, kinds, starts, ends):
+    """Scan one line of UTF-8 bytes with the str rules, storing byte offsets"""
+    text = source[pos:end].decode('utf-8', errors='surrogateescape')
+    # Byte offset of every character, so tokens still index the bytes
+    offsets = array('q', [pos])
+    for char in text:
+        offsets.append(offsets[-1] + len(char.encode('utf-8', errors='surrogateescape')))
+    for match in STREAM_REGEX.finditer(text):
+        kinds.append(match.lastindex)
+        starts.append(offsets[match.start()])
+        ends.append(offsets[match.end()])
+
+def scan_file(path):
+    """Tokenize a UTF-8 file through a read-only memory map
+    
+    The stream reads token text straight from the mapping; close it when
+    done.
+    """
+    with open(path, 'rb') as f:
+        if not f.seek(0, 2):
+            return scan(b'')
+        return scan(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+def iter_spans(line, keywords=()):
+    """Yield (start, end, style) highlighting spans for one line of code"""
+    for match in TOKEN_REGEX.finditer(line):
+        kind = match.lastgroup
+        if kind == 'IDENTIFIER':
+            if match.group() in keywords:
+                yield match.start(), match.end(), 'keyword'
+        else:
+            style = TOKEN_STYLES.get(kind)
+            if style:
+                yield match.start(), match.end(), style
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Plugin Manifest
+Persistent index of installed plugins shared by the interpreter and the editors
+"""
+
+import os
+import ast
+import json
+import threading
+import hashlib
+
+MANIFEST_NAME = '.manifest.json'
+MANIFEST_VERSION = 5
+LOCKFILE_NAME = 'scl.lock'
+
+# Plugin API implemented by the interpreter; older plugins run through PluginAdapter
+PLUGIN_API_VERSION = 2
+
+# Errors ast.literal_eval raises for expressions that are not plain literals
+LITERAL_ERRORS = (ValueError, TypeError, SyntaxError, MemoryError, RecursionError)
+
+def _constant_str(node):
+    """Return the value of a string literal node, or None"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+def _subscript_index(node):
+    """Return the constant integer index of a subscript node, or None"""
+    if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Constant):
+        return node.slice.value
+    return None
+
+class PluginInfoVisitor(ast.NodeVisitor):
+    """Collect plugin metadata from a parsed plugin module
+    
+    Keywords are the strings a parser compares token values with
+    (token[1] == 'sout') and the keywords registered with
+    grammar.production; statement tags are the strings compared with a
+    statement's kind (stmt[0] == 'PRINT'). Keywords may come from literal
+    collections or from module-level constants, as in
+    for keyword in KEYWORDS: grammar.production(keyword, ...).
+    """
+    
+    def __init__(self):
+        self.class_name = None
+        self.keywords = set()
+        self.statements = set()
+        self.version = None
+        self.requires = []
+        self.constants = {}
+        self.loop_values = {}
+    
+    def strings(self, node):
+        """Return the strings a literal or module constant holds, or None
+        
+        Names, tuples, lists, sets and dict keys are resolved, and so are
+        collections joined with +.
+        """
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left, right = self.strings(node.left), self.strings(node.right)
+            return None if left is None or right is None else left + right
+        if isinstance(node, ast.Name):
+            value = self.constants.get(node.id)
+        else:
+            try:
+                value = ast.literal_eval(node)
+            except LITERAL_ERRORS:
+                return None
+        if isinstance(value, (tuple, list, set, frozenset, dict)):
+            return [item for item in value if isinstance(item, str)]
+        return None
+    
+    def visit_ClassDef(self, node):
+        if self.class_name is None and node.name.endswith('Plugin'):
+            self.class_name = node.name
+        self.generic_visit(node)
+    
+    def visit_Compare(self, node):
+        if len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq):
+            value = _constant_str(node.comparators[0])
+            index = _subscript_index(node.left)
+            if value is not None:
+                if index == 1:
+                    self.keywords.add(value)
+                elif index == 0 and isinstance(node.left.value, ast.Name) and node.left.value.id == 'stmt':
+                    self.statements.add(value)
+        elif (len(node.ops) == 1 and isinstance(node.ops[0], ast.In) and _subscript_index(node.left) == 1
+              and isinstance(node.comparators[0], ast.Name)):
+            # token[1] in KEYWORDS, with KEYWORDS a module constant
+            self.keywords.update(self.strings(node.comparators[0]) or ())
+        self.generic_visit(node)
+    
+    def visit_For(self, node):
+        # Loop variables over constant keyword collections, for visit_Call
+        values = self.strings(node.iter) if isinstance(node.target, ast.Name) else None
+        if values is None:
+            self.generic_visit(node)
+            return
+        saved = self.loop_values.get(node.target.id)
+        self.loop_values[node.target.id] = values
+        self.generic_visit(node)
+        if saved is None:
+            del self.loop_values[node.target.id]
+        else:
+            self.loop_values[node.target.id] = saved
+    
+    def visit_Call(self, node):
+        # grammar.production('keyword', ...) registers a v2 keyword
+        if isinstance(node.func, ast.Attribute) and node.func.attr == 'production' and node.args:
+            value = _constant_str(node.args[0])
+            if value is not None:
+                self.keywords.add(value)
+            elif isinstance(node.args[0], ast.Name):
+                self.keywords.update(self.loop_values.get(node.args[0].id, ()))
+        self.generic_visit(node)
+    
+    def visit_module_assign(self, node):
+        """Read VERSION/__version__ and REQUIRES from top-level assignments"""
+        for target in node.targets:
+            if not isinstance(target, ast.Name):
+                continue
+            try:
+                value = ast.literal_eval(node.value)
+            except LITERAL_ERRORS:
+                continue
+            self.constants[target.id] = value
+            if target.id in ('VERSION', '__version__'):
+                self.version = str(value)
+            elif target.id == 'REQUIRES' and isinstance(value, (list, tuple)):
+                self.requires = [str(name) for name in value]
+
+def extract_plugin_info(plugin_file):
+    """Extract plugin metadata statically, without executing the plugin"""
+    with open(plugin_file, 'rb') as f:
+        raw = f.read()
+    content = raw.decode('utf-8')
+    tree = ast.parse(content, filename=plugin_file)
+    
+    visitor = PluginInfoVisitor()
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            visitor.visit_module_assign(node)
+    visitor.visit(tree)
+    
+    # Description: module docstring or the first comment line
+    description = ast.get_docstring(tree)
+    if not description:
+        for line in content.splitlines():
+            if line.startswith('#'):
+                description = line.lstrip('#').strip()
+                break
+            if line.strip():
+                break
+    
+    return {
+        'class_name': visitor.class_name,
+        'description': (description or '').split('\n')[0],
+        'version': visitor.version,
+        'keywords': sorted(visitor.keywords),
+        'statements': sorted(visitor.statements),
+        'requires': visitor.requires,
+        'sha256': hashlib.sha256(raw).hexdigest(),
+    }
+
+def load_lockfile(path=LOCKFILE_NAME):
+    """Read a project lockfile, or return None if there is none
+    
+    Raises ValueError if the file is not a valid lockfile.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lock = json.load(f)
+    except OSError:
+        return None
+    except ValueError as e:
+        raise ValueError(f"Invalid lockfile {path}: {e}") from e
+    plugins = lock.get('plugins', {}) if isinstance(lock, dict) else None
+    if not isinstance(plugins, dict) or not all(isinstance(locked, dict) for locked in plugins.values()):
+        raise ValueError(f"Invalid lockfile {path}: expected a 'plugins' object")
+    return lock
+
+def save_lockfile(lock, path=LOCKFILE_NAME):
+    """Write a project lockfile"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(lock, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+class PluginManifest:
+    """Index of plugin metadata keyed by plugin path and file mtime
+    
+    Entries are stored in plugins/.manifest.json and only re-extracted
+    when a plugin file's mtime or size changes. A plugin whose metadata
+    cannot be read gets an empty entry with the reason in 'error'.
+    """
+    
+    def __init__(self, plugins_dir='plugins'):
+        self.plugins_dir = plugins_dir
+        self.manifest_file = os.path.join(plugins_dir, MANIFEST_NAME)
+        self.entries = {}
+        self.dirty = False
+        self.load()
+    
+    def load(self):
+        """Load the manifest from disk, ignoring missing or stale files"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('plugins', {})
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def save(self):
+        """Write the manifest back to disk if it changed"""
+        if not self.dirty:
+            return
+        tmp_file = f'{self.manifest_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'plugins': self.entries}, f, indent=1, sort_keys=True)
+            os.replace(tmp_file, self.manifest_file)
+            self.dirty = False
+        except OSError:
+            # A read-only plugins directory just means no persistent cache
+            pass
+    
+    def plugin_file(self, plugin_path):
+        """Return the source file for a plugin path such as other>time"""
+        return os.path.join(self.plugins_dir, plugin_path.replace('>', os.sep) + '.py')
+    
+    def _update(self, plugin_path, plugin_file, stat):
+        """Refresh one entry if the file changed since it was indexed"""
+        entry = self.entries.get(plugin_path)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+        
+        error = None
+        try:
+            info = extract_plugin_info(plugin_file)
+        except (OSError, UnicodeDecodeError, SyntaxError) as e:
+            # Kept with the entry for sdp info; loading the plugin reports it anyway
+            error = f"Error extracting keywords from {plugin_file}: {e}"
+            info = {
+                'class_name': None, 'description': '', 'version': None,
+                'keywords': [], 'statements': [], 'requires': [], 'sha256': None,
+            }
+        
+        entry = {
+            'file': plugin_file,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'error': error,
+        }
+        entry.update(info)
+        self.entries[plugin_path] = entry
+        self.dirty = True
+        return entry
+    
+    def get(self, plugin_path):
+        """Return the entry for one plugin, or None if it is not installed"""
+        plugin_file = self.plugin_file(plugin_path)
+        try:
+            stat = os.stat(plugin_file)
+        except OSError:
+            if self.entries.pop(plugin_path, None) is not None:
+                self.dirty = True
+                self.save()
+            return None
+        
+        entry = self._update(plugin_path, plugin_file, stat)
+        self.save()
+        return entry
+    
+    def refresh(self):
+        """Bring the whole manifest up to date with the plugins directory"""
+        seen = set()
+        for root, dirs, files in os.walk(self.plugins_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(('.', '__'))]
+            for file in files:
+                if not file.endswith('.py') or file == '__init__.py':
+                    continue
+                plugin_file = os.path.join(root, file)
+                rel_path = os.path.relpath(plugin_file, self.plugins_dir)[:-3]
+                plugin_path = rel_path.replace(os.sep, '>')
+                try:
+                    stat = os.stat(plugin_file)
+                except OSError:
+                    continue
+                self._update(plugin_path, plugin_file, stat)
+                seen.add(plugin_path)
+        
+        for plugin_path in list(self.entries):
+            if plugin_path not in seen:
+                del self.entries[plugin_path]
+                self.dirty = True
+        
+        self.save()
+        return self.entries
+    
+    def keywords(self, plugin_path):
+        """Return the syntax keywords of one plugin"""
+        entry = self.get(plugin_path)
+        return set(entry['keywords']) if entry else set()
+    
+    def all_keywords(self):
+        """Return the syntax keywords of every installed plugin"""
+        keywords = set()
+        for entry in self.refresh().values():
+            keywords.update(entry['keywords'])
+        return keywords
+    
+    def verify_lock(self, lock):
+        """Compare installed plugins with a lockfile; return a list of problems
+        
+        Hashes come from the manifest, so only plugins whose files changed
+        since they were indexed are read again.
+        """
+        problems = []
+        for plugin_path, locked in sorted(lock.get('plugins', {}).items()):
+            entry = self.get(plugin_path)
+            if entry is None:
+                problems.append(f"Plugin {plugin_path} is locked but not installed")
+            elif locked.get('sha256') and entry['sha256'] != locked['sha256']:
+                problems.append(f"Plugin {plugin_path} does not match the lockfile hash")
+        return problems
+
+class Grammar:
+    """Grammar productions registered by one plugin
+    
+    A production is a function parse(tokens, pos) returning (stmt, new_pos),
+    or (None, pos) when it does not match. Keyword productions own lines
+    whose first token is that identifier; catch-all productions (keyword
+    None) only see lines whose first word has no production. Productions
+    keep their parser state local, so one grammar can parse many programs
+    at once.
+    """
+    
+    def __init__(self):
+        self.keywords = {}
+        self.fallbacks = []
+    
+    def production(self, keyword, parse):
+        """Register parse for lines starting with keyword, or for any line"""
+        if keyword is None:
+            self.fallbacks.append(parse)
+        else:
+            self.keywords.setdefault(keyword, []).append(parse)
+    
+    def parse(self, tokens, pos):
+        """Parse one statement at pos with this plugin's productions"""
+        if pos >= len(tokens):
+            return None, pos
+        token = tokens[pos]
+        productions = self.keywords.get(token[1]) if token[0] == 'IDENTIFIER' else None
+        for parse in productions or self.fallbacks:
+            stmt, new_pos = parse(tokens, pos)
+            if stmt:
+                return stmt, new_pos
+        return None, pos
+
+class PluginAdapter:
+    """Run a v1 plugin (parse_statement/execute_statement) through the v2 API
+    
+    v1 plugins act on their interpreter rather than on the execution
+    context, so their statements run one at a time under a lock.
+    """
+    
+    API_VERSION = PLUGIN_API_VERSION
+    
+    def __init__(self, plugin):
+        self.plugin = plugin
+        self.lock = threading.Lock()
+    
+    def __getattr__(self, name):
+        return getattr(self.plugin, name)
+    
+    def register_syntax(self, grammar):
+        if hasattr(self.plugin, 'register_syntax'):
+            self.plugin.register_syntax()
+        if hasattr(self.plugin, 'parse_statement'):
+            grammar.production(None, self.plugin.parse_statement)
+    
+    def compile_statement(self, stmt):
+        if not hasattr(self.plugin, 'execute_statement'):
+            return None
+        execute = self.plugin.execute_statement
+        lock = self.lock
+        def run(ctx):
+            with lock:
+                return execute(stmt)
+        return run
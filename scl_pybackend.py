@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Python Backend
+Pure-Python implementation of the scl_backend extension, used when the
+native module is not built
+"""
+
+from scl_lexer import tokenize
+
+NAME = 'python'
+
+def evaluate_expression(variables, expr):
+    """Evaluate a literal or variable token like SCLInterpreter.evaluate_expression"""
+    if expr[0] == 'STRING':
+        return expr[1]
+    elif expr[0] == 'NUMBER':
+        try:
+            if '.' in expr[1]:
+                return float(expr[1])
+            else:
+                return int(expr[1])
+        except:
+            return 0
+    elif expr[0] == 'IDENTIFIER':
+        return variables.get(expr[1], 0)
+    return 0
+
+def execute_statement(interpreter, stmt):
+    """Execute a statement, running core statements without plugin dispatch"""
+    kind = stmt[0]
+    # Core statements come from the basic plugin; without it, defer to plugins
+    if kind == 'ASSIGN' and len(stmt) == 3 and 'basic' in interpreter.plugins:
+        interpreter.variables[stmt[1]] = evaluate_expression(interpreter.variables, stmt[2])
+        return True
+    elif kind == 'PRINT' and len(stmt) == 2 and 'basic' in interpreter.plugins:
+        print(evaluate_expression(interpreter.variables, stmt[1]))
+        return True
+    return interpreter.dispatch_statement(stmt)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Script Runner
+Runs SCL scripts in a child interpreter without blocking the editors
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import threading
+import subprocess
+
+# Written by the worker on stdout and stderr after each run, with its exit code
+END_MARKER = '\x1eSCL-RUN-END '
+
+# Seconds a stopped worker has to exit before it is killed
+STOP_TIMEOUT = 2
+
+class ScriptRunner:
+    """Run one SCL script at a time and stream its output
+    
+    Scripts run in a long-lived worker process that takes run requests on
+    its stdin, so each run skips interpreter start-up. The worker runs
+    scripts on its main thread, which plugins such as sui need. Stopping
+    a run terminates the worker; the next run starts a new one.
+    
+    Reader threads push output into a queue as it is produced; the editor
+    drains it with poll() from its own event loop. No method waits for the
+    worker, so all of them can be called from a UI thread.
+    """
+    
+    def __init__(self, interpreter_dir=None):
+        self.interpreter_dir = interpreter_dir or os.path.dirname(os.path.abspath(__file__))
+        self.process = None
+        self.output = queue.Queue()
+        self.readers = []
+        self.ended = {}
+        self.running = False
+        self.stopped = False
+        self.kill_at = None
+        self.last_returncode = None
+    
+    def _spawn(self):
+        """Start a new worker process and its reader threads"""
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", "scl_runner.py"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=self.interpreter_dir
+        )
+        self.kill_at = None
+        self.readers = [
+            threading.Thread(target=self._read, args=(self.process.stdout, "stdout"), daemon=True),
+            threading.Thread(target=self._read, args=(self.process.stderr, "stderr"), daemon=True),
+        ]
+        for reader in self.readers:
+            reader.start()
+    
+    def start(self, file_path, args=()):
+        """Start running a script; returns False if one is already running"""
+        if self.is_running():
+            return False
+        
+        self.stopped = False
+        self.ended = {}
+        self.last_returncode = None
+        request = json.dumps({'file': os.path.abspath(file_path), 'args': list(args)}) + '\n'
+        # A worker that has exited or closed its stdin is replaced once
+        for attempt in range(2):
+            if self.process is None or self.process.poll() is not None:
+                self._spawn()
+            try:
+                self.process.stdin.write(request)
+                self.process.stdin.flush()
+                break
+            except OSError:
+                self.process.kill()
+                if attempt:
+                    raise
+        self.running = True
+        return True
+    
+    def _read(self, pipe, stream):
+        """Forward lines from a pipe into the output queue"""
+        try:
+            for line in iter(pipe.readline, ''):
+                index = line.find(END_MARKER)
+                if index == -1:
+                    self.output.put((stream, line))
+                    continue
+                if index:
+                    self.output.put((stream, line[:index]))
+                self.ended[stream] = int(line[index + len(END_MARKER):])
+        finally:
+            pipe.close()
+    
+    def poll(self):
+        """Return the output produced since the last poll as (stream, text) pairs"""
+        chunks = []
+        while True:
+            try:
+                chunks.append(self.output.get_nowait())
+            except queue.Empty:
+                return chunks
+    
+    def is_running(self):
+        """Return True while the script is running or output is still pending"""
+        if not self.running:
+            return False
+        if self.process.poll() is None:
+            if self.kill_at is not None and time.monotonic() >= self.kill_at:
+                self.process.kill()
+            if len(self.ended) < len(self.readers) or not self.output.empty():
+                return True
+            self.last_returncode = self.ended.get("stdout")
+        else:
+            # The worker exited during the run: it was stopped or crashed
+            if any(reader.is_alive() for reader in self.readers) or not self.output.empty():
+                return True
+            self.last_returncode = self.ended.get("stdout", self.process.returncode)
+        self.running = False
+        return False
+    
+    def returncode(self):
+        """Return the exit code of the last run, or None if it is still running"""
+        if self.is_running():
+            return None
+        return self.last_returncode
+    
+    def stop(self):
+        """Cancel the running script without waiting for the worker to exit
+        
+        The worker is killed if it is still alive STOP_TIMEOUT seconds
+        later, when is_running() is next polled.
+        """
+        if not self.running or self.process.poll() is not None:
+            return
+        self.stopped = True
+        self.process.terminate()
+        self.kill_at = time.monotonic() + STOP_TIMEOUT
+    
+    def close(self):
+        """Stop any run and shut the worker down"""
+        if self.process is None or self.process.poll() is not None:
+            return
+        if self.running:
+            self.stopped = True
+            self.process.terminate()
+        else:
+            # An idle worker exits once its stdin is closed
+            try:
+                self.process.stdin.close()
+            except OSError:
+                self.process.terminate()
+
+def run_script(file_path, args):
+    """Run a script as 'python scl.py file_path args...' would; return its exit code"""
+    import scl
+    saved = sys.argv, sys.stdin
+    sys.argv = ["scl.py", file_path] + list(args)
+    sys.stdin = open(os.devnull, 'r')
+    try:
+        scl.main()
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdin.close()
+        sys.argv, sys.stdin = saved
+
+def serve(requests):
+    """Worker loop: run each script requested as a JSON line on requests"""
+    for request in requests:
+        request = json.loads(request)
+        returncode = run_script(request['file'], request.get('args', ()))
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+            stream.write(f"{END_MARKER}{returncode}\n")
+            stream.flush()
+
+if __name__ == "__main__":
+    serve(sys.stdin)
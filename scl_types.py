@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+SunsetCodeLang (SCL) Value Types
+List and map values for SCL variables
+"""
+
+from array import array
+
+# Typed array storage by Python type, for homogeneous numeric lists
+TYPECODES = {int: 'q', float: 'd'}
+
+def _storage(values):
+    """Return the most compact storage for a sequence of values"""
+    values = list(values)
+    kinds = {type(value) for value in values}
+    if len(kinds) <= 1:
+        typecode = TYPECODES.get(kinds.pop() if kinds else int)
+        if typecode:
+            try:
+                return array(typecode, values)
+            except OverflowError:
+                pass
+    return values
+
+class SCLList:
+    """Array-backed list value
+    
+    Lists of only integers or only floats are kept in a typed array,
+    8 bytes per item with no per-item objects. The first value of another
+    type moves the items to a plain list. Indexing, append and len are O(1).
+    """
+    
+    __slots__ = ('items',)
+    
+    def __init__(self, values=()):
+        self.items = _storage(values)
+    
+    def append(self, value):
+        items = self.items
+        if isinstance(items, array):
+            if TYPECODES.get(type(value)) == items.typecode:
+                try:
+                    items.append(value)
+                    return
+                except OverflowError:
+                    pass
+            self.items = items = items.tolist()
+        items.append(value)
+    
+    def typecode(self):
+        """Return the array typecode, or None for mixed storage"""
+        return self.items.typecode if isinstance(self.items, array) else None
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __getitem__(self, index):
+        return self.items[index]
+    
+    def __delitem__(self, index):
+        del self.items[index]
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __eq__(self, other):
+        if isinstance(other, SCLList):
+            return list(self.items) == list(other.items)
+        return NotImplemented
+    
+    def __str__(self):
+        return str(list(self.items))
+    
+    __repr__ = __str__
@@ -1,84 +1,519 @@
 import os
+import base64
 import urllib.request
 import urllib.parse
 import sys
 import json
+import re
+import time
+import hashlib
+import shutil
+import threading
+import http.client
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from scl_plugins import PluginManifest, LOCKFILE_NAME, load_lockfile, save_lockfile
+
+USER_AGENT = 'SCL-Plugin-Downloader/1.0'
+CHUNK_SIZE = 64 * 1024
+MAX_WORKERS = 8
+MAX_REDIRECTS = 5
+INDEX_TTL = int(os.environ.get('SCL_INDEX_TTL', 24 * 3600))
+
+class ConnectionPool:
+    # 每个工作线程对每个主机保持一个 keep-alive 连接
+    # 代理设置与 urllib 相同 (http_proxy / https_proxy / no_proxy 环境变量)
+    def __init__(self, timeout=30, proxies=None):
+        self.timeout = timeout
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = []
+    
+    def _proxy(self, scheme, netloc):
+        proxy = self.proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass_environment(netloc, self.proxies):
+            return None
+        if '://' not in proxy:
+            proxy = 'http://' + proxy
+        return urllib.parse.urlsplit(proxy)
+    
+    def _proxy_headers(self, proxy):
+        if proxy.username is None:
+            return {}
+        credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+        return {'Proxy-Authorization': 'Basic ' + base64.b64encode(credentials.encode('utf-8')).decode('ascii')}
+    
+    def _connection(self, scheme, netloc, fresh=False):
+        conns = getattr(self.local, 'conns', None)
+        if conns is None:
+            conns = self.local.conns = {}
+        key = (scheme, netloc)
+        conn = conns.get(key)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            proxy = self._proxy(scheme, netloc)
+            if proxy is None:
+                host = netloc
+            else:
+                host = proxy.hostname + (f":{proxy.port}" if proxy.port else '')
+            if scheme == 'https':
+                conn = http.client.HTTPSConnection(host, timeout=self.timeout)
+                if proxy is not None:
+                    # https 通过 CONNECT 隧道访问目标主机
+                    conn.set_tunnel(netloc, headers=self._proxy_headers(proxy))
+            else:
+                conn = http.client.HTTPConnection(host, timeout=self.timeout)
+            conns[key] = conn
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+    
+    def get(self, url, headers=None):
+        headers = dict(headers or {})
+        headers.setdefault('User-Agent', USER_AGENT)
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            path = parts.path or '/'
+            if parts.query:
+                path += '?' + parts.query
+            request_headers = headers
+            proxy = self._proxy(parts.scheme, parts.netloc)
+            if proxy is not None and parts.scheme == 'http':
+                # http 代理需要完整的 URL
+                path = urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, '', ''))
+                request_headers = {**headers, **self._proxy_headers(proxy)}
+            
+            # 复用的连接可能已被服务器关闭，此时换新连接重试一次
+            for fresh in (False, True):
+                conn = self._connection(parts.scheme, parts.netloc, fresh)
+                try:
+                    conn.request('GET', path, headers=request_headers)
+                    response = conn.getresponse()
+                    break
+                except (http.client.HTTPException, OSError):
+                    if fresh:
+                        raise
+            
+            if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+                response.read()
+                url = urllib.parse.urljoin(url, response.getheader('Location'))
+                continue
+            return response
+        raise http.client.HTTPException(f"重定向次数过多: {url}")
+    
+    def close(self):
+        with self.lock:
+            for conn in self.connections:
+                conn.close()
+            self.connections = []
+
+class PackageIndex:
+    # 名称、描述和分类的 n-gram 倒排索引，支持子串搜索（包括中文）
+    GRAM = 3
+    
+    def __init__(self, packages):
+        self.packages = packages
+        self.names = [str(pkg.get('name', '')).lower() for pkg in packages]
+        self.texts = []
+        self.postings = defaultdict(set)
+        for i, pkg in enumerate(packages):
+            text = ' '.join(str(pkg.get(field) or '') for field in ('name', 'description', 'category')).lower()
+            self.texts.append(text)
+            for n in range(1, self.GRAM + 1):
+                for j in range(len(text) - n + 1):
+                    self.postings[text[j:j + n]].add(i)
+    
+    def _match(self, term):
+        grams = [term[j:j + self.GRAM] for j in range(len(term) - self.GRAM + 1)] or [term]
+        candidates = None
+        for gram in grams:
+            ids = self.postings.get(gram, set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        # n-gram 命中只是候选，最后确认子串确实存在
+        return {i for i in candidates if term in self.texts[i]}
+    
+    def search(self, keyword):
+        terms = re.split(r'\s+', keyword.lower().strip())
+        matches = None
+        for term in terms:
+            if not term:
+                continue
+            ids = self._match(term)
+            matches = ids if matches is None else matches & ids
+        if matches is None:
+            matches = set(range(len(self.packages)))
+        # 名称命中的排在前面
+        key = keyword.lower().strip()
+        ranked = sorted(matches, key=lambda i: (key not in self.names[i], self.names[i]))
+        return [self.packages[i] for i in ranked]
 
 class SCLPluginDownloader:
-    def __init__(self):
-        self.base_url = "https://scl.ecuil.com/forum/api/download.php"
-        self.api_url = "https://scl.ecuil.com/forum/api/packages.php"
-        self.plugins_dir = "./plugins"
+    def __init__(self, base_url=None, api_url=None, plugins_dir=None, cache_dir=None):
+        self.base_url = base_url or "https://scl.ecuil.com/forum/api/download.php"
+        self.api_url = api_url or "https://scl.ecuil.com/forum/api/packages.php"
+        self.plugins_dir = plugins_dir or "./plugins"
+        self.cache_dir = cache_dir or os.environ.get('SCL_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.scl', 'cache')
+        self.pool = ConnectionPool()
+        self.cache_lock = threading.Lock()
+        self.cache_index = None
+        self.search_index = None
     
     def log(self, message):
         print(message)
     
-    def download_plugin(self, plugin_name):
+    # 本地包缓存: objects/<sha256>.py 按内容寻址, index.json 记录插件名到哈希的映射
+    def _cache_path(self, *parts):
+        return os.path.join(self.cache_dir, *parts)
+    
+    def _load_cache_index(self):
+        if self.cache_index is None:
+            try:
+                with open(self._cache_path('index.json'), 'r', encoding='utf-8') as f:
+                    self.cache_index = json.load(f)
+            except (OSError, ValueError):
+                self.cache_index = {}
+        return self.cache_index
+    
+    def _save_cache_index(self):
+        with self.cache_lock:
+            if self.cache_index is None:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._cache_path('index.json.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache_index, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self._cache_path('index.json'))
+    
+    def cached_object(self, plugin_name):
+        with self.cache_lock:
+            entry = self._load_cache_index().get(plugin_name)
+        if entry:
+            path = self._cache_path('objects', entry['sha256'] + '.py')
+            if os.path.exists(path):
+                return path, entry
+        return None, None
+    
+    def _install_file(self, source_path, plugin_name):
+        # 先复制到临时文件再原子替换，避免留下写了一半的插件
+        os.makedirs(self.plugins_dir, exist_ok=True)
+        dest_path = os.path.join(self.plugins_dir, f"{plugin_name}.py")
+        tmp_path = dest_path + '.tmp'
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+        return dest_path
+    
+    def _discard_partial(self, part_path):
+        for path in (part_path, part_path + '.json'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def _resumes_at(self, response, offset):
+        # 只有从 offset 开始的 206 才能接在已有内容后面; 200 是完整内容
+        if response.status == 200:
+            return True
+        if response.status != 206:
+            return response.status != 416
+        match = re.match(r'bytes\s+(\d+)-', response.getheader('Content-Range', ''))
+        return bool(match) and int(match.group(1)) == offset
+    
+    def _fetch(self, plugin_name):
+        url = f"{self.base_url}?name={urllib.parse.quote(plugin_name)}"
+        self.log(f"下载地址: {url}")
+        
+        partial_dir = self._cache_path('partial')
+        os.makedirs(partial_dir, exist_ok=True)
+        part_path = os.path.join(partial_dir, f"{plugin_name}.part")
+        meta_path = part_path + '.json'
+        
+        # 断点续传: 已有部分内容且知道 ETag 时用 Range 请求剩余部分
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        etag = None
+        if offset:
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    etag = json.load(f).get('etag')
+            except (OSError, ValueError):
+                etag = None
+            if not etag:
+                # 没有 ETag 就无法确认服务器上的文件未变，从头下载
+                self._discard_partial(part_path)
+                offset = 0
+        
+        headers = {}
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = etag
+        response = self.pool.get(url, headers)
+        
+        if offset and not self._resumes_at(response, offset):
+            # 416 或 Content-Range 与已有内容对不上: 丢弃部分文件重新下载
+            response.read()
+            self.log(f"无法继续下载 {plugin_name}，重新下载")
+            self._discard_partial(part_path)
+            offset = 0
+            response = self.pool.get(url)
+        
+        if response.status not in (200, 206):
+            response.read()
+            self._discard_partial(part_path)
+            self.log(f"HTTP错误: {response.status} - {response.reason}")
+            return None
+        
+        content_type = response.getheader('Content-Type', '')
+        if 'application/json' in content_type:
+            self._discard_partial(part_path)
+            data = json.loads(response.read().decode('utf-8'))
+            self.log(f"下载失败: {data.get('error', '未知错误')}")
+            return None
+        
+        digest = hashlib.sha256()
+        if response.status == 206 and offset:
+            self.log(f"继续下载 {plugin_name}，已有 {offset} 字节")
+            with open(part_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            mode = 'ab'
+        else:
+            mode = 'wb'
+        
+        etag = response.getheader('ETag')
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag}, f)
+        
+        # 边下载边写入临时文件并计算哈希，不把整个文件读入内存
+        with open(part_path, mode) as f:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                digest.update(chunk)
+        
+        sha256 = digest.hexdigest()
+        objects_dir = self._cache_path('objects')
+        os.makedirs(objects_dir, exist_ok=True)
+        object_path = os.path.join(objects_dir, sha256 + '.py')
+        os.replace(part_path, object_path)
+        os.remove(meta_path)
+        
+        entry = {'sha256': sha256, 'size': os.path.getsize(object_path), 'etag': etag}
+        with self.cache_lock:
+            self._load_cache_index()[plugin_name] = entry
+        return object_path, entry
+    
+    def download_plugin(self, plugin_name, use_cache=True, expected_sha256=None):
         self.log(f"正在下载插件: {plugin_name}")
         
         try:
-            url = f"{self.base_url}?name={plugin_name}"
-            self.log(f"下载地址: {url}")
+            object_path, entry = None, None
+            if use_cache and expected_sha256:
+                # 锁定的版本按哈希直接从缓存中取
+                path = self._cache_path('objects', expected_sha256 + '.py')
+                if os.path.exists(path):
+                    object_path, entry = path, {'sha256': expected_sha256}
+            elif use_cache:
+                object_path, entry = self.cached_object(plugin_name)
             
-            req = urllib.request.Request(url)
-            req.add_header('User-Agent', 'SCL-Plugin-Downloader/1.0')
-            
-            with urllib.request.urlopen(req, timeout=30) as response:
-                content = response.read()
-                
-                content_type = response.headers.get('Content-Type', '')
-                
-                if 'application/json' in content_type:
-                    data = json.loads(content.decode('utf-8'))
-                    self.log(f"下载失败: {data.get('error', '未知错误')}")
+            if object_path:
+                self.log(f"使用本地缓存: {plugin_name}")
+            else:
+                fetched = self._fetch(plugin_name)
+                if not fetched:
                     return False
-                
-                self.log(f"下载成功，大小: {len(content)} 字节")
-                
-                os.makedirs(self.plugins_dir, exist_ok=True)
-                dest_path = os.path.join(self.plugins_dir, f"{plugin_name}.py")
-                
-                with open(dest_path, 'wb') as f:
-                    f.write(content)
-                
-                self.log(f"插件已保存到: {dest_path}")
-                return True
-                
-        except urllib.error.HTTPError as e:
-            self.log(f"HTTP错误: {e.code} - {e.reason}")
-            return False
-        except urllib.error.URLError as e:
+                object_path, entry = fetched
+                self.log(f"下载成功，大小: {entry['size']} 字节")
+            
+            if expected_sha256 and entry['sha256'] != expected_sha256:
+                self.log(f"插件 {plugin_name} 的哈希与锁文件不一致，未安装")
+                return False
+            
+            dest_path = self._install_file(object_path, plugin_name)
+            self.log(f"插件已保存到: {dest_path}")
+            return True
+        
+        except (http.client.HTTPException, OSError) as e:
             self.log(f"网络错误: {e}")
             return False
         except Exception as e:
             self.log(f"下载失败: {e}")
             return False
     
-    def search_plugin(self, keyword):
-        self.log(f"搜索插件: {keyword}")
+    def install_plugins(self, plugin_names, use_cache=True, expected=None):
+        # 通过线程池并行下载多个插件; expected 为插件名到 sha256 的映射
+        results = {}
+        expected = expected or {}
+        # 重复的插件名只下载一次, 否则两个线程会写同一个 .part 文件
+        plugin_names = list(dict.fromkeys(plugin_names))
+        workers = max(1, min(MAX_WORKERS, len(plugin_names)))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    name: executor.submit(self.download_plugin, name, use_cache, expected.get(name))
+                    for name in plugin_names
+                }
+                for name, future in futures.items():
+                    results[name] = future.result()
+        finally:
+            self.pool.close()
+            self._save_cache_index()
+        return results
+    
+    # 本地插件索引: cache/packages.json, 过期后用条件请求 (ETag / If-Modified-Since) 刷新
+    def _load_package_index(self):
+        try:
+            with open(self._cache_path('packages.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_package_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._cache_path('packages.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self._cache_path('packages.json'))
+    
+    def update_index(self, force=False):
+        index = self._load_package_index()
+        if index and not force and time.time() - index.get('fetched_at', 0) < INDEX_TTL:
+            return index
+        
+        headers = {}
+        if index:
+            if index.get('etag'):
+                headers['If-None-Match'] = index['etag']
+            if index.get('last_modified'):
+                headers['If-Modified-Since'] = index['last_modified']
         
         try:
-            req = urllib.request.Request(self.api_url + "?action=list&search=" + urllib.parse.quote(keyword))
-            req.add_header('User-Agent', 'SCL-Plugin-Downloader/1.0')
+            response = self.pool.get(self.api_url + "?action=list", headers)
+            body = response.read()
             
-            with urllib.request.urlopen(req, timeout=30) as response:
-                if response.status != 200:
-                    self.log(f"搜索失败: HTTP {response.status}")
-                    return []
-                
-                data = json.loads(response.read().decode('utf-8'))
-                
-                if data.get('success'):
-                    packages = data.get('packages', [])
-                    self.log(f"找到 {len(packages)} 个匹配的插件")
-                    return packages
-                else:
-                    self.log(f"搜索失败: {data.get('error', '未知错误')}")
-                    return []
-                    
-        except Exception as e:
-            self.log(f"搜索失败: {e}")
+            if response.status == 304 and index:
+                index['fetched_at'] = time.time()
+                self._save_package_index(index)
+                return index
+            
+            if response.status != 200:
+                raise http.client.HTTPException(f"HTTP {response.status}")
+            
+            data = json.loads(body.decode('utf-8'))
+            if not data.get('success'):
+                raise http.client.HTTPException(data.get('error', '未知错误'))
+            
+            index = {
+                'fetched_at': time.time(),
+                'etag': response.getheader('ETag'),
+                'last_modified': response.getheader('Last-Modified'),
+                'packages': data.get('packages', []),
+            }
+            self._save_package_index(index)
+            self.log(f"插件索引已更新，共 {len(index['packages'])} 个插件")
+            return index
+        
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            # 离线时退回到本地索引，即使已经过期
+            if index:
+                self.log(f"无法刷新插件索引 ({e})，使用本地缓存")
+                return index
+            self.log(f"获取插件索引失败: {e}")
+            return None
+        finally:
+            self.pool.close()
+    
+    def search_plugin(self, keyword):
+        self.log(f"搜索插件: {keyword}")
+        
+        index = self.update_index()
+        if index is None:
             return []
+        
+        if self.search_index is None or self.search_index.packages is not index['packages']:
+            self.search_index = PackageIndex(index['packages'])
+        
+        packages = self.search_index.search(keyword)
+        self.log(f"找到 {len(packages)} 个匹配的插件")
+        return packages
+    
+    # 锁文件: 记录项目用到的插件 (含依赖) 的版本和 sha256
+    def _dependencies(self, plugin_name, manifest, packages):
+        deps = list(manifest.get(plugin_name)['requires']) if manifest.get(plugin_name) else []
+        declared = packages.get(plugin_name, {}).get('dependencies') or []
+        if isinstance(declared, str):
+            declared = [name.strip() for name in declared.split(',')]
+        deps.extend(name for name in declared if name)
+        return deps
+    
+    def lock(self, script_files, lock_path=LOCKFILE_NAME):
+        imports = set()
+        for script_file in script_files:
+            with open(script_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('simp{') and line.endswith('}'):
+                        imports.add(line[5:-1].strip())
+        
+        index = self.update_index()
+        packages = {pkg['name']: pkg for pkg in (index or {}).get('packages', [])}
+        manifest = PluginManifest(self.plugins_dir)
+        
+        # 广度优先解析依赖，缺失的插件先并行下载
+        resolved = {}
+        pending = sorted(imports)
+        while pending:
+            missing = [name for name in pending if manifest.get(name) is None]
+            if missing:
+                self.install_plugins(missing)
+            next_pending = []
+            for name in pending:
+                entry = manifest.get(name)
+                if entry is None:
+                    self.log(f"无法解析插件: {name}")
+                    return None
+                resolved[name] = {
+                    'version': packages.get(name, {}).get('version'),
+                    'sha256': entry['sha256'],
+                }
+                for dep in self._dependencies(name, manifest, packages):
+                    if dep not in resolved and dep not in pending and dep not in next_pending:
+                        next_pending.append(dep)
+            pending = next_pending
+        
+        lock = {'version': 1, 'plugins': resolved}
+        save_lockfile(lock, lock_path)
+        self.log(f"已写入 {lock_path}，共 {len(resolved)} 个插件")
+        return lock
+    
+    def sync(self, lock_path=LOCKFILE_NAME):
+        try:
+            lock = load_lockfile(lock_path)
+        except ValueError as e:
+            self.log(f"锁文件无效: {e}，请重新运行 sdp lock")
+            return False
+        if lock is None:
+            self.log(f"未找到锁文件 {lock_path}，请先运行 sdp lock")
+            return False
+        
+        manifest = PluginManifest(self.plugins_dir)
+        expected = {}
+        for name, locked in lock.get('plugins', {}).items():
+            entry = manifest.get(name)
+            if entry is None or entry['sha256'] != locked.get('sha256'):
+                expected[name] = locked.get('sha256')
+        
+        if not expected:
+            self.log("所有插件均与锁文件一致")
+            return True
+        
+        results = self.install_plugins(sorted(expected), expected=expected)
+        return all(results.values())
     
     def list_plugins(self):
         self.log("本地插件列表:")
@@ -87,39 +522,71 @@ class SCLPluginDownloader:
             self.log("插件目录不存在")
             return
         
+        # 元数据来自静态分析的清单缓存，不会执行插件代码
+        entries = PluginManifest(self.plugins_dir).refresh()
         plugins = []
-        for file in os.listdir(self.plugins_dir):
-            if file.endswith('.py') and file != '__init__.py':
-                plugin_name = file[:-3]
-                plugins.append(plugin_name)
-                self.log(f"  - {plugin_name}")
+        for plugin_name in sorted(entries):
+            entry = entries[plugin_name]
+            plugins.append(plugin_name)
+            version = entry.get('version') or '-'
+            keywords = ', '.join(entry['keywords'])
+            self.log(f"  - {plugin_name:<16} {version:<8} {entry['size']:>8} 字节  关键字: {keywords}")
         
         return plugins
+    
+    def plugin_info(self, plugin_name):
+        entry = PluginManifest(self.plugins_dir).get(plugin_name)
+        if entry is None:
+            self.log(f"未安装插件: {plugin_name}")
+            return None
+        
+        self.log(f"名称: {plugin_name}")
+        self.log(f"描述: {entry.get('description') or '-'}")
+        self.log(f"版本: {entry.get('version') or '-'}")
+        self.log(f"类名: {entry.get('class_name') or '-'}")
+        self.log(f"文件: {entry['file']} ({entry['size']} 字节)")
+        self.log(f"关键字: {', '.join(entry['keywords']) or '-'}")
+        self.log(f"语句: {', '.join(entry['statements']) or '-'}")
+        self.log(f"依赖: {', '.join(entry['requires']) or '-'}")
+        self.log(f"SHA256: {entry['sha256']}")
+        if entry.get('error'):
+            self.log(f"警告: {entry['error']}")
+        return entry
+
+def print_usage():
+    print("SCL Plugin Downloader (SDP)")
+    print("用法:")
+    print("  sdp <插件名>          - 下载插件")
+    print("  sdp install <插件名>...  - 并行下载多个插件 (--no-cache 跳过本地缓存)")
+    print("  sdp lock [文件.scl...]  - 解析脚本用到的插件并写入 scl.lock")
+    print("  sdp sync              - 按 scl.lock 并行安装插件")
+    print("  sdp search <关键词>    - 搜索插件 (使用本地索引)")
+    print("  sdp update            - 刷新本地插件索引")
+    print("  sdp list              - 列出本地插件")
+    print("  sdp info <插件名>      - 显示插件的关键字、语句和大小")
+    print("  sdp help              - 显示帮助信息")
 
 def main():
     if len(sys.argv) < 2:
-        print("SCL Plugin Downloader (SDP)")
-        print("用法:")
-        print("  sdp <插件名>          - 下载插件")
-        print("  sdp search <关键词>    - 搜索插件")
-        print("  sdp list              - 列出本地插件")
-        print("  sdp help              - 显示帮助信息")
+        print_usage()
         return
     
     command = sys.argv[1].lower()
     downloader = SCLPluginDownloader()
     
     if command == 'help':
-        print("SCL Plugin Downloader (SDP)")
-        print("用法:")
-        print("  sdp <插件名>          - 下载插件")
-        print("  sdp search <关键词>    - 搜索插件")
-        print("  sdp list              - 列出本地插件")
-        print("  sdp help              - 显示帮助信息")
+        print_usage()
     
     elif command == 'list':
         downloader.list_plugins()
     
+    elif command == 'info':
+        if len(sys.argv) < 3:
+            downloader.log("请提供插件名")
+            return
+        if downloader.plugin_info(sys.argv[2]) is None:
+            sys.exit(1)
+    
     elif command == 'search':
         if len(sys.argv) < 3:
             downloader.log("请提供搜索关键词")
@@ -140,9 +607,44 @@ def main():
         else:
             print("未找到匹配的插件")
     
+    elif command == 'lock':
+        script_files = sys.argv[2:]
+        if not script_files:
+            for root, dirs, files in os.walk('.'):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                script_files.extend(os.path.join(root, f) for f in files if f.endswith('.scl'))
+        if downloader.lock(sorted(script_files)) is None:
+            sys.exit(1)
+    
+    elif command == 'sync':
+        if not downloader.sync():
+            sys.exit(1)
+    
+    elif command == 'update':
+        if downloader.update_index(force=True) is None:
+            sys.exit(1)
+    
+    elif command == 'install':
+        args = sys.argv[2:]
+        use_cache = '--no-cache' not in args
+        plugin_names = [arg for arg in args if not arg.startswith('--')]
+        if not plugin_names:
+            downloader.log("请提供插件名")
+            return
+        results = downloader.install_plugins(plugin_names, use_cache)
+        
+        print()
+        for plugin_name, ok in results.items():
+            if ok:
+                print(f"插件 {plugin_name} 下载成功！ 使用方法: simp{{{plugin_name}}}")
+            else:
+                print(f"插件 {plugin_name} 下载失败！")
+        if not all(results.values()):
+            sys.exit(1)
+    
     else:
         plugin_name = command
-        if downloader.download_plugin(plugin_name):
+        if downloader.install_plugins([plugin_name])[plugin_name]:
             print(f"\n插件 {plugin_name} 下载成功！")
             print(f"使用方法: simp{{{plugin_name}}}")
         else:
@@ -7,6 +7,8 @@ backend_module = Extension(
     sources=['src/scl_backend.cpp'],
     language='c++',
     extra_compile_args=['/std:c++11'] if 'win32' in sys.platform else ['-std=c++11'],
+    # Fall back to scl_pybackend when no compiler is available
+    optional=True,
 )
 
 setup(
@@ -14,9 +16,7 @@ setup(
     version='1.0.0',
     description='SunsetCodeLang - A console programming language',
     ext_modules=[backend_module],
-    py_modules=['scl'],
-    packages=['src'],
-    package_dir={'src': 'src'},
+    py_modules=['scl', 'scl_lexer', 'scl_plugins', 'scl_runner', 'scl_fileview', 'scl_diagnostics', 'scl_pybackend', 'scl_compiler', 'scl_types', 'scl_debugger'],
     entry_points={
         'console_scripts': [
             'scl = scl:main',
@@ -0,0 +1,351 @@
+// SunsetCodeLang (SCL) native backend
+// C++ fast paths for the tokenizer and core statement dispatch.
+// scl_pybackend.py is the pure-Python reference implementation; both must
+// produce identical results (see tests/test_backend.py).
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+static PyObject *KIND_STRING;
+static PyObject *KIND_NUMBER;
+static PyObject *KIND_IDENTIFIER;
+static PyObject *KIND_SEPARATOR;
+static PyObject *KIND_ASSIGN;
+static PyObject *KIND_OPERATOR;
+static PyObject *KIND_PAREN;
+static PyObject *KIND_COMMENT;
+static PyObject *KIND_UNKNOWN;
+static PyObject *STMT_ASSIGN;
+static PyObject *STMT_PRINT;
+static PyObject *STR_VARIABLES;
+static PyObject *STR_PLUGINS;
+static PyObject *STR_BASIC;
+static PyObject *STR_DISPATCH;
+
+static inline bool is_operator_char(Py_UCS4 c)
+{
+    switch (c) {
+    case '+': case '-': case '*': case '/': case '=':
+    case '<': case '>': case '!': case '&': case '|':
+        return true;
+    default:
+        return false;
+    }
+}
+
+static inline bool is_paren_char(Py_UCS4 c)
+{
+    switch (c) {
+    case '(': case ')': case '[': case ']': case '{': case '}':
+        return true;
+    default:
+        return false;
+    }
+}
+
+static inline bool is_word_char(Py_UCS4 c)
+{
+    return c == '_' || Py_UNICODE_ISALNUM(c);
+}
+
+// Append (kind, code[start:end]) to tokens; returns -1 on error
+static int append_token(PyObject *tokens, PyObject *kind, PyObject *code, Py_ssize_t start, Py_ssize_t end)
+{
+    PyObject *value = PyUnicode_Substring(code, start, end);
+    if (value == NULL) {
+        return -1;
+    }
+    PyObject *token = PyTuple_Pack(2, kind, value);
+    Py_DECREF(value);
+    if (token == NULL) {
+        return -1;
+    }
+    int result = PyList_Append(tokens, token);
+    Py_DECREF(token);
+    return result;
+}
+
+// tokenize(code) -> list of (kind, value) tuples, identical to scl_lexer.tokenize
+static PyObject *backend_tokenize(PyObject *self, PyObject *arg)
+{
+    if (!PyUnicode_Check(arg)) {
+        PyErr_SetString(PyExc_TypeError, "tokenize() argument must be str");
+        return NULL;
+    }
+
+    PyObject *code = PyObject_CallMethod(arg, "strip", NULL);
+    if (code == NULL) {
+        return NULL;
+    }
+
+    const int kind = PyUnicode_KIND(code);
+    const void *data = PyUnicode_DATA(code);
+    const Py_ssize_t n = PyUnicode_GET_LENGTH(code);
+
+    PyObject *tokens = PyList_New(0);
+    if (tokens == NULL) {
+        Py_DECREF(code);
+        return NULL;
+    }
+
+    Py_ssize_t i = 0;
+    while (i < n) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        PyObject *token_kind;
+        Py_ssize_t start = i;
+        Py_ssize_t end;
+        Py_ssize_t j;
+
+        if (Py_UNICODE_ISSPACE(c)) {
+            i++;
+            continue;
+        }
+
+        if (c == '"') {
+            // String literal; an unterminated string runs to the end
+            j = i + 1;
+            while (j < n && PyUnicode_READ(kind, data, j) != '"') {
+                j++;
+            }
+            token_kind = KIND_STRING;
+            start = i + 1;
+            end = j;
+            i = j < n ? j + 1 : n;
+        }
+        else if (Py_UNICODE_ISDECIMAL(c)) {
+            j = i + 1;
+            while (j < n) {
+                Py_UCS4 d = PyUnicode_READ(kind, data, j);
+                if (!Py_UNICODE_ISDECIMAL(d) && d != '.') {
+                    break;
+                }
+                j++;
+            }
+            token_kind = KIND_NUMBER;
+            end = i = j;
+        }
+        else if (is_word_char(c)) {
+            j = i + 1;
+            while (j < n && is_word_char(PyUnicode_READ(kind, data, j))) {
+                j++;
+            }
+            token_kind = KIND_IDENTIFIER;
+            end = i = j;
+        }
+        else if (c == '|') {
+            token_kind = KIND_SEPARATOR;
+            end = ++i;
+        }
+        else if (c == ':') {
+            token_kind = KIND_ASSIGN;
+            end = ++i;
+        }
+        else if (is_operator_char(c)) {
+            j = i + 1;
+            while (j < n && is_operator_char(PyUnicode_READ(kind, data, j))) {
+                j++;
+            }
+            token_kind = KIND_OPERATOR;
+            end = i = j;
+        }
+        else if (is_paren_char(c)) {
+            token_kind = KIND_PAREN;
+            end = ++i;
+        }
+        else if (c == '#') {
+            j = i + 1;
+            while (j < n && PyUnicode_READ(kind, data, j) != '\n') {
+                j++;
+            }
+            token_kind = KIND_COMMENT;
+            end = i = j;
+        }
+        else {
+            token_kind = KIND_UNKNOWN;
+            end = ++i;
+        }
+
+        if (append_token(tokens, token_kind, code, start, end) < 0) {
+            Py_DECREF(tokens);
+            Py_DECREF(code);
+            return NULL;
+        }
+    }
+
+    Py_DECREF(code);
+    return tokens;
+}
+
+// Evaluate a literal or variable token like SCLInterpreter.evaluate_expression
+static PyObject *evaluate_expression(PyObject *variables, PyObject *expr)
+{
+    if (!PyTuple_Check(expr) || PyTuple_GET_SIZE(expr) < 2) {
+        return PyLong_FromLong(0);
+    }
+    PyObject *kind = PyTuple_GET_ITEM(expr, 0);
+    PyObject *value = PyTuple_GET_ITEM(expr, 1);
+
+    if (PyUnicode_Check(kind) && PyUnicode_Compare(kind, KIND_STRING) == 0) {
+        Py_INCREF(value);
+        return value;
+    }
+    if (PyUnicode_Check(kind) && PyUnicode_Compare(kind, KIND_NUMBER) == 0) {
+        PyObject *result = NULL;
+        if (PyUnicode_Check(value)) {
+            if (PyUnicode_FindChar(value, '.', 0, PyUnicode_GET_LENGTH(value), 1) >= 0) {
+                result = PyFloat_FromString(value);
+            }
+            else {
+                result = PyLong_FromUnicodeObject(value, 10);
+            }
+        }
+        if (result == NULL) {
+            PyErr_Clear();
+            result = PyLong_FromLong(0);
+        }
+        return result;
+    }
+    if (PyUnicode_Check(kind) && PyUnicode_Compare(kind, KIND_IDENTIFIER) == 0) {
+        PyObject *zero = PyLong_FromLong(0);
+        if (zero == NULL) {
+            return NULL;
+        }
+        PyObject *result = PyObject_CallMethod(variables, "get", "OO", value, zero);
+        Py_DECREF(zero);
+        return result;
+    }
+    return PyLong_FromLong(0);
+}
+
+// Run ASSIGN or PRINT natively; returns 1 if handled, 0 if not, -1 on error
+static int execute_core(PyObject *interpreter, PyObject *stmt)
+{
+    if (!PyTuple_Check(stmt) || PyTuple_GET_SIZE(stmt) < 2) {
+        return 0;
+    }
+    PyObject *kind = PyTuple_GET_ITEM(stmt, 0);
+    if (!PyUnicode_Check(kind)) {
+        return 0;
+    }
+    bool is_assign = PyTuple_GET_SIZE(stmt) == 3 && PyUnicode_Compare(kind, STMT_ASSIGN) == 0;
+    bool is_print = PyTuple_GET_SIZE(stmt) == 2 && PyUnicode_Compare(kind, STMT_PRINT) == 0;
+    if (!is_assign && !is_print) {
+        return 0;
+    }
+
+    // Core statements come from the basic plugin; without it, defer to plugins
+    PyObject *plugins = PyObject_GetAttr(interpreter, STR_PLUGINS);
+    if (plugins == NULL) {
+        return -1;
+    }
+    int has_basic = PySequence_Contains(plugins, STR_BASIC);
+    Py_DECREF(plugins);
+    if (has_basic <= 0) {
+        return has_basic;
+    }
+
+    PyObject *variables = PyObject_GetAttr(interpreter, STR_VARIABLES);
+    if (variables == NULL) {
+        return -1;
+    }
+
+    int result = 1;
+    PyObject *value = evaluate_expression(variables, PyTuple_GET_ITEM(stmt, is_assign ? 2 : 1));
+    if (value == NULL) {
+        result = -1;
+    }
+    else if (is_assign) {
+        if (PyObject_SetItem(variables, PyTuple_GET_ITEM(stmt, 1), value) < 0) {
+            result = -1;
+        }
+    }
+    else {
+        PyObject *out = PySys_GetObject("stdout");
+        if (out == NULL || out == Py_None) {
+            PyErr_SetString(PyExc_RuntimeError, "lost sys.stdout");
+            result = -1;
+        }
+        else if (PyFile_WriteObject(value, out, Py_PRINT_RAW) < 0 || PyFile_WriteString("\n", out) < 0) {
+            result = -1;
+        }
+    }
+
+    Py_XDECREF(value);
+    Py_DECREF(variables);
+    return result;
+}
+
+// execute_statement(interpreter, stmt) -> bool
+static PyObject *backend_execute_statement(PyObject *self, PyObject *args)
+{
+    PyObject *interpreter;
+    PyObject *stmt;
+    if (!PyArg_ParseTuple(args, "OO:execute_statement", &interpreter, &stmt)) {
+        return NULL;
+    }
+
+    int handled = execute_core(interpreter, stmt);
+    if (handled < 0) {
+        return NULL;
+    }
+    if (handled) {
+        Py_RETURN_TRUE;
+    }
+    return PyObject_CallMethodOneArg(interpreter, STR_DISPATCH, stmt);
+}
+
+static PyMethodDef backend_methods[] = {
+    {"tokenize", backend_tokenize, METH_O,
+     "Tokenize SCL code into (kind, value) tuples"},
+    {"execute_statement", backend_execute_statement, METH_VARARGS,
+     "Execute a statement, running core statements natively"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef backend_module = {
+    PyModuleDef_HEAD_INIT,
+    "scl_backend",
+    "SunsetCodeLang native backend",
+    -1,
+    backend_methods
+};
+
+static PyObject *intern(const char *s)
+{
+    return PyUnicode_InternFromString(s);
+}
+
+PyMODINIT_FUNC PyInit_scl_backend(void)
+{
+    KIND_STRING = intern("STRING");
+    KIND_NUMBER = intern("NUMBER");
+    KIND_IDENTIFIER = intern("IDENTIFIER");
+    KIND_SEPARATOR = intern("SEPARATOR");
+    KIND_ASSIGN = intern("ASSIGN");
+    KIND_OPERATOR = intern("OPERATOR");
+    KIND_PAREN = intern("PAREN");
+    KIND_COMMENT = intern("COMMENT");
+    KIND_UNKNOWN = intern("UNKNOWN");
+    STMT_ASSIGN = intern("ASSIGN");
+    STMT_PRINT = intern("PRINT");
+    STR_VARIABLES = intern("variables");
+    STR_PLUGINS = intern("plugins");
+    STR_BASIC = intern("basic");
+    STR_DISPATCH = intern("dispatch_statement");
+    if (!KIND_STRING || !KIND_NUMBER || !KIND_IDENTIFIER || !KIND_SEPARATOR ||
+        !KIND_ASSIGN || !KIND_OPERATOR || !KIND_PAREN || !KIND_COMMENT ||
+        !KIND_UNKNOWN || !STMT_ASSIGN || !STMT_PRINT || !STR_VARIABLES ||
+        !STR_PLUGINS || !STR_BASIC || !STR_DISPATCH) {
+        return NULL;
+    }
+
+    PyObject *module = PyModule_Create(&backend_module);
+    if (module == NULL) {
+        return NULL;
+    }
+    if (PyModule_AddStringConstant(module, "NAME", "native") < 0) {
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
+}
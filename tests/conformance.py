@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+SCL conformance runner
+
+Runs every program in tests/conformance under each engine and backend,
+in process and in parallel, and compares its stdout with the golden
+<name>.out file next to it.
+
+    python tests/conformance.py            report divergences
+    python tests/conformance.py --update   rewrite the golden files
+"""
+
+import os
+import re
+import sys
+import asyncio
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'conformance')
+sys.path.insert(0, ROOT)
+
+import scl
+import scl_pybackend
+from scl_compiler import SCLCompiler
+
+try:
+    import scl_backend
+except ImportError:
+    scl_backend = None
+
+# Clock injected into the time plugin so golden output is stable
+FIXED_TIME = time.struct_time((2024, 1, 2, 3, 4, 5, 1, 2, 0))
+
+# Measured durations, as time : bench prints them
+DURATION_REGEX = re.compile(r'\b\d+(?:\.\d+)? (?:ns|us|ms|s)\b')
+
+class VirtualClock:
+    """Monotonic timer and sleeps for the time plugin, kept per thread
+    
+    Time only advances when a program sleeps, and sleeping returns at
+    once, so timers fire in a fixed order. Work that does not sleep
+    takes no time, so measured durations are normalised in the output.
+    """
+    
+    def __init__(self):
+        self.local = threading.local()
+    
+    def timer(self):
+        return getattr(self.local, 'now', 0)
+    
+    def sleep(self, seconds):
+        self.local.now = self.timer() + round(seconds * 1e9)
+    
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+        await asyncio.sleep(0)
+    
+    def install(self, interpreter):
+        interpreter.timer = self.timer
+        interpreter.sleep = self.sleep
+        interpreter.async_sleep = self.async_sleep
+
+VIRTUAL_CLOCK = VirtualClock()
+
+def run_interpreter(interpreter, code):
+    return interpreter.execute(code)
+
+def run_program(interpreter, code):
+    return interpreter.compile(code).run(interpreter.new_context())
+
+def run_async(interpreter, code):
+    program = interpreter.compile(code, asynchronous=True)
+    return asyncio.run(program.run(interpreter.new_context()))
+
+def run_compiled(interpreter, code):
+    return SCLCompiler(interpreter).compile(code).run()
+
+ENGINES = {
+    'interp': run_interpreter,
+    'closure': run_program,
+    'async': run_async,
+    'py': run_compiled,
+}
+
+BACKENDS = {'python': scl_pybackend}
+if scl_backend is not None:
+    BACKENDS['native'] = scl_backend
+
+class ThreadLocalStream:
+    """Stream proxy sending each thread's writes to its own buffer
+    
+    Installed as sys.stdout/sys.stderr so that programs running on
+    different threads capture their output separately.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        parts = getattr(self.local, 'parts', None)
+        if parts is None:
+            return self.stream.write(text)
+        parts.append(text)
+        return len(text)
+    
+    def flush(self):
+        if getattr(self.local, 'parts', None) is None:
+            self.stream.flush()
+    
+    def begin(self):
+        self.local.parts = []
+    
+    def end(self):
+        parts, self.local.parts = self.local.parts, None
+        return ''.join(parts)
+
+def load_corpus():
+    """Return [(name, code, golden)] for every program; golden is None if missing"""
+    corpus = []
+    for file in sorted(os.listdir(CORPUS_DIR)):
+        if not file.endswith('.scl'):
+            continue
+        name = file[:-4]
+        with open(os.path.join(CORPUS_DIR, file), 'r', encoding='utf-8') as f:
+            code = f.read()
+        golden = None
+        golden_file = os.path.join(CORPUS_DIR, name + '.out')
+        if os.path.exists(golden_file):
+            with open(golden_file, 'r', encoding='utf-8') as f:
+                golden = f.read()
+        corpus.append((name, code, golden))
+    return corpus
+
+def run_case(code, engine, backend, stdout, stderr):
+    """Run one program and return its stdout"""
+    interpreter = scl.SCLInterpreter(BACKENDS[backend])
+    interpreter.clock = lambda: FIXED_TIME
+    VIRTUAL_CLOCK.install(interpreter)
+    interpreter.headless = True
+    stdout.begin()
+    stderr.begin()
+    try:
+        ENGINES[engine](interpreter, code)
+    except Exception as e:
+        print(f"Harness error: {e!r}")
+    finally:
+        stderr.end()
+        output = stdout.end()
+    return normalize(output)
+
+def normalize(output):
+    """Replace measured durations, which depend on the clock, with <duration>"""
+    return DURATION_REGEX.sub('<duration>', output)
+
+def run_corpus(corpus=None, workers=None):
+    """Run the corpus under every engine and backend
+    
+    Returns {(name, engine, backend): stdout}. Must be called from the
+    plugins' parent directory, as scl is.
+    """
+    corpus = load_corpus() if corpus is None else corpus
+    cases = [(name, code, engine, backend)
+             for name, code, _ in corpus for engine in ENGINES for backend in BACKENDS]
+    
+    saved = sys.stdout, sys.stderr
+    stdout, stderr = ThreadLocalStream(sys.stdout), ThreadLocalStream(sys.stderr)
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            outputs = executor.map(lambda case: run_case(case[1], case[2], case[3], stdout, stderr), cases)
+            return {(name, engine, backend): output
+                    for (name, _, engine, backend), output in zip(cases, outputs)}
+    finally:
+        sys.stdout, sys.stderr = saved
+
+def divergences(corpus, results):
+    """Return a list of (name, engine, backend, expected, actual) mismatches"""
+    problems = []
+    for name, _, golden in corpus:
+        for engine in ENGINES:
+            for backend in BACKENDS:
+                actual = results[(name, engine, backend)]
+                if actual != golden:
+                    problems.append((name, engine, backend, golden, actual))
+    return problems
+
+def main():
+    os.chdir(ROOT)
+    corpus = load_corpus()
+    results = run_corpus(corpus)
+    
+    if '--update' in sys.argv[1:]:
+        # The tree-walking interpreter on the Python backend is the reference
+        for name, _, _ in corpus:
+            with open(os.path.join(CORPUS_DIR, name + '.out'), 'w', encoding='utf-8') as f:
+                f.write(results[(name, 'interp', 'python')])
+        print(f"Updated {len(corpus)} golden files")
+        return
+    
+    problems = divergences(corpus, results)
+    for name, engine, backend, expected, actual in problems:
+        print(f"DIVERGENCE {name} [engine={engine}, backend={backend}]")
+        print(f"  expected: {expected!r}")
+        print(f"  actual:   {actual!r}")
+    print(f"{len(results)} runs, {len(problems)} divergences "
+          f"(engines: {', '.join(ENGINES)}; backends: {', '.join(BACKENDS)})")
+    sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
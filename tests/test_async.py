@@ -0,0 +1,48 @@
+"""asyncio mode: spawned tasks and programs overlap their waits on one loop"""
+
+import asyncio
+import time
+
+import scl
+from conftest import ROOT
+
+SLEEPY_TASKS = '''simp{basic}
+simp{time}
+sde slow : time : sleep : 0.3 sout : "slow" end
+sde fast : time : sleep : 0.1 sout : "fast" end
+sde spawn<slow>
+sde spawn<fast>
+sde spawn<slow>
+sde spawn<fast>
+sout : "spawned"
+'''
+
+def run(interpreter, code):
+    program = interpreter.compile(code, asynchronous=True)
+    return asyncio.run(program.run(interpreter.new_context()))
+
+def test_tasks_overlap_their_sleeps(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    start = time.perf_counter()
+    assert run(scl.SCLInterpreter(), SLEEPY_TASKS)
+    elapsed = time.perf_counter() - start
+    assert capsys.readouterr().out == 'spawned\nfast\nfast\nslow\nslow\n'
+    assert elapsed < 0.6
+
+def test_programs_share_one_event_loop(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    program = interpreter.compile('simp{basic}\nsimp{time}\ntime : sleep : 0.2\nsout : "done"\n', asynchronous=True)
+    
+    async def main():
+        return await asyncio.gather(*[program.run(interpreter.new_context()) for _ in range(10)])
+    
+    start = time.perf_counter()
+    assert asyncio.run(main()) == [True] * 10
+    assert time.perf_counter() - start < 1.0
+    assert capsys.readouterr().out == 'done\n' * 10
+
+def test_task_errors_are_reported(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    assert run(scl.SCLInterpreter(), 'simp{basic}\nf : 1\nsde spawn<f>\nsout : "main"\n')
+    assert capsys.readouterr().out.startswith('main\nError in task f: ')
@@ -0,0 +1,59 @@
+"""Differential tests: the native scl_backend against scl_pybackend"""
+
+import random
+
+import pytest
+
+import scl
+import scl_pybackend
+from conftest import ROOT
+
+try:
+    import scl_backend
+except ImportError:
+    scl_backend = None
+
+BACKENDS = [pytest.param(scl_pybackend, id='python')]
+BACKENDS.append(pytest.param(scl_backend, id='native', marks=pytest.mark.skipif(
+    scl_backend is None, reason='scl_backend extension not built')))
+
+ALPHABET = 'ab_Z9 0.1"|:+-*/=<>!&()[]{}#\n\t é٣²$%'
+
+PROGRAMS = [
+    'simp{basic}\nset a | a : 5\nsout : a\nsout : "Hello"\n',
+    'simp{basic}\nb : 2.5\nsout : b\nc : 1.2.3\nsout : c\nsout : missing\n',
+    'simp{basic}\nsde f : sout : "in f" x : 3 sout : x end\nsde run<f>\nsout : x\n',
+    'simp{basic}\nset a | a : 1\nsif a | sout : "yes"\n',
+    'simp{time}\nsout : "no basic"\n',
+]
+
+def random_sources(count, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_tokenize_matches_lexer(backend):
+    for source in random_sources(5000):
+        assert backend.tokenize(source) == scl_pybackend.tokenize(source), source
+
+def run_program(backend, code, capsys):
+    interpreter = scl.SCLInterpreter(backend)
+    ok = interpreter.execute(code)
+    return ok, capsys.readouterr().out, interpreter.variables
+
+@pytest.mark.parametrize('code', PROGRAMS)
+def test_backends_agree(code, monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    expected = run_program(scl_pybackend, code, capsys)
+    if scl_backend is None:
+        pytest.skip('scl_backend extension not built')
+    assert run_program(scl_backend, code, capsys) == expected
+
+def test_core_statements_fall_back_without_basic(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    for backend in (scl_pybackend, scl_backend):
+        if backend is None:
+            continue
+        interpreter = scl.SCLInterpreter()
+        assert backend.execute_statement(interpreter, ('PRINT', ('STRING', 'x'))) is False
@@ -0,0 +1,68 @@
+"""Differential tests: the Python transpiler backend against the interpreter"""
+
+import pytest
+
+import scl
+from conftest import ROOT
+from scl_compiler import SCLCompiler
+
+PROGRAMS = [
+    'simp{basic}\nset a | a : 5\nsout : a\nsout : "Hello"\n',
+    'simp{basic}\nb : 2.5\nsout : b\nc : 1.2.3\nsout : c\nsout : missing\n',
+    'simp{basic}\nsde f : sout : "in f" x : 3 sout : x end\nsde run<f>\nsout : x\n',
+    'simp{basic}\nset a | a : 1\nsif a | sout : "yes" b : a\nsif b | sout : b\nsif c | sout : "no"\n',
+    'simp{basic}\nsout : "before"\nsde run<nothing>\nsout : "after"\n',
+    'simp{basic}\nsout : "before"\nthis is not scl\nsout : "after"\n',
+    'simp{basic}\nsout : "before"\nsimp{no_such_plugin}\nsout : "after"\n',
+    'simp{time}\nsout : "no basic"\n',
+    'simp{siew}\nsimp{basic}\nset a | a : 1\nsif a | sout : "basic if"\n',
+    '# comment\n\nsimp{basic}\nsimp{basic}\nsimp{time}\nt : time\nsout : t\n',
+]
+
+def run_interpreter(code, capsys):
+    interpreter = scl.SCLInterpreter()
+    ok = interpreter.execute(code)
+    return ok, capsys.readouterr().out, interpreter.variables
+
+def run_compiled(code, capsys):
+    interpreter = scl.SCLInterpreter()
+    program = SCLCompiler(interpreter).compile(code)
+    ok = program.run()
+    return ok, capsys.readouterr().out, interpreter.variables
+
+@pytest.mark.parametrize('code', PROGRAMS)
+def test_compiled_output_matches_interpreter(code, monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    assert run_compiled(code, capsys) == run_interpreter(code, capsys)
+
+def test_core_statements_are_translated(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    program = SCLCompiler(scl.SCLInterpreter()).compile('simp{basic}\nset a | a : 1\nsif a | sout : a\n')
+    assert '(I)' not in program.source
+    assert "print(V.get('a', 0))" in program.source
+
+def test_siew_blocks_translate_with_siew_semantics(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    compiler = SCLCompiler(interpreter)
+    compiler.compile('simp{siew}\nsimp{basic}\n')
+    compiler.lines = []
+    # Bodies run through siew, which does not execute PRINT
+    body = [('PRINT', ('STRING', 'x')), ('ASSIGN', 'n', ('NUMBER', '0'))]
+    compiler.statement(('IF_ELSE', ('NUMBER', '0'), body, body), 'siew', 0)
+    assert compiler.lines[0] == 'if 0:'
+    assert compiler.lines == ['if 0:', '    pass', 'else:', '    pass']
+
+def test_manifest_lookups_do_not_grow_with_statements(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.load_plugin('basic') and interpreter.load_plugin('time')
+    lookups = []
+    get = interpreter.manifest.get
+    monkeypatch.setattr(interpreter.manifest, 'get', lambda name: lookups.append(name) or get(name))
+    counts = []
+    for repeat in (1, 50):
+        lookups.clear()
+        SCLCompiler(interpreter).compile('simp{basic}\nsimp{time}\n' + 'set a | a : 1\nsout : a\n' * repeat)
+        counts.append(len(lookups))
+    assert counts[0] == counts[1]
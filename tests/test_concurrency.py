@@ -0,0 +1,69 @@
+"""Stress test: many threads sharing one interpreter, its plugins and programs"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import conformance
+import scl
+from conftest import ROOT
+
+THREADS = 16
+REPEATS = 20
+
+def shared_interpreter():
+    interpreter = scl.SCLInterpreter()
+    interpreter.clock = lambda: conformance.FIXED_TIME
+    conformance.VIRTUAL_CLOCK.install(interpreter)
+    interpreter.headless = True
+    return interpreter
+
+def run_captured(jobs, work, threads):
+    """Run work(job) for every job on a thread pool, capturing each job's stdout"""
+    saved = sys.stdout, sys.stderr
+    stdout, stderr = conformance.ThreadLocalStream(sys.stdout), conformance.ThreadLocalStream(sys.stderr)
+    sys.stdout, sys.stderr = stdout, stderr
+    
+    def capture(job):
+        stdout.begin()
+        stderr.begin()
+        try:
+            result = work(job)
+        finally:
+            stderr.end()
+            output = stdout.end()
+        return result, conformance.normalize(output)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(capture, jobs))
+    finally:
+        sys.stdout, sys.stderr = saved
+
+def test_concurrent_runs_match_serial_runs(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    corpus = conformance.load_corpus()
+    interpreter = shared_interpreter()
+    
+    # Compile every program concurrently; plugins are loaded once and shared
+    compiled = run_captured(corpus, lambda case: interpreter.compile(case[1]), THREADS)
+    programs = {name: program for (name, _, _), (program, _) in zip(corpus, compiled)}
+    
+    run = lambda name: programs[name].run(interpreter.new_context())
+    names = [name for name, _, _ in corpus]
+    serial = dict(zip(names, run_captured(names, run, 1)))
+    
+    jobs = names * REPEATS
+    for name, result in zip(jobs, run_captured(jobs, run, THREADS)):
+        assert result == serial[name], name
+    for name, _, golden in corpus:
+        assert serial[name][1] == golden, name
+
+def test_runs_do_not_share_variables(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = shared_interpreter()
+    program = interpreter.compile('simp{basic}\nsout : a\na : 1\nsout : a\n')
+    contexts = [interpreter.new_context() for _ in range(THREADS * 4)]
+    results = run_captured(contexts, program.run, THREADS)
+    assert all(result == (True, '0\n1\n') for result in results)
+    assert all(ctx.variables == {'a': 1} for ctx in contexts)
+    assert interpreter.variables == {}
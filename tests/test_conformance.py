@@ -0,0 +1,48 @@
+"""Run the conformance corpus under every engine and backend"""
+
+import conformance
+import scl
+from conftest import ROOT
+
+COVERED_PLUGINS = ['basic', 'siew', 'time', 'sui']
+
+def statement_kinds(stmts):
+    for stmt in stmts:
+        yield stmt[0]
+        for part in stmt[1:]:
+            if isinstance(part, list) and part and isinstance(part[0], tuple) and isinstance(part[0][0], str):
+                yield from statement_kinds(part)
+
+def test_corpus_has_golden_output():
+    for name, _, golden in conformance.load_corpus():
+        assert golden is not None, f"{name}.scl has no {name}.out"
+
+def test_corpus_covers_plugin_statements(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    seen = set()
+    for _, code, _ in conformance.load_corpus():
+        interpreter = scl.SCLInterpreter()
+        stmts = []
+        for line in code.split('\n'):
+            line = line.strip()
+            if line.startswith('simp{'):
+                interpreter.load_plugin(line[5:-1], quiet=True)
+            elif line and not line.startswith('#'):
+                stmt, _ = interpreter.parse_statement(interpreter.tokenize(line), 0)
+                if stmt:
+                    stmts.append(stmt)
+        seen.update(statement_kinds(stmts))
+    
+    manifest = scl.SCLInterpreter().manifest
+    for plugin in COVERED_PLUGINS:
+        missing = set(manifest.get(plugin)['statements']) - seen
+        assert not missing, f"corpus does not cover {plugin} statements {sorted(missing)}"
+
+def test_engines_and_backends_match_golden(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    corpus = conformance.load_corpus()
+    results = conformance.run_corpus(corpus)
+    problems = conformance.divergences(corpus, results)
+    assert not problems, '\n'.join(
+        f"{name} [engine={engine}, backend={backend}]: expected {expected!r}, got {actual!r}"
+        for name, engine, backend, expected, actual in problems)
@@ -0,0 +1,74 @@
+"""scl --debug: breakpoints, stepping and inspection on instrumented executors"""
+
+import io
+import subprocess
+import sys
+
+import scl
+from conftest import ROOT
+from scl_debugger import Debugger
+
+PROGRAM = '''simp{basic}
+x : 1
+sde f : sout : "in f" y : 2 end
+sde run<f>
+sout : x
+x : 3
+'''
+
+def debug(commands, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    ok = Debugger(interpreter, io.StringIO(commands)).run(PROGRAM)
+    return ok, interpreter
+
+def test_next_steps_over_function_bodies(monkeypatch, capsys):
+    ok, _ = debug('n\nn\nn\np x y\nc\n', monkeypatch)
+    out = capsys.readouterr().out
+    assert ok
+    assert out == ('> line 2: x : 1\n(sdb) > line 3: sde f : sout : "in f" y : 2 end\n'
+                   '(sdb) > line 4: sde run<f>\n(sdb) in f\n> line 5: sout : x\n'
+                   '(sdb) x = 1\ny = 2\n(sdb) 1\n')
+
+def test_step_enters_function_bodies(monkeypatch, capsys):
+    ok, _ = debug('s\ns\ns\ns\nv\nc\n', monkeypatch)
+    out = capsys.readouterr().out
+    assert ok
+    assert '> line 4, in function: PRINT in f\n(sdb) in f\n> line 4, in function: ASSIGN y 2\n' in out
+    assert out.endswith('(sdb) f = <sde function>\nx = 1\n(sdb) 1\n')
+
+def test_step_enters_sif_bodies_and_next_steps_over_them(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    code = 'simp{basic}\nset a | a : 1\nsif a | sout : "yes" b : a\nsout : b\n'
+    assert Debugger(scl.SCLInterpreter(), io.StringIO('s\ns\ns\nc\n')).run(code)
+    assert capsys.readouterr().out == ('> line 2: set a | a : 1\n(sdb) > line 3: sif a | sout : "yes" b : a\n'
+                                       '(sdb) > line 3, in block: PRINT yes\n(sdb) yes\n'
+                                       '> line 3, in block: ASSIGN b a\n(sdb) 1\n')
+    assert Debugger(scl.SCLInterpreter(), io.StringIO('n\nn\nc\n')).run(code)
+    assert 'in block' not in capsys.readouterr().out
+
+def test_breakpoints_stop_only_where_set(monkeypatch, capsys):
+    ok, _ = debug('b 5 6\nc\nl\ncl 6\nc\n', monkeypatch)
+    out = capsys.readouterr().out
+    assert ok
+    assert out.count('> line') == 2
+    assert '> line 5: sout : x\n' in out
+    assert '   5 -> sout : x\n' in out
+
+def test_quit_and_end_of_input_stop_the_program(monkeypatch, capsys):
+    ok, _ = debug('q\n', monkeypatch)
+    assert not ok and capsys.readouterr().out.endswith('Program stopped\n')
+    ok, _ = debug('', monkeypatch)
+    assert not ok
+
+def test_ordinary_runs_are_not_instrumented(monkeypatch, capsys):
+    ok, debugged = debug('c\n', monkeypatch)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.execute(PROGRAM)
+    # The debugger wraps its own interpreter's plugins only
+    assert 'compile_statement' in vars(debugged.plugins['basic'])
+    assert 'compile_statement' not in vars(interpreter.plugins['basic'])
+
+def test_cli_debug_flag():
+    result = subprocess.run([sys.executable, 'scl.py', '--debug', '-'], cwd=ROOT, input='', capture_output=True, text=True)
+    assert result.returncode == 1 and result.stdout.startswith('Usage:')
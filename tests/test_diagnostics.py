@@ -0,0 +1,41 @@
+"""Background syntax checking with the interpreter's parser"""
+
+import shutil
+import time
+
+from conftest import ROOT
+from scl_diagnostics import Diagnostics, DiagnosticsService
+
+def test_valid_lines_have_no_problems(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    assert Diagnostics().check('simp{basic}\n# comment\n\nset a | a : 1\nsout : a\n') == []
+
+def test_invalid_lines_are_reported_with_their_line_numbers(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    checker = Diagnostics()
+    code = 'sout : "before import"\nsimp{basic}\nsout : "ok"\nthis is not scl\n'
+    assert checker.check(code) == [(1, 'Invalid syntax'), (4, 'Invalid syntax')]
+    # Unchanged lines come from the cache and give the same answer
+    assert checker.check(code) == [(1, 'Invalid syntax'), (4, 'Invalid syntax')]
+
+def test_unknown_and_broken_plugins_are_reported_quietly(monkeypatch, tmp_path, capsys):
+    (tmp_path / 'plugins').mkdir()
+    shutil.copy(f'{ROOT}/plugins/basic.py', tmp_path / 'plugins')
+    (tmp_path / 'plugins' / 'broken.py').write_text('VERSION = "1.0"\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    problems = Diagnostics().check('simp{basic}\nsimp{nothing}\nsimp{broken}\nsout : "ok"\n')
+    assert problems == [(2, 'Plugin nothing not found'), (3, 'Failed to load plugin broken')]
+    assert capsys.readouterr().out == ''
+
+def test_service_checks_the_latest_submission(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    service = DiagnosticsService()
+    service.submit('simp{basic}\nbad line\n')
+    deadline = time.monotonic() + 10
+    result = service.results()
+    while result is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+        result = service.results()
+    assert result == [(2, 'Invalid syntax')]
+    assert service.results() is None
@@ -0,0 +1,54 @@
+"""fileio plugin: buffered and memory-mapped reads, batched appends, streamed lines"""
+
+import os
+import shutil
+
+import pytest
+
+import scl
+from conftest import ROOT
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(ROOT, 'plugins'), tmp_path / 'plugins',
+                    ignore=shutil.ignore_patterns('__pycache__', '.manifest.json'))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def run(code):
+    interpreter = scl.SCLInterpreter()
+    return interpreter.execute('simp{basic}\nsimp{fileio}\n' + code), interpreter.variables
+
+def test_write_read_and_delete(workdir):
+    ok, variables = run('file_write : "a.txt" : "héllo"\nfile_read : "a.txt" : s\nfile_delete : "a.txt"\n')
+    assert ok and variables['s'] == 'héllo'
+    assert not (workdir / 'a.txt').exists()
+    (workdir / 'crlf.txt').write_bytes(b'a\r\nb')
+    ok, variables = run('file_read : "crlf.txt" : s\n')
+    assert ok and variables['s'] == 'a\r\nb'
+
+def test_large_files_are_read_through_mmap(workdir):
+    text = 'ünïcode line\n' * 400000
+    (workdir / 'big.txt').write_bytes(text.encode('utf-8'))
+    ok, variables = run('file_read : "big.txt" : s\n')
+    assert ok and variables['s'] == text
+
+def test_lists_are_appended_in_one_batch(workdir):
+    ok, _ = run('list_create : xs : 1 2 3\nfile_append : "out.txt" : xs\nfile_append : "out.txt" : "end"\n')
+    assert ok and (workdir / 'out.txt').read_text() == '1\n2\n3\nend'
+
+def test_file_lines_streams_into_a_function(workdir, capsys):
+    (workdir / 'in.txt').write_text('one\ntwo\r\nthree')
+    ok, variables = run('sde show : sout : line end\nfile_lines : "in.txt" : line : show\n')
+    assert ok and capsys.readouterr().out == 'one\ntwo\nthree\n'
+    ok, _ = run('file_lines : "in.txt" : line : missing\n')
+    assert not ok
+
+def test_dir_list_and_missing_files(workdir, capsys):
+    (workdir / 'd').mkdir()
+    for name in ('b', 'a', 'c'):
+        (workdir / 'd' / name).write_text('')
+    ok, variables = run('path : "d"\ndir_list : path : names\n')
+    assert ok and list(variables['names']) == ['a', 'b', 'c']
+    ok, _ = run('file_read : "nope.txt" : s\n')
+    assert not ok and 'No such file' in capsys.readouterr().out
@@ -0,0 +1,50 @@
+"""LineIndex: lazily indexed line windows over memory-mapped files"""
+
+import pytest
+
+from scl_fileview import LineIndex
+
+@pytest.fixture
+def open_index(tmp_path):
+    indexes = []
+    def open_index(data):
+        path = tmp_path / 'big.scl'
+        path.write_bytes(data)
+        index = LineIndex(str(path))
+        indexes.append(index)
+        return index
+    yield open_index
+    for index in indexes:
+        index.close()
+
+def test_offsets_are_indexed_only_as_far_as_asked(open_index):
+    index = open_index(b''.join(b'line %d\n' % i for i in range(1000)))
+    assert index.lines(0, 3) == ['line 0', 'line 1', 'line 2']
+    assert list(index.offsets) == [0, 7, 14, 21]
+    assert not index.complete
+    # Estimated from the average length of the lines indexed so far
+    assert index.line_count() == index.size // 7
+    assert index.has_line(999) and index.complete
+    assert index.line_count() == 1001
+
+def test_windows_at_the_start_and_end_of_the_file(open_index):
+    index = open_index(b''.join(b'%d\n' % i for i in range(10)))
+    assert index.lines(0, 4) == ['0', '1', '2', '3']
+    assert index.lines(8, 4) == ['8', '9', '']
+    assert index.lines(20, 4) == []
+    assert not index.has_line(11)
+
+def test_crlf_line_endings_are_stripped(open_index):
+    index = open_index(b'simp{basic}\r\nsout : "hi"\r\n')
+    assert index.lines(0, 3) == ['simp{basic}', 'sout : "hi"', '']
+
+def test_last_line_without_a_newline(open_index):
+    index = open_index('a\nsout : "é"'.encode('utf-8'))
+    assert index.lines(0, 5) == ['a', 'sout : "é"']
+    assert index.line_count() == 2
+    assert index.has_line(1) and not index.has_line(2)
+
+def test_empty_file(open_index):
+    index = open_index(b'')
+    assert index.complete and index.line_count() == 1
+    assert index.lines(0, 5) == ['']
@@ -0,0 +1,73 @@
+"""hashing plugin: chunked hashing and base64, parallel file hashing"""
+
+import base64
+import hashlib
+import importlib.util
+import os
+import random
+import shutil
+
+import pytest
+
+import scl
+from conftest import ROOT
+
+spec = importlib.util.spec_from_file_location('hashing_plugin', os.path.join(ROOT, 'plugins', 'hashing.py'))
+hashing = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hashing)
+
+def random_chunks(data, rng):
+    """Split data at random points"""
+    cuts = sorted(rng.sample(range(len(data) + 1), min(len(data) + 1, 6)))
+    return [data[a:b] for a, b in zip([0] + cuts, cuts + [len(data)])]
+
+def test_base64_streams_match_whole_encoding():
+    rng = random.Random(3)
+    for size in range(40):
+        data = bytes(rng.randrange(256) for _ in range(size))
+        encoded = base64.b64encode(data)
+        assert b''.join(hashing.b64encode_chunks(random_chunks(data, rng))) == encoded
+        wrapped = b'\n'.join(encoded[i:i + 7] for i in range(0, len(encoded), 7))
+        assert b''.join(hashing.b64decode_chunks(random_chunks(wrapped, rng))) == data
+
+def test_utf8_split_across_chunks_decodes():
+    data = 'héllo wörld ✓'.encode('utf-8')
+    assert hashing.decode_chunks([data[i:i + 1] for i in range(len(data))]) == 'héllo wörld ✓'
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(ROOT, 'plugins'), tmp_path / 'plugins',
+                    ignore=shutil.ignore_patterns('__pycache__', '.manifest.json'))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def run(code):
+    interpreter = scl.SCLInterpreter()
+    return interpreter.execute('simp{basic}\nsimp{hashing}\n' + code), interpreter.variables
+
+def test_strings_hash_and_encode(workdir, capsys):
+    ok, variables = run('md5 : "abc"\nsha256 : "héllo" : d\nbase64_enc : "héllo" : e\n'
+                        'base64_dec : e : back\nrot13 : "Hello, World" : r\n')
+    assert ok and capsys.readouterr().out == hashlib.md5(b'abc').hexdigest() + '\n'
+    assert variables['d'] == hashlib.sha256('héllo'.encode()).hexdigest()
+    assert variables['e'] == base64.b64encode('héllo'.encode()).decode()
+    assert variables['back'] == 'héllo'
+    assert variables['r'] == 'Uryyb, Jbeyq'
+
+def test_files_hash_in_parallel_and_stream_base64(workdir):
+    rng = random.Random(5)
+    contents = [bytes(rng.randrange(256) for _ in range(rng.randrange(3000))) for _ in range(12)]
+    for i, data in enumerate(contents):
+        (workdir / f'f{i}.bin').write_bytes(data)
+    names = ' '.join(f'"f{i}.bin"' for i in range(12))
+    ok, variables = run(f'list_create : fs : {names}\nsha256 : files : fs : digests\nmd5 : file : "f0.bin" : one\n'
+                        'base64_enc : file : "f1.bin" : "f1.b64"\nbase64_dec : file : "f1.b64" : "f1.out"\n')
+    assert ok
+    assert list(variables['digests']) == [hashlib.sha256(data).hexdigest() for data in contents]
+    assert variables['one'] == hashlib.md5(contents[0]).hexdigest()
+    assert (workdir / 'f1.b64').read_bytes() == base64.b64encode(contents[1])
+    assert (workdir / 'f1.out').read_bytes() == contents[1]
+
+def test_invalid_base64_fails(workdir):
+    ok, _ = run('base64_dec : "@@@@" : x\n')
+    assert not ok
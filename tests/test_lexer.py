@@ -0,0 +1,82 @@
+"""TokenStream: offset-array tokens agree with tokenize() line by line"""
+
+import random
+import sys
+import tracemalloc
+
+import scl
+from conftest import ROOT
+from scl_lexer import scan, scan_file, tokenize
+
+ALPHABET = 'ab_Z9 0.1"|:+-*/=<>!&()[]{}#\n\r\t é$%\u0663\u00a0\u3000\x1c'
+
+def random_sources(count, seed=11):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 60)))
+
+def by_line(source):
+    return [tokenize(line) for line in source.split('\n')]
+
+def test_scan_matches_tokenize():
+    for source in random_sources(5000):
+        assert [list(line) for line in scan(source).lines()] == by_line(source), source
+        assert [list(line) for line in scan(source.encode()).lines()] == by_line(source), source
+
+def test_scan_file_reads_through_mmap(tmp_path):
+    source = 'simp{basic}\nsout : "héllo"\n\nx : 1.5 # done  \n'
+    path = tmp_path / 'program.scl'
+    path.write_text(source, encoding='utf-8')
+    stream = scan_file(str(path))
+    try:
+        assert [list(line) for line in stream.lines()] == by_line(source)
+    finally:
+        stream.close()
+    empty = tmp_path / 'empty.scl'
+    empty.write_text('')
+    assert len(scan_file(str(empty))) == 0
+
+def test_values_are_interned_on_demand():
+    stream = scan('sout : "hi" | sout : "hi"')
+    assert stream.kind(0) == 'IDENTIFIER'
+    assert stream[0][1] is sys.intern('sout')
+    assert stream[2][1] is stream[6][1]
+
+def test_parsers_accept_line_views(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.load_plugin('basic')
+    source = 'x : 3\nsif x | sout : "yes"\nsde f : sout : x end\n'
+    stream = scan(source)
+    for line, tokens in zip(source.split('\n'), stream.lines()):
+        assert interpreter.parse_statement(tokens, 0) == interpreter.parse_statement(tokenize(line), 0)
+
+def test_execute_file_matches_execute(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    source = 'simp{basic}\nx : \u0663\nsout : x\nsde f : sout : "h\u00e9" end\r\nsde run<f>\nbad ?? \n'
+    path = tmp_path / 'program.scl'
+    path.write_bytes(source.encode('utf-8'))
+    assert not scl.SCLInterpreter().execute(source)
+    expected = capsys.readouterr().out
+    assert not scl.SCLInterpreter().execute_file(str(path))
+    assert capsys.readouterr().out == expected
+    assert 'h\u00e9\n' in expected and 'Error at line 6' in expected
+
+def test_execute_file_uses_less_memory_than_reading_text(tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    path = tmp_path / 'program.scl'
+    path.write_text('\n'.join(['simp{basic}'] + ['sde greet : sout : "hi" sout : count end',
+                                                  'set count | count : 10'] * 5000), encoding='utf-8')
+    
+    def peak(run):
+        interpreter = scl.SCLInterpreter()
+        assert interpreter.load_plugin('basic')
+        tracemalloc.start()
+        try:
+            assert run(interpreter)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    assert peak(lambda interpreter: interpreter.execute_file(str(path))) * 1.3 < \
+        peak(lambda interpreter: interpreter.execute(path.read_text(encoding='utf-8')))
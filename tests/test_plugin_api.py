@@ -0,0 +1,70 @@
+"""Plugin API v2: grammar productions, compiled executors and the v1 adapter"""
+
+import scl
+from conftest import ROOT
+from scl_plugins import Grammar, PluginAdapter
+
+def test_grammar_keyword_productions_own_their_lines():
+    grammar = Grammar()
+    grammar.production('kw', lambda tokens, pos: (None, pos))
+    grammar.production(None, lambda tokens, pos: (('ANY',), pos + 1))
+    assert grammar.parse([('IDENTIFIER', 'kw')], 0) == (None, 0)
+    assert grammar.parse([('IDENTIFIER', 'other')], 0) == (('ANY',), 1)
+    assert grammar.parse([('NUMBER', '1')], 0) == (('ANY',), 1)
+    assert grammar.parse([], 0) == (None, 0)
+
+LEGACY_PLUGIN = '''
+class LegacyPlugin:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+    
+    def parse_statement(self, tokens, pos):
+        if tokens[pos] == ('IDENTIFIER', 'hello'):
+            return ('HELLO',), pos + 1
+        return None, pos
+    
+    def execute_statement(self, stmt):
+        if stmt[0] == 'HELLO':
+            print("hello from v1")
+            return True
+        return False
+'''
+
+def test_v1_plugins_run_through_the_adapter(tmp_path, monkeypatch, capsys):
+    (tmp_path / 'plugins').mkdir()
+    (tmp_path / 'plugins' / 'legacy.py').write_text(LEGACY_PLUGIN)
+    monkeypatch.chdir(tmp_path)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.execute('simp{legacy}\nhello\n')
+    assert interpreter.compile('simp{legacy}\nhello\n').run(interpreter.new_context())
+    assert isinstance(interpreter.plugins['legacy'], PluginAdapter)
+    assert capsys.readouterr().out == 'hello from v1\nhello from v1\n'
+    
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.load_plugin('basic')
+    assert not isinstance(interpreter.plugins['basic'], PluginAdapter)
+
+def test_parsing_keeps_no_state_on_the_interpreter(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    for plugin in ('basic', 'siew', 'sui'):
+        assert interpreter.load_plugin(plugin)
+    outer = interpreter.tokenize('sif a { swhile b { } }')
+    assert interpreter.parse_statement(outer, 0)[0][0] == 'IF'
+    assert interpreter.parse_statement(interpreter.tokenize('sui create : w'), 0)[0] == ('SUI_CREATE', 'w')
+    assert not hasattr(interpreter, 'tokens') and not hasattr(interpreter, 'pos')
+
+def test_compiled_executors_run_against_any_context(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    interpreter.load_plugin('basic')
+    stmt, _ = interpreter.parse_statement(interpreter.tokenize('sout : a'), 0)
+    executor = interpreter.compile_statement(stmt)
+    
+    class Context:
+        def __init__(self, value):
+            self.variables = {'a': value}
+    
+    assert executor(Context(1)) and executor(Context(2))
+    assert capsys.readouterr().out == '1\n2\n'
@@ -0,0 +1,104 @@
+"""Plugin manifest and lockfile handling in scl_plugins"""
+
+import hashlib
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+from scl_plugins import PluginManifest, extract_plugin_info, load_lockfile
+
+LOOP_PLUGIN = '''
+KEYWORDS = ('alpha', 'beta')
+TABLE = {'gamma': 1}
+
+class LoopPlugin:
+    def register_syntax(self, grammar):
+        for keyword in KEYWORDS + ('delta',):
+            grammar.production(keyword, self.parse_statement)
+        for keyword in TABLE:
+            grammar.production(keyword, self.parse_statement)
+        for name in ['epsilon']:
+            grammar.production(name, self.parse_statement)
+        grammar.production('zeta', self.parse_statement)
+        grammar.production(None, self.parse_statement)
+    
+    def parse_statement(self, tokens, pos):
+        if tokens[pos][1] in KEYWORDS:
+            return None, pos
+        return None, pos
+'''
+
+def test_keywords_registered_in_loops(tmp_path):
+    path = tmp_path / 'loop.py'
+    path.write_text(LOOP_PLUGIN, encoding='utf-8')
+    assert extract_plugin_info(str(path))['keywords'] == ['alpha', 'beta', 'delta', 'epsilon', 'gamma', 'zeta']
+
+def test_constants_that_are_not_literals_are_skipped(tmp_path):
+    path = tmp_path / 'odd.py'
+    path.write_text(LOOP_PLUGIN.replace("TABLE = {'gamma': 1}", "TABLE = {'gamma': 1}\nBAD = {[]: 1}\nVERSION = '2.0'"),
+                    encoding='utf-8')
+    info = extract_plugin_info(str(path))
+    assert info['version'] == '2.0'
+    assert 'gamma' in info['keywords']
+
+@pytest.mark.parametrize('plugin, keywords', [
+    ('basic', {'sout', 'list_create', 'list_add', 'map_set', 'map_keys'}),
+    ('fileio', {'file_write', 'file_append', 'file_read', 'file_lines', 'file_delete', 'dir_list'}),
+    ('hashing', {'md5', 'sha256', 'base64_enc', 'base64_dec', 'rot13'}),
+])
+def test_manifest_lists_plugin_keywords(plugin, keywords):
+    manifest = PluginManifest(f'{ROOT}/plugins')
+    assert keywords <= set(manifest.keywords(plugin))
+
+def test_load_lockfile(tmp_path):
+    path = tmp_path / 'scl.lock'
+    assert load_lockfile(str(path)) is None
+    path.write_text('{"version": 1, "plugins": {"basic": {"sha256": "00"}}}', encoding='utf-8')
+    assert load_lockfile(str(path))['plugins'] == {'basic': {'sha256': '00'}}
+    for text in ('{bad', '[]', '{"plugins": []}', '{"plugins": {"basic": "00"}}'):
+        path.write_text(text, encoding='utf-8')
+        with pytest.raises(ValueError, match='Invalid lockfile'):
+            load_lockfile(str(path))
+
+def test_invalid_lockfile_is_reported(tmp_path):
+    (tmp_path / 'scl.lock').write_text('{bad', encoding='utf-8')
+    script = tmp_path / 'hello.scl'
+    script.write_text('simp{basic}\nsout : "hello"\n', encoding='utf-8')
+    result = subprocess.run([sys.executable, f'{ROOT}/scl.py', str(script)], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 1
+    assert result.stdout.startswith('Error: Invalid lockfile scl.lock: ')
+    assert 'Traceback' not in result.stdout + result.stderr
+
+def test_verify_lock_reports_changed_and_missing_plugins(tmp_path):
+    plugins = tmp_path / 'plugins'
+    plugins.mkdir()
+    (plugins / 'demo.py').write_bytes(b'VERSION = "1.0"\n')
+    manifest = PluginManifest(str(plugins))
+    sha256 = manifest.get('demo')['sha256']
+    assert sha256 == hashlib.sha256(b'VERSION = "1.0"\n').hexdigest()
+    assert manifest.verify_lock({'plugins': {'demo': {'sha256': sha256}}}) == []
+    lock = {'plugins': {'demo': {'sha256': '0' * 64}, 'other': {'sha256': '0' * 64}}}
+    assert manifest.verify_lock(lock) == ['Plugin demo does not match the lockfile hash',
+                                          'Plugin other is locked but not installed']
+
+def test_mismatched_lockfile_stops_the_run(tmp_path):
+    (tmp_path / 'plugins').mkdir()
+    shutil.copy(f'{ROOT}/plugins/basic.py', tmp_path / 'plugins')
+    (tmp_path / 'scl.lock').write_text('{"version": 1, "plugins": {"basic": {"sha256": "00"}}}', encoding='utf-8')
+    script = tmp_path / 'hello.scl'
+    script.write_text('simp{basic}\nsout : "hello"\n', encoding='utf-8')
+    result = subprocess.run([sys.executable, f'{ROOT}/scl.py', str(script)], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=30)
+    assert result.returncode == 1
+    assert result.stdout == ("Error: Plugin basic does not match the lockfile hash\n"
+                             "Run 'sdp sync' to install the locked plugins\n")
+
+def test_unreadable_plugins_are_recorded_without_printing(tmp_path, capsys):
+    (tmp_path / 'broken.py').write_text('def broken(:\n', encoding='utf-8')
+    entry = PluginManifest(str(tmp_path)).get('broken')
+    assert entry['keywords'] == [] and entry['error'].startswith('Error extracting keywords from ')
+    assert capsys.readouterr().out == ''
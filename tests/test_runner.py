@@ -0,0 +1,71 @@
+"""ScriptRunner: one long-lived worker runs scripts and never blocks the caller"""
+
+import time
+
+from scl_runner import ScriptRunner
+
+def wait_for_run(runner, timeout=20):
+    """Poll like an editor's event loop until the run ends; return its output"""
+    output = []
+    deadline = time.monotonic() + timeout
+    while runner.is_running():
+        assert time.monotonic() < deadline, 'run did not finish'
+        output.extend(runner.poll())
+        time.sleep(0.01)
+    output.extend(runner.poll())
+    return output
+
+def test_runs_share_one_worker(tmp_path):
+    script = tmp_path / 'hello.scl'
+    script.write_text('simp{basic}\nsout : "hello"\n', encoding='utf-8')
+    runner = ScriptRunner()
+    try:
+        assert runner.start(str(script))
+        assert wait_for_run(runner) == [('stdout', 'hello\n')]
+        assert runner.returncode() == 0
+        worker = runner.process.pid
+        
+        assert runner.start(str(script))
+        assert wait_for_run(runner) == [('stdout', 'hello\n')]
+        assert runner.process.pid == worker
+    finally:
+        runner.close()
+
+def test_failing_run_reports_exit_code(tmp_path):
+    script = tmp_path / 'bad.scl'
+    script.write_text('simp{basic}\nsout : "before"\nbad ??\n', encoding='utf-8')
+    runner = ScriptRunner()
+    try:
+        assert runner.start(str(script))
+        output = ''.join(text for _, text in wait_for_run(runner))
+        assert output.startswith('before\nError at line 3: Invalid syntax')
+        assert runner.returncode() == 1
+    finally:
+        runner.close()
+
+def test_stop_returns_at_once_and_next_run_gets_a_new_worker(tmp_path):
+    slow = tmp_path / 'slow.scl'
+    slow.write_text('simp{basic}\nsimp{time}\nsout : "start"\ntime : sleep : 30\n', encoding='utf-8')
+    quick = tmp_path / 'quick.scl'
+    quick.write_text('simp{basic}\nsout : "quick"\n', encoding='utf-8')
+    runner = ScriptRunner()
+    try:
+        assert runner.start(str(slow))
+        deadline = time.monotonic() + 20
+        while ('stdout', 'start\n') not in runner.poll():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        worker = runner.process.pid
+        
+        started = time.monotonic()
+        runner.stop()
+        assert time.monotonic() - started < 0.5
+        assert not runner.start(str(quick))
+        wait_for_run(runner)
+        assert runner.stopped
+        
+        assert runner.start(str(quick))
+        assert wait_for_run(runner) == [('stdout', 'quick\n')]
+        assert runner.process.pid != worker
+    finally:
+        runner.close()
@@ -0,0 +1,68 @@
+"""Streaming execution: lines run as they arrive, in bounded memory"""
+
+import subprocess
+import sys
+import tracemalloc
+
+import scl
+from conftest import ROOT
+
+class CountingStream:
+    """stdout stand-in that keeps only the last line written"""
+    
+    def __init__(self):
+        self.lines = 0
+        self.last = ''
+    
+    def write(self, text):
+        if text == '\n':
+            self.lines += 1
+        else:
+            self.last = text
+        return len(text)
+    
+    def flush(self):
+        pass
+
+def program(count):
+    yield 'simp{basic}'
+    yield 'sde shout : sout : "called" end'
+    for i in range(count):
+        yield f'x : {i}'
+        yield 'sout : x'
+    yield 'sde run<shout>'
+
+def peak_memory(count, monkeypatch):
+    stream = CountingStream()
+    monkeypatch.setattr(sys, 'stdout', stream)
+    interpreter = scl.SCLInterpreter()
+    tracemalloc.start()
+    try:
+        assert interpreter.execute_lines(program(count))
+        return tracemalloc.get_traced_memory()[1], stream
+    finally:
+        tracemalloc.stop()
+
+def test_memory_does_not_grow_with_input(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    peak_memory(100, monkeypatch)  # Load the plugin outside the measurement
+    small, _ = peak_memory(1000, monkeypatch)
+    large, stream = peak_memory(100000, monkeypatch)
+    assert stream.lines == 100001
+    assert stream.last == 'called'
+    assert large < small * 2
+
+def test_stdin_runs_lines_as_they_arrive():
+    process = subprocess.Popen([sys.executable, 'scl.py', '-'], cwd=ROOT, text=True,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        process.stdin.write('simp{basic}\nsde f : sout : "f" end\nsout : "first"\n')
+        process.stdin.flush()
+        # Output shows up before the input is closed
+        assert process.stdout.readline() == 'first\n'
+        process.stdin.write('sde run<f>\n')
+        process.stdin.close()
+        assert process.stdout.read() == 'f\n'
+        assert process.wait(timeout=10) == 0
+    finally:
+        process.kill()
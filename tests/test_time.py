@@ -0,0 +1,116 @@
+"""Time plugin: stopwatches, time : bench and timers against injected clocks"""
+
+import asyncio
+import importlib.util
+import itertools
+import os
+import random
+
+import conformance
+import scl
+from conftest import ROOT
+
+spec = importlib.util.spec_from_file_location('time_plugin', os.path.join(ROOT, 'plugins', 'time.py'))
+time_plugin = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(time_plugin)
+TimerHeap = time_plugin.TimerHeap
+
+def stepping_interpreter(step_ns):
+    interpreter = scl.SCLInterpreter()
+    interpreter.timer = itertools.count(0, step_ns).__next__
+    return interpreter
+
+def test_stopwatch_accumulates_laps(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = stepping_interpreter(250000000)
+    ctx = interpreter.new_context()
+    program = interpreter.compile(
+        'simp{time}\n'
+        'time : start : sw\ntime : stop : sw\n'
+        'time : start : sw\ntime : elapsed : sw : running\ntime : stop : sw\n'
+        'time : elapsed : sw : total\n'
+    )
+    assert program.run(ctx)
+    assert ctx.variables == {'running': 0.5, 'total': 0.75}
+
+def test_bench_reports_min_median_p99(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = stepping_interpreter(2000)
+    assert interpreter.execute('simp{basic}\nsimp{time}\nsde f : x : 1 end\ntime : bench : f : 200\n')
+    assert capsys.readouterr().out == 'Benchmark f: 200 runs, min 2.000 us, median 2.000 us, p99 2.000 us\n'
+
+def test_stopping_an_idle_stopwatch_fails(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = stepping_interpreter(1)
+    assert not interpreter.execute('simp{time}\ntime : stop : sw\n')
+    assert capsys.readouterr().out.startswith("Stopwatch 'sw' is not running\n")
+
+def test_bench_needs_a_positive_run_count(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.load_plugin('time')
+    for line in ('time : bench : f : 0', 'time : bench : f : 1.5', 'time : bench : f'):
+        assert interpreter.check_statement(line) == 'Invalid syntax'
+
+def test_repeating_intervals_must_reach_a_nanosecond(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    assert interpreter.load_plugin('time')
+    for line in ('time : every : 0 : f', 'time : every : 0.0000000001 : f'):
+        assert interpreter.check_statement(line) == 'Invalid syntax'
+    assert interpreter.check_statement('time : every : 0.000000001 : f') is None
+    assert interpreter.check_statement('time : after : 0.0000000001 : f') is None
+
+def virtual_interpreter():
+    interpreter = scl.SCLInterpreter()
+    conformance.VirtualClock().install(interpreter)
+    return interpreter
+
+def run_async(interpreter, code):
+    program = interpreter.compile(code, asynchronous=True)
+    return asyncio.run(program.run(interpreter.new_context()))
+
+def test_repeating_timers_do_not_drift_and_report_missed_deadlines(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = virtual_interpreter()
+    assert run_async(interpreter, 'simp{basic}\nsimp{time}\n'
+                     'sde slow : time : elapsed : sw : t sout : t time : sleep : 0.25 end\n'
+                     'time : start : sw\ntime : every : 0.1 : slow\ntime : run : 0.65\n')
+    # Late calls run at once; the next deadline stays on the 0.1 s grid
+    assert capsys.readouterr().out == ('0.1\n'
+                                       "Timer 'slow' missed 1 deadline\n0.35\n"
+                                       "Timer 'slow' missed 2 deadlines\n0.6\n")
+
+def test_callbacks_can_cancel_their_timer(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = virtual_interpreter()
+    assert run_async(interpreter, 'simp{basic}\nsimp{time}\n'
+                     'sde tick : sout : "tick" end\n'
+                     'sde stop : time : cancel : tick end\n'
+                     'time : every : 0.1 : tick\ntime : after : 0.25 : stop\ntime : run\nsout : "done"\n')
+    assert capsys.readouterr().out == 'tick\ntick\ndone\n'
+
+def test_run_without_duration_stops_when_only_repeating_timers_are_left(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = virtual_interpreter()
+    assert interpreter.execute('simp{basic}\nsimp{time}\n'
+                               'sde tick : sout : "tick" end\nsde last : sout : "last" end\n'
+                               'time : every : 0.1 : tick\ntime : run\nsout : "idle"\n'
+                               'time : after : 0.25 : last\ntime : run\nsout : "done"\n')
+    assert capsys.readouterr().out == 'idle\ntick\ntick\nlast\ndone\n'
+
+def test_timer_heap_orders_and_cancels_thousands_of_timers():
+    rng = random.Random(5)
+    timers = TimerHeap()
+    deadlines = {f'f{i}': rng.randrange(10 ** 9) for i in range(10000)}
+    for name, deadline in deadlines.items():
+        timers.add(deadline, name)
+    for name in list(deadlines)[::2]:
+        assert timers.cancel(name) == 1
+        del deadlines[name]
+    assert len(timers) == len(deadlines)
+    fired = []
+    while timers.next_deadline() is not None:
+        fired.append(timers.pop()[2])
+    assert fired == sorted(deadlines, key=lambda name: (deadlines[name], int(name[1:])))
+    assert not timers.by_name
@@ -0,0 +1,30 @@
+"""SCLList storage: typed arrays for homogeneous numbers, plain lists otherwise"""
+
+from scl_types import SCLList
+
+def test_homogeneous_numbers_use_typed_arrays():
+    assert SCLList([1, 2, 3]).typecode() == 'q'
+    assert SCLList([1.5, 2.5]).typecode() == 'd'
+    assert SCLList().typecode() == 'q'
+    assert SCLList(['a', 'b']).typecode() is None
+
+def test_appending_another_type_switches_storage():
+    values = SCLList([1, 2])
+    values.append(3)
+    assert values.typecode() == 'q'
+    values.append('x')
+    assert values.typecode() is None
+    assert list(values) == [1, 2, 3, 'x']
+
+def test_integers_beyond_64_bits_fall_back_to_a_list():
+    assert SCLList([2 ** 70]).typecode() is None
+    values = SCLList([1])
+    values.append(2 ** 70)
+    assert list(values) == [1, 2 ** 70]
+
+def test_list_operations():
+    values = SCLList([10, 20, 30])
+    assert len(values) == 3 and values[1] == 20 and values[-1] == 30
+    del values[0]
+    assert values == SCLList([20, 30])
+    assert str(values) == '[20, 30]'
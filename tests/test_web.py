@@ -0,0 +1,148 @@
+"""web plugin against a local http.server: pooling, fan-out, streaming, retries"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scl
+from conftest import ROOT
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, *args):
+        pass
+    
+    def reply(self, status, body=b''):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.clients.add(self.client_address)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if self.path == '/hello':
+                self.reply(200, 'héllo'.encode('utf-8'))
+            elif self.path.startswith('/slow'):
+                time.sleep(0.2)
+                self.reply(200, self.path.encode())
+            elif self.path == '/flaky':
+                with server.lock:
+                    server.failures -= 1
+                    failing = server.failures >= 0
+                self.reply(503 if failing else 200, b'ok')
+            elif self.path == '/close':
+                # Drop the connection without a Connection: close header
+                self.reply(200, b'bye')
+                self.close_connection = True
+            elif self.path == '/big':
+                self.reply(200, b'x' * 1000000)
+            elif self.path == '/moved':
+                self.send_response(302)
+                self.send_header('Location', '/hello')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            else:
+                self.reply(404, b'missing')
+        finally:
+            with server.lock:
+                server.active -= 1
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.lock:
+            self.server.posts += 1
+        self.reply(200, self.command.encode() + b' ' + body)
+    
+    do_PUT = do_POST
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.clients = set()
+    httpd.active = httpd.peak = 0
+    httpd.failures = 0
+    httpd.posts = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def run(code, server, monkeypatch, sleeps=None):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    interpreter.sleep = sleeps.append if sleeps is not None else (lambda seconds: None)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    ok = interpreter.execute(f'simp{{basic}}\nsimp{{web}}\nbase : "{base}"\n' + code.replace('BASE', base))
+    return ok, interpreter.variables
+
+def test_requests_reuse_one_connection(server, monkeypatch):
+    ok, variables = run('a : web_get : "BASE/hello"\nb : web_get : "BASE/moved"\n'
+                        'c : web_post : "BASE/echo" : "data"\nd : web_put : "BASE/echo" : 42\n', server, monkeypatch)
+    assert ok
+    assert (variables['a'], variables['b'], variables['c'], variables['d']) == ('héllo', 'héllo', 'POST data', 'PUT 42')
+    assert len(server.clients) == 1
+
+def test_get_all_fans_out_on_bounded_workers(server, monkeypatch):
+    urls = ' '.join(f'"BASE/slow{i}"' for i in range(16))
+    start = time.perf_counter()
+    ok, variables = run(f'list_create : urls : {urls}\npages : web_get_all : urls\n', server, monkeypatch)
+    elapsed = time.perf_counter() - start
+    assert ok and list(variables['pages']) == [f'/slow{i}' for i in range(16)]
+    assert server.peak == 8
+    assert elapsed < 1.5
+
+def test_responses_stream_into_files(server, monkeypatch, tmp_path):
+    path = tmp_path / 'big.bin'
+    ok, variables = run(f'size : web_get : "BASE/big" : "{path}"\n', server, monkeypatch)
+    assert ok and variables['size'] == 1000000
+    assert path.read_bytes() == b'x' * 1000000
+
+def test_temporary_errors_are_retried_with_backoff(server, monkeypatch):
+    server.failures = 2
+    sleeps = []
+    ok, variables = run('a : web_get : "BASE/flaky"\n', server, monkeypatch, sleeps)
+    assert ok and variables['a'] == 'ok'
+    assert sleeps == [0.25, 0.5]
+    
+    server.failures = 5
+    ok, _ = run('web_config : retries : 1\na : web_get : "BASE/flaky"\n', server, monkeypatch)
+    assert not ok
+
+def test_errors_and_timeouts_fail_the_statement(server, monkeypatch, capsys):
+    ok, _ = run('a : web_get : "BASE/nothing"\n', server, monkeypatch)
+    assert not ok and 'HTTP 404' in capsys.readouterr().out
+    ok, _ = run('web_config : timeout : 0.05\nweb_config : retries : 0\na : web_get : "BASE/slow"\n', server, monkeypatch)
+    assert not ok and 'timed out' in capsys.readouterr().out
+
+def test_requests_do_not_block_other_tasks(server, monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    interpreter = scl.SCLInterpreter()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    program = interpreter.compile('simp{basic}\nsimp{web}\n'
+                                  f'sde a : x : web_get : "{base}/slow1" sout : x end\n'
+                                  f'sde b : y : web_get : "{base}/slow2" sout : y end\n'
+                                  'sde spawn<a>\nsde spawn<b>\nsde wait\n', asynchronous=True)
+    start = time.perf_counter()
+    assert asyncio.run(program.run(interpreter.new_context()))
+    assert time.perf_counter() - start < 0.35
+    assert sorted(capsys.readouterr().out.split()) == ['/slow1', '/slow2']
+
+def test_only_idempotent_requests_are_resent_on_a_dropped_connection(server, monkeypatch):
+    ok, variables = run('a : web_get : "BASE/close"\nb : web_get : "BASE/hello"\n', server, monkeypatch)
+    assert ok and variables['b'] == 'héllo'
+    assert len(server.clients) == 2
+    
+    ok, _ = run('web_config : retries : 0\na : web_get : "BASE/close"\nb : web_post : "BASE/echo" : "x"\n',
+                server, monkeypatch)
+    assert not ok and server.posts == 0